@@ -0,0 +1 @@
+# This file makes 'benchmarks' a package so the suite can be run with `python -m`.
@@ -0,0 +1,300 @@
+"""Benchmark suite for the wellness calculators.
+
+Measures the scalar, trusted and batch paths of the BMI/BMR/TDEE calculators and
+``UserProfile`` construction. For every case it reports:
+
+- ``ops_per_sec``: calls per second (``rows_per_sec`` for batch cases)
+- ``batch_p50_ns`` / ``batch_p99_ns``: percentiles of the per-call time
+  averaged over each sample of ``inner`` back-to-back calls (batch means, not
+  single-call latencies; timing single calls would be dominated by timer
+  overhead for the fast cases)
+- ``peak_traced_bytes``: peak memory traced by ``tracemalloc`` during one call
+  (the high-water mark, not a count of allocations)
+- ``allocated_blocks_per_call``: memory blocks still allocated after a call
+  (the ``tracemalloc`` block-count delta over a run of calls whose return
+  values are kept, divided by the number of calls); temporaries freed before
+  the call returns are not counted
+
+Inputs come from fixed seeds, so two runs on the same machine are comparable.
+Results are saved as JSON; ``--compare`` flags cases whose throughput dropped
+by more than ``--threshold`` against an earlier run and exits non-zero.
+
+Usage (from the project root)::
+
+    python -m ai_wellness_advisor.benchmarks.bench_calculators --output before.json
+    python -m ai_wellness_advisor.benchmarks.bench_calculators --compare before.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from ai_wellness_advisor.src.bmi.bmi_calculate import calculate_bmi
+from ai_wellness_advisor.src.bmi.bmi_calculate_batch import calculate_bmi_batch
+from ai_wellness_advisor.src.bmi.bmi_categorize import categorize_bmi
+from ai_wellness_advisor.src.bmi.bmi_categorize_batch import categorize_bmi_batch
+from ai_wellness_advisor.src.data_models.bulk_user_profile import validate_profiles
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+from ai_wellness_advisor.src.dcnc.calculate_bmr import calculate_bmr, calculate_bmr_trusted
+from ai_wellness_advisor.src.dcnc.calculate_bmr_batch import calculate_bmr_batch
+from ai_wellness_advisor.src.dcnc.calculate_tdee import ActivityLevel, calculate_tdee, calculate_tdee_trusted
+from ai_wellness_advisor.src.dcnc.calculate_tdee_batch import calculate_tdee_batch
+from ai_wellness_advisor.src.dcnc.metabolic_profile import (
+    calculate_metabolic_profile,
+    calculate_metabolic_profile_batch,
+)
+from ai_wellness_advisor.src.llm_integration.bmi_advice_cache import BMIAdviceCache
+from ai_wellness_advisor.src.llm_integration.deepseek_api_setup import SimpleBMIAdvice
+
+SEED = 20240501
+BATCH_ROWS = 100_000
+PROFILE_ROWS = 1_000
+DEFAULT_MIN_TIME = 0.5
+DEFAULT_THRESHOLD = 0.10
+
+PROFILE_DATA = {
+    "age": 30,
+    "gender": "female",
+    "height_cm": 165.5,
+    "weight_kg": 60.2,
+    "health_goals": ["Lose weight", "Improve stamina"],
+    "allergies": ["Pollen", "Dust mites"],
+    "medical_conditions": ["Asthma"],
+}
+
+
+@dataclass
+class BenchmarkCase:
+    """一个基准用例：``func`` 每次调用处理 ``rows`` 行。"""
+    name: str
+    func: Callable[[], object]
+    rows: int = 1
+    inner: int = 100
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    calls: int
+    rows_per_call: int
+    ops_per_sec: float
+    rows_per_sec: float
+    batch_p50_ns: float
+    batch_p99_ns: float
+    peak_traced_bytes: float
+    allocated_blocks_per_call: float
+
+
+def build_cases() -> List[BenchmarkCase]:
+    """构造全部基准用例（输入由固定种子生成）。"""
+    rng = np.random.default_rng(SEED)
+    codes = rng.integers(0, 2, BATCH_ROWS).astype(np.int8)
+    ages = rng.integers(18, 90, BATCH_ROWS).astype(np.float64)
+    heights_cm = np.round(rng.uniform(150, 200, BATCH_ROWS), 1)
+    weights_kg = np.round(rng.uniform(45, 120, BATCH_ROWS), 1)
+    heights_m = heights_cm / 100
+    bmis = calculate_bmi_batch(heights_m, weights_kg).bmi
+    bmrs = calculate_bmr_batch(codes, ages, heights_cm, weights_kg).bmr
+    activity_codes = rng.integers(0, len(ActivityLevel), BATCH_ROWS).astype(np.int8)
+    profile_rows = [PROFILE_DATA] * PROFILE_ROWS
+    profile = UserProfile(**PROFILE_DATA)
+    advice_cache = BMIAdviceCache(fetch=lambda bmi, model: SimpleBMIAdvice(advice=f"BMI {bmi:.1f}"))
+    advice_cache.warm([22.86])
+
+    return [
+        BenchmarkCase("calculate_bmi", lambda: calculate_bmi(1.75, 70.0)),
+        BenchmarkCase("calculate_bmi_batch", lambda: calculate_bmi_batch(heights_m, weights_kg),
+                      BATCH_ROWS, 1),
+        BenchmarkCase("categorize_bmi", lambda: categorize_bmi(22.86)),
+        BenchmarkCase("categorize_bmi_batch", lambda: categorize_bmi_batch(bmis), BATCH_ROWS, 1),
+        BenchmarkCase("calculate_bmr", lambda: calculate_bmr("male", 30, 175.0, 70.0)),
+        BenchmarkCase("calculate_bmr_trusted", lambda: calculate_bmr_trusted("male", 30, 175.0, 70.0)),
+        BenchmarkCase("calculate_bmr_batch",
+                      lambda: calculate_bmr_batch(codes, ages, heights_cm, weights_kg), BATCH_ROWS, 1),
+        BenchmarkCase("calculate_tdee", lambda: calculate_tdee(1695.7, "moderately_active")),
+        BenchmarkCase("calculate_tdee_enum",
+                      lambda: calculate_tdee(1695.7, ActivityLevel.MODERATELY_ACTIVE)),
+        BenchmarkCase("calculate_tdee_trusted", lambda: calculate_tdee_trusted(1695.7, "moderately_active")),
+        BenchmarkCase("calculate_tdee_batch", lambda: calculate_tdee_batch(bmrs, "moderately_active"),
+                      BATCH_ROWS, 1),
+        BenchmarkCase("calculate_tdee_batch_codes", lambda: calculate_tdee_batch(bmrs, activity_codes),
+                      BATCH_ROWS, 1),
+        BenchmarkCase("calculate_metabolic_profile",
+                      lambda: calculate_metabolic_profile("male", 30, 175.0, 70.0, "moderately_active")),
+        BenchmarkCase("calculate_metabolic_profile_batch",
+                      lambda: calculate_metabolic_profile_batch(codes, ages, heights_cm, weights_kg,
+                                                                "moderately_active"),
+                      BATCH_ROWS, 1),
+        BenchmarkCase("UserProfile", lambda: UserProfile(**PROFILE_DATA), inner=20),
+        BenchmarkCase("UserProfile_assign", lambda: setattr(profile, "weight_kg", 70.5), inner=20),
+        BenchmarkCase("UserProfile_apply_updates",
+                      lambda: profile.apply_updates({"weight_kg": 70.5, "height_cm": 175.0}), inner=20),
+        BenchmarkCase("UserProfile_model_dump_json", profile.model_dump_json, inner=20),
+        BenchmarkCase("validate_profiles", lambda: validate_profiles(profile_rows), PROFILE_ROWS, 1),
+        BenchmarkCase("BMIAdviceCache_hit", lambda: advice_cache.get(22.86)),
+    ]
+
+
+def run_case(case: BenchmarkCase, min_time: float = DEFAULT_MIN_TIME) -> BenchmarkResult:
+    """运行一个用例：预热，测量批均值样本直到累计 ``min_time`` 秒，再单独测量内存。"""
+    func, inner = case.func, case.inner
+    for _ in range(inner):
+        func()
+
+    samples = []
+    total_ns = 0
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while total_ns < min_time * 1e9 or len(samples) < 5:
+            start = time.perf_counter_ns()
+            for _ in range(inner):
+                func()
+            elapsed = time.perf_counter_ns() - start
+            samples.append(elapsed / inner)
+            total_ns += elapsed
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    calls = len(samples) * inner
+    peak_bytes, blocks_per_call = _traced_memory(func)
+    ops_per_sec = calls / (total_ns / 1e9)
+    return BenchmarkResult(
+        name=case.name,
+        calls=calls,
+        rows_per_call=case.rows,
+        ops_per_sec=ops_per_sec,
+        rows_per_sec=ops_per_sec * case.rows,
+        batch_p50_ns=float(np.percentile(samples, 50)),
+        batch_p99_ns=float(np.percentile(samples, 99)),
+        peak_traced_bytes=peak_bytes,
+        allocated_blocks_per_call=blocks_per_call,
+    )
+
+
+def _traced_memory(func: Callable[[], object], calls: int = 20) -> Tuple[float, float]:
+    """tracemalloc 统计的单次调用内存峰值字节数（取中位数）与每次调用新增的内存块数。
+
+    块数取保留全部返回值的 ``calls`` 次调用前后快照的块数差再除以 ``calls``；
+    tracemalloc 自身生成快照的分配被过滤掉。
+    """
+    peaks = []
+    results: List[object] = [None] * calls
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+        before = tracemalloc.take_snapshot()
+        for i in range(calls):
+            results[i] = func()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    own = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = after.filter_traces(own).compare_to(before.filter_traces(own), "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    return float(np.median(peaks)), max(blocks, 0) / calls
+
+
+def run_suite(min_time: float = DEFAULT_MIN_TIME, name_filter: Optional[str] = None) -> dict:
+    """运行全部（或名称包含 ``name_filter`` 的）用例，返回可写入 JSON 的结果。"""
+    results = {}
+    for case in build_cases():
+        if name_filter and name_filter not in case.name:
+            continue
+        results[case.name] = asdict(run_case(case, min_time))
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "min_time": min_time,
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """返回吞吐量相对基线下降超过 ``threshold`` 的用例描述。"""
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        if change < -threshold:
+            regressions.append(f"{name}: {before['ops_per_sec']:,.0f} -> "
+                               f"{result['ops_per_sec']:,.0f} ops/s ({change:+.1%})")
+    return regressions
+
+
+def format_results(report: dict, baseline: Optional[dict] = None) -> str:
+    lines = [f"{'case':<36}{'ops/s':>14}{'rows/s':>16}{'batch-mean p50':>16}"
+             f"{'batch-mean p99':>16}{'peak traced':>14}{'blocks/call':>13}"]
+    for name, r in report["results"].items():
+        line = (f"{name:<36}{r['ops_per_sec']:>14,.0f}{r['rows_per_sec']:>16,.0f}"
+                f"{_format_ns(r['batch_p50_ns']):>16}{_format_ns(r['batch_p99_ns']):>16}"
+                f"{r['peak_traced_bytes']:>12,.0f} B{r['allocated_blocks_per_call']:>13,.1f}")
+        if baseline and name in baseline["results"]:
+            change = r["ops_per_sec"] / baseline["results"][name]["ops_per_sec"] - 1
+            line += f"  {change:+.1%}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} us"
+    return f"{ns:.0f} ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the wellness calculators.")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative ops/sec drop flagged as a regression (default: 0.10)")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="minimum measured seconds per case (default: 0.5)")
+    parser.add_argument("--filter", help="only run cases whose name contains this string")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.min_time, args.filter)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(format_results(report, baseline))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(baseline, report, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
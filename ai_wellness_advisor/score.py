@@ -0,0 +1,11 @@
+"""Command-line entry point: ``python -m ai_wellness_advisor.score``.
+
+See ``src.scoring.cohort_scorer`` for details.
+"""
+
+import sys
+
+from .src.scoring.cohort_scorer import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,22 @@
 # This file makes 'bmi' a sub-package of 'src'.
 from .bmi_calculate import calculate_bmi
-from .bmi_categorize import categorize_bmi
+from .bmi_calculate_batch import BMIBatchResult, calculate_bmi_batch
+from .bmi_categorize import BMI_CATEGORY_LABELS, categorize_bmi
+from .bmi_categorize_batch import (
+    INVALID_BMI_CATEGORY,
+    BMICategory,
+    bmi_category_labels,
+    categorize_bmi_batch,
+)
 
-__all__ = ['calculate_bmi', 'categorize_bmi']
\ No newline at end of file
+__all__ = [
+    'calculate_bmi',
+    'calculate_bmi_batch',
+    'BMIBatchResult',
+    'categorize_bmi',
+    'categorize_bmi_batch',
+    'bmi_category_labels',
+    'BMICategory',
+    'BMI_CATEGORY_LABELS',
+    'INVALID_BMI_CATEGORY',
+]
@@ -0,0 +1,49 @@
+# bmi_calculate_batch.py
+
+from typing import NamedTuple
+
+import numpy as np
+
+from ..common.array_utils import as_float_array, round_like_builtin
+
+
+class BMIBatchResult(NamedTuple):
+    """批量BMI计算结果。
+
+    属性:
+        bmi (np.ndarray): 每行的BMI值，四舍五入到小数点后两位；无效行为 NaN。
+        error_mask (np.ndarray): 布尔数组，True 表示该行身高或体重无效。
+    """
+    bmi: np.ndarray
+    error_mask: np.ndarray
+
+
+def calculate_bmi_batch(heights, weights) -> BMIBatchResult:
+    """
+    批量计算身体质量指数 (BMI)。
+
+    与 ``calculate_bmi`` 逐行结果完全一致，但整列一次性完成验证与计算：
+    无效的行不会抛出异常，而是在 ``error_mask`` 中标记并返回 NaN。
+
+    参数:
+        heights: 身高序列，单位为米 (m)。可以是 NumPy 数组或任何缓冲区协议对象/数字序列。
+        weights: 体重序列，单位为千克 (kg)，形状必须与 heights 相同。
+
+    返回:
+        BMIBatchResult: ``(bmi, error_mask)``。身高或体重非正数、NaN 或无穷大的行被标记为无效。
+
+    抛出:
+        ValueError: 如果输入包含无法转换为数字的元素，或 heights 与 weights 形状不同。
+    """
+    h = as_float_array(heights, "身高必须是一个有效的数字。")
+    w = as_float_array(weights, "体重必须是一个有效的数字。")
+
+    if h.shape != w.shape:
+        raise ValueError(f"身高与体重的数量必须一致，得到 {h.shape} 和 {w.shape}。")
+
+    error_mask = ~(np.isfinite(h) & np.isfinite(w) & (h > 0) & (w > 0))
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        bmi_raw = np.where(error_mask, np.nan, w / (h * h))
+
+    return BMIBatchResult(round_like_builtin(bmi_raw, 2), error_mask)
@@ -1,3 +1,16 @@
+# BMI分类阈值（下界，含）与对应的分类标签。
+# 标签按阈值区间顺序排列：第 i 个标签对应 [BMI_CATEGORY_BOUNDARIES[i-1], BMI_CATEGORY_BOUNDARIES[i])。
+BMI_CATEGORY_BOUNDARIES = (18.5, 24.0, 28.0, 30.0)
+
+BMI_CATEGORY_LABELS = (
+    "偏瘦 (Underweight)",
+    "健康体重 (Healthy Weight)",
+    "超重 (Overweight)",
+    "肥胖前期 (Pre-obese)",
+    "肥胖 (Obese)",
+)
+
+
 def categorize_bmi(bmi_value: float) -> str:
     """
     根据BMI值返回健康状况分类。
@@ -22,12 +35,12 @@ def categorize_bmi(bmi_value: float) -> str:
         raise ValueError("BMI值必须是有效的正数")
 
     if bmi < 18.5:
-        return "偏瘦 (Underweight)"
+        return BMI_CATEGORY_LABELS[0]
     elif bmi < 24.0: # 18.5 <= bmi < 24.0
-        return "健康体重 (Healthy Weight)"
+        return BMI_CATEGORY_LABELS[1]
     elif bmi < 28.0: # 24.0 <= bmi < 28.0
-        return "超重 (Overweight)"
+        return BMI_CATEGORY_LABELS[2]
     elif bmi < 30.0: # 28.0 <= bmi < 30.0
-        return "肥胖前期 (Pre-obese)"
+        return BMI_CATEGORY_LABELS[3]
     else:  # bmi_value >= 30.0
-        return "肥胖 (Obese)"
\ No newline at end of file
+        return BMI_CATEGORY_LABELS[4]
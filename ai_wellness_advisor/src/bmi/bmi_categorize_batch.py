@@ -0,0 +1,64 @@
+# bmi_categorize_batch.py
+
+from enum import IntEnum
+
+import numpy as np
+
+from ..common.array_utils import as_float_array
+from .bmi_categorize import BMI_CATEGORY_BOUNDARIES, BMI_CATEGORY_LABELS
+
+
+class BMICategory(IntEnum):
+    """BMI分类的整数编码，数值即 ``BMI_CATEGORY_LABELS`` 中的下标。"""
+    UNDERWEIGHT = 0
+    HEALTHY_WEIGHT = 1
+    OVERWEIGHT = 2
+    PRE_OBESE = 3
+    OBESE = 4
+
+
+# 无效BMI（非正数、NaN）的分类编码。
+INVALID_BMI_CATEGORY = -1
+
+_BOUNDARIES = np.array(BMI_CATEGORY_BOUNDARIES, dtype=np.float64)
+
+# 编码 -> 标签查找表。最后一项对应 INVALID_BMI_CATEGORY（负下标 -1），
+# 标签对象与 categorize_bmi 返回的字符串是同一批对象，不会逐行分配新字符串。
+BMI_CATEGORY_LABEL_TABLE = np.array(BMI_CATEGORY_LABELS + (None,), dtype=object)
+
+
+def categorize_bmi_batch(bmi_values) -> np.ndarray:
+    """
+    批量计算BMI分类编码。
+
+    对阈值边界做二分查找，一次性完成整列分类，分类规则与 ``categorize_bmi`` 相同。
+
+    参数:
+        bmi_values: BMI值序列（NumPy 数组或任何数字序列/缓冲区协议对象）。
+
+    返回:
+        np.ndarray: int8 分类编码数组，取值见 ``BMICategory``；
+            非正数或 NaN 的行为 ``INVALID_BMI_CATEGORY``。
+
+    异常:
+        ValueError: 如果输入包含无法转换为数字的元素。
+    """
+    bmi = as_float_array(bmi_values, "BMI值必须是有效的数字")
+
+    codes = np.searchsorted(_BOUNDARIES, bmi, side='right').astype(np.int8)
+    with np.errstate(invalid='ignore'):
+        invalid = ~(bmi > 0)
+    return np.where(invalid, np.int8(INVALID_BMI_CATEGORY), codes)
+
+
+def bmi_category_labels(codes) -> np.ndarray:
+    """
+    将分类编码映射回分类标签字符串。
+
+    参数:
+        codes: ``categorize_bmi_batch`` 返回的分类编码。
+
+    返回:
+        np.ndarray: object 数组，元素为共享的标签字符串；无效编码对应 None。
+    """
+    return BMI_CATEGORY_LABEL_TABLE[np.asarray(codes, dtype=np.intp)]
@@ -0,0 +1,4 @@
+# This file makes 'common' a sub-package of 'src'.
+from .array_utils import as_float_array, round_like_builtin
+
+__all__ = ['as_float_array', 'round_like_builtin']
@@ -0,0 +1,62 @@
+"""Shared NumPy helpers for the batch (columnar) calculators.
+
+The scalar calculators round with the builtin ``round()``, which rounds the
+exact decimal value of a float half-to-even. ``np.round`` scales, rints and
+unscales instead, which can disagree with ``round()`` on values sitting next
+to a tie (e.g. ``round(2.675, 2) == 2.67`` but ``np.round(2.675, 2) == 2.68``).
+The helpers here keep batch results bit-identical to the scalar functions.
+"""
+
+import numpy as np
+
+# Scaled values whose fractional part is this close to .5 (relative) are
+# re-rounded with the builtin round(); the vectorized result is exact elsewhere.
+_TIE_TOLERANCE = 1e-9
+
+# Above 2**52 every float64 is an integer, so rint() no longer rounds anything.
+_MAX_EXACT_SCALED = 2.0 ** 52
+
+
+def as_float_array(values, error_message: str) -> np.ndarray:
+    """将数组、缓冲区协议对象或序列转换为 float64 数组。
+
+    Args:
+        values: NumPy 数组、``array.array``、``memoryview`` 或数字序列。
+        error_message (str): 无法转换为数字时抛出的错误信息。
+
+    Returns:
+        np.ndarray: float64 数组（已是 float64 数组时不复制）。
+
+    Raises:
+        ValueError: 当输入包含无法转换为数字的元素时。
+    """
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError(error_message)
+
+
+def round_like_builtin(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """按内置 ``round(x, ndigits)`` 的语义对数组逐元素取整。
+
+    Args:
+        values (np.ndarray): float64 数组，可包含 NaN。
+        ndigits (int): 保留的小数位数。
+
+    Returns:
+        np.ndarray: 与 ``[round(x, ndigits) for x in values]`` 逐位相同的数组。
+    """
+    scale = 10.0 ** ndigits
+    with np.errstate(invalid='ignore', over='ignore'):
+        scaled = values * scale
+        rounded = np.rint(scaled) / scale
+        distance_to_tie = np.abs(scaled - np.floor(scaled) - 0.5)
+        suspect = (distance_to_tie <= _TIE_TOLERANCE * np.maximum(1.0, np.abs(scaled))) | (
+            np.abs(scaled) >= _MAX_EXACT_SCALED
+        )
+    suspect &= np.isfinite(values)
+
+    if suspect.any():
+        rounded = np.array(rounded, dtype=np.float64, copy=True)
+        rounded[suspect] = [round(float(v), ndigits) for v in values[suspect]]
+    return rounded
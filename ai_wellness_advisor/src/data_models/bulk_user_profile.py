@@ -0,0 +1,81 @@
+# Bulk validation for UserProfile
+# Path: ai_wellness_advisor/src/data_models/bulk_user_profile.py
+#
+# Validates a whole list (or JSON array) of profiles with a single pydantic-core
+# call through a TypeAdapter instead of constructing UserProfile one by one.
+# Invalid entries do not abort the import: their errors are grouped by list
+# index and the remaining entries are validated again in one call.
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Union
+
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import from_json
+
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+
+# Built once at import time; building the core schema is the expensive part.
+_PROFILE_LIST_ADAPTER = TypeAdapter(List[UserProfile])
+
+
+@dataclass
+class BulkValidationResult:
+    """Outcome of validating a batch of profiles.
+
+    profiles[i] was built from input position indexes[i]; errors maps every
+    rejected input position to its pydantic error dicts (loc is relative to the
+    profile, i.e. without the leading list index).
+    """
+    profiles: List[UserProfile] = field(default_factory=list)
+    indexes: List[int] = field(default_factory=list)
+    errors: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    @property
+    def error_count(self) -> int:
+        return len(self.errors)
+
+
+def validate_profiles(items: Sequence[Any]) -> BulkValidationResult:
+    """Validates a list of profile mappings (or UserProfile instances) in bulk.
+
+    Raises ValidationError only when the input as a whole is not a list.
+    """
+    items = list(items)
+    try:
+        profiles = _PROFILE_LIST_ADAPTER.validate_python(items)
+    except ValidationError as exc:
+        return _revalidate_valid_items(items, exc)
+    return BulkValidationResult(profiles, list(range(len(profiles))))
+
+
+def validate_profiles_json(data: Union[str, bytes, bytearray]) -> BulkValidationResult:
+    """Validates a JSON array of profiles in bulk.
+
+    The happy path parses and validates in one pass; if some entries are
+    invalid, the array is parsed once more and the valid entries are validated
+    again from the parsed objects.
+    """
+    try:
+        profiles = _PROFILE_LIST_ADAPTER.validate_json(data)
+    except ValidationError as exc:
+        try:
+            items = from_json(data)
+        except ValueError:
+            raise exc from None  # Malformed JSON: nothing to salvage per item.
+        if not isinstance(items, list):
+            raise
+        return _revalidate_valid_items(items, exc)
+    return BulkValidationResult(profiles, list(range(len(profiles))))
+
+
+def _revalidate_valid_items(items: List[Any], exc: ValidationError) -> BulkValidationResult:
+    errors: Dict[int, List[Dict[str, Any]]] = {}
+    for error in exc.errors(include_url=False):
+        loc = error['loc']
+        if not loc or not isinstance(loc[0], int):
+            raise exc  # The container itself is invalid (e.g. not a list).
+        errors.setdefault(loc[0], []).append({**error, 'loc': loc[1:]})
+
+    indexes = [i for i in range(len(items)) if i not in errors]
+    profiles = _PROFILE_LIST_ADAPTER.validate_python([items[i] for i in indexes])
+    return BulkValidationResult(profiles, indexes, dict(sorted(errors.items())))
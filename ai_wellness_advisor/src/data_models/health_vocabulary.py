@@ -0,0 +1,112 @@
+# Canonical vocabulary for health goals, allergies and medical conditions
+# Path: ai_wellness_advisor/src/data_models/health_vocabulary.py
+#
+# Free-text terms are matched against a precompiled alias table: every
+# canonical term and alias is normalized (Unicode NFKC, casefold, collapsed
+# whitespace) into one dict, so matching is a single hash lookup per term.
+# Profiles keep the strings the user entered; the table is only consulted
+# where terms are compared, e.g. ProfileStore's tag columns. The aliases are
+# exact synonyms only (a translation, a plural, a reworded phrase): broader or
+# merely related terms ("diabetes", "seafood", "nuts", "lactose") stay distinct
+# so that a filter never matches a condition or allergy the user did not list.
+#
+# Each canonical term has a small integer tag id (its position in DEFAULT_TERMS
+# order), so columnar containers such as ProfileStore can filter known terms
+# by comparing ints. The table is fixed at construction: terms it does not
+# know get UNKNOWN_TAG rather than a new id, so free text can never grow it.
+
+import unicodedata
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Tag id of any term that is neither a known term nor one of its aliases.
+UNKNOWN_TAG = -1
+
+# Canonical term -> exact synonyms of it.
+DEFAULT_TERMS: Mapping[str, Sequence[str]] = {
+    # Health goals
+    'Lose weight': ('weight loss', 'slim down', '减肥', '减重'),
+    'Gain weight': ('weight gain', '增重'),
+    'Maintain weight': ('weight maintenance', '保持体重'),
+    'Build muscle': ('muscle gain', 'gain muscle', '增肌'),
+    'Improve stamina': ('stamina', 'increase stamina'),
+    'Improve sleep': ('sleep better', 'better sleep', '改善睡眠'),
+    'Reduce stress': ('stress management', 'manage stress', '减压'),
+    'Eat healthier': ('healthy eating', 'eat healthy', 'better diet', '健康饮食'),
+    # Allergies
+    'Pollen': ('hay fever', 'pollen allergy', '花粉'),
+    'Dust mites': ('dust mite', 'house dust mites', '尘螨'),
+    'Peanuts': ('peanut', 'peanut allergy', '花生'),
+    'Tree nuts': ('tree nut', 'tree nut allergy'),
+    'Shellfish': ('shellfish allergy', '贝类'),
+    'Milk': ('milk allergy', 'cow milk', '牛奶'),
+    'Eggs': ('egg', '鸡蛋'),
+    'Gluten': ('gluten allergy', '麸质'),
+    'Soy': ('soya', 'soybean', '大豆'),
+    # Medical conditions
+    'Asthma': ('哮喘',),
+    'Hypertension': ('high blood pressure', '高血压'),
+    'Type 2 diabetes': ('t2d', 'type ii diabetes', '2型糖尿病'),
+    'High cholesterol': ('hypercholesterolemia', '高胆固醇'),
+    'Heart disease': ('心脏病',),
+    'Arthritis': ('关节炎',),
+}
+
+
+def normalize_term(text: str) -> str:
+    """Matching key of a term: NFKC, casefolded, inner whitespace collapsed."""
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+class HealthVocabulary:
+    """Table of canonical health terms with alias matching.
+
+    The table is read-only after construction, so one vocabulary can be shared
+    between stores and threads.
+    """
+
+    def __init__(self, terms: Mapping[str, Sequence[str]] = DEFAULT_TERMS):
+        self._terms: List[str] = []
+        self._ids: Dict[str, int] = {}       # canonical spelling -> tag id
+        self._aliases: Dict[str, int] = {}   # normalized term or alias -> tag id
+        for term, aliases in terms.items():
+            tag_id = self._add(term)
+            for alias in aliases:
+                self._aliases.setdefault(normalize_term(alias), tag_id)
+        self.known_terms = len(self._terms)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def canonical(self, text: str) -> str:
+        """Canonical spelling of a known term or alias; unknown text is returned unchanged."""
+        tag_id = self.lookup(text)
+        return text if tag_id is None else self._terms[tag_id]
+
+    def lookup(self, text: str) -> Optional[int]:
+        """Tag id of a known term or alias; None for any other text."""
+        tag_id = self._ids.get(text)
+        if tag_id is None:
+            tag_id = self._aliases.get(normalize_term(text))
+        return tag_id
+
+    def tag_id(self, term: str) -> int:
+        """Tag id of a term as lookup() resolves it; UNKNOWN_TAG for any other text."""
+        tag_id = self.lookup(term)
+        return UNKNOWN_TAG if tag_id is None else tag_id
+
+    def tag_ids(self, terms: Iterable[str]) -> Tuple[int, ...]:
+        return tuple([self.tag_id(term) for term in terms])
+
+    def term(self, tag_id: int) -> str:
+        return self._terms[tag_id]
+
+    def terms(self, tag_ids: Iterable[int]) -> Tuple[str, ...]:
+        table = self._terms
+        return tuple([table[tag_id] for tag_id in tag_ids])
+
+    def _add(self, term: str) -> int:
+        tag_id = len(self._terms)
+        self._terms.append(term)
+        self._ids[term] = tag_id
+        self._aliases.setdefault(normalize_term(term), tag_id)
+        return tag_id
@@ -0,0 +1,207 @@
+# Compact binary encoding for UserProfile
+# Path: ai_wellness_advisor/src/data_models/profile_binary.py
+#
+# Record layout (version 1, little-endian):
+#   magic     2s   b'UP'
+#   version   B    FORMAT_VERSION
+#   flags     B    bit 0: allergies present, bit 1: medical_conditions present,
+#                  bit 2: created_at naive, bit 3: updated_at naive
+#   user_id   16s  UUID bytes
+#   created   q    microseconds since the Unix epoch (UTC)
+#   updated   q    microseconds since the Unix epoch (UTC)
+#   age       H
+#   gender    B    index into _GENDER_LABELS
+#   height    d
+#   weight    d
+#   then health_goals, allergies (if flagged), medical_conditions (if flagged),
+#   each as: H item count, then per item H byte length + UTF-8 bytes.
+#
+# A typical profile takes ~70-100 bytes versus ~300 as JSON. Decoding reads
+# straight out of any buffer (bytes, bytearray, mmap, memoryview) with
+# struct.unpack_from and memoryview slices, so records can be decoded in place
+# from a larger buffer without copying it. Aware timestamps are stored as UTC
+# instants and decode as UTC datetimes.
+#
+# Records may come from files or the network, so decoded values are validated
+# like any other input: decode/decode_from run UserProfile.model_validate
+# (keeping the stored timestamps) and decode_snapshot_from range-checks the
+# fields against the same constraints.
+
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from uuid import UUID
+
+from ai_wellness_advisor.src.data_models.profile_snapshot import ProfileSnapshot
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import PRESERVE_TIMESTAMPS, UserProfile
+from ai_wellness_advisor.src.data_models.timestamps import from_micros, to_micros
+
+MAGIC = b'UP'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<2sBB16sqqHBdd')
+_COUNT = struct.Struct('<H')
+_MAX_COUNT = 0xFFFF
+
+_HAS_ALLERGIES = 0x01
+_HAS_CONDITIONS = 0x02
+_CREATED_NAIVE = 0x04
+_UPDATED_NAIVE = 0x08
+
+# Wire codes of the gender byte; part of the record format, never reorder.
+_GENDER_LABELS = ('male', 'female', 'other')
+_GENDER_CODES = {label: code for code, label in enumerate(_GENDER_LABELS)}
+
+
+def encode(profile: UserProfile) -> bytes:
+    """Encodes a profile into one binary record."""
+    out = bytearray()
+    encode_into(profile, out)
+    return bytes(out)
+
+
+def encode_into(profile: UserProfile, out: bytearray) -> None:
+    """Appends the binary record of profile to out."""
+    flags = 0
+    if profile.allergies is not None:
+        flags |= _HAS_ALLERGIES
+    if profile.medical_conditions is not None:
+        flags |= _HAS_CONDITIONS
+    if profile.created_at.tzinfo is None:
+        flags |= _CREATED_NAIVE
+    if profile.updated_at.tzinfo is None:
+        flags |= _UPDATED_NAIVE
+    out += _HEADER.pack(
+        MAGIC, FORMAT_VERSION, flags, profile.user_id.bytes,
+        to_micros(profile.created_at), to_micros(profile.updated_at),
+        profile.age, _GENDER_CODES[profile.gender], profile.height_cm, profile.weight_kg,
+    )
+    _pack_strings(out, profile.health_goals)
+    if profile.allergies is not None:
+        _pack_strings(out, profile.allergies)
+    if profile.medical_conditions is not None:
+        _pack_strings(out, profile.medical_conditions)
+
+
+def encode_many(profiles: Iterable[UserProfile]) -> bytes:
+    """Encodes profiles as back-to-back records (see iter_decode)."""
+    out = bytearray()
+    for profile in profiles:
+        encode_into(profile, out)
+    return bytes(out)
+
+
+def decode(buffer) -> UserProfile:
+    """Decodes and validates a buffer holding exactly one record.
+
+    The stored timestamps are kept; invalid field values raise a
+    ValidationError (a ValueError).
+    """
+    profile, end = decode_from(buffer, 0)
+    if end != len(memoryview(buffer).cast('B')):
+        raise ValueError(f"trailing data after profile record at byte {end}")
+    return profile
+
+
+def decode_from(buffer, offset: int = 0) -> Tuple[UserProfile, int]:
+    """Decodes the record starting at offset; returns it and the offset just past it."""
+    fields, end = _read_record(buffer, offset)
+    return UserProfile.model_validate(fields, context=PRESERVE_TIMESTAMPS), end
+
+
+def iter_decode(buffer) -> Iterator[UserProfile]:
+    """Decodes back-to-back records (e.g. from encode_many) in order."""
+    view = memoryview(buffer).cast('B')
+    offset = 0
+    while offset < len(view):
+        profile, offset = decode_from(view, offset)
+        yield profile
+
+
+def decode_snapshot_from(buffer, offset: int = 0) -> Tuple[ProfileSnapshot, int]:
+    """Decodes the record at offset into a read-only ProfileSnapshot.
+
+    Skips pydantic for speed but rejects values outside the UserProfile
+    constraints with a ValueError.
+    """
+    fields, end = _read_record(buffer, offset)
+    _check_ranges(fields, offset)
+    return ProfileSnapshot(**fields), end
+
+
+def _read_record(buffer, offset: int) -> Tuple[Dict[str, Any], int]:
+    """Unpacks the record at offset into UserProfile field values (unvalidated)."""
+    view = memoryview(buffer).cast('B')
+    try:
+        (magic, version, flags, raw_id, created_us, updated_us,
+         age, gender_code, height_cm, weight_kg) = _HEADER.unpack_from(view, offset)
+    except struct.error:
+        raise ValueError(f"truncated profile record at byte {offset}") from None
+    if magic != MAGIC:
+        raise ValueError(f"not a profile record at byte {offset}")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported profile record version {version}")
+    if gender_code >= len(_GENDER_LABELS):
+        raise ValueError(f"invalid gender code {gender_code} at byte {offset}")
+
+    offset += _HEADER.size
+    health_goals, offset = _unpack_strings(view, offset)
+    allergies = medical_conditions = None
+    if flags & _HAS_ALLERGIES:
+        allergies, offset = _unpack_strings(view, offset)
+    if flags & _HAS_CONDITIONS:
+        medical_conditions, offset = _unpack_strings(view, offset)
+
+    fields = {
+        'user_id': UUID(bytes=bytes(raw_id)),
+        'age': age,
+        'gender': _GENDER_LABELS[gender_code],
+        'height_cm': height_cm,
+        'weight_kg': weight_kg,
+        'health_goals': health_goals,
+        'allergies': allergies,
+        'medical_conditions': medical_conditions,
+        'created_at': from_micros(created_us, bool(flags & _CREATED_NAIVE)),
+        'updated_at': from_micros(updated_us, bool(flags & _UPDATED_NAIVE)),
+    }
+    return fields, offset
+
+
+def _check_ranges(fields: Dict[str, Any], offset: int) -> None:
+    # Same bounds as the UserProfile Field constraints; `not x > 0` also rejects NaN.
+    if not 0 < fields['age'] < 120:
+        raise ValueError(f"invalid age {fields['age']} in profile record at byte {offset}")
+    for name in ('height_cm', 'weight_kg'):
+        if not fields[name] > 0:
+            raise ValueError(f"invalid {name} {fields[name]} in profile record at byte {offset}")
+    if not fields['health_goals']:
+        raise ValueError(f"empty health_goals in profile record at byte {offset}")
+
+
+def _pack_strings(out: bytearray, values: List[str]) -> None:
+    if len(values) > _MAX_COUNT:
+        raise ValueError(f"too many list items to encode: {len(values)}")
+    out += _COUNT.pack(len(values))
+    for value in values:
+        data = value.encode('utf-8')
+        if len(data) > _MAX_COUNT:
+            raise ValueError(f"string too long to encode: {len(data)} bytes")
+        out += _COUNT.pack(len(data))
+        out += data
+
+
+def _unpack_strings(view: memoryview, offset: int) -> Tuple[Tuple[str, ...], int]:
+    try:
+        (count,) = _COUNT.unpack_from(view, offset)
+        offset += _COUNT.size
+        values = []
+        for _ in range(count):
+            (length,) = _COUNT.unpack_from(view, offset)
+            offset += _COUNT.size
+            end = offset + length
+            if end > len(view):
+                raise struct.error
+            values.append(str(view[offset:end], 'utf-8'))
+            offset = end
+    except struct.error:
+        raise ValueError(f"truncated profile record at byte {offset}") from None
+    return tuple(values), offset
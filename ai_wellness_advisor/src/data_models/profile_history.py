@@ -0,0 +1,192 @@
+# Measurement history and incrementally recomputed metrics for a UserProfile
+# Path: ai_wellness_advisor/src/data_models/profile_history.py
+#
+# ProfileHistory wraps one UserProfile. Every check-in goes through record(),
+# which applies the new values to the profile (UserProfile.apply_updates) and
+# appends them to an in-memory time series. Derived metrics are cached together
+# with the profile values they were computed from:
+#
+#   bmi          <- height_cm, weight_kg
+#   bmi_category <- bmi
+#   bmr          <- gender, age, height_cm, weight_kg
+#   tdee         <- bmr
+#
+# and a cached value is reused only while those values are unchanged, so a
+# weight change recomputes BMI, BMI category, BMR and TDEE, an age change only
+# BMR and TDEE. Because the check reads the profile itself, assigning to
+# history.profile directly (profile.weight_kg = 90) never leaves a stale metric.
+# Metrics are computed lazily on first access with the same calculators as
+# calculate_metabolic_profile, so the values are identical.
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ai_wellness_advisor.src.bmi.bmi_calculate import calculate_bmi
+from ai_wellness_advisor.src.bmi.bmi_categorize import categorize_bmi
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+from ai_wellness_advisor.src.data_models.timestamps import ONE_MICROSECOND, to_micros
+from ai_wellness_advisor.src.dcnc.calculate_bmr import calculate_bmr
+from ai_wellness_advisor.src.dcnc.calculate_tdee import ACTIVITY_COEFFICIENTS, calculate_tdee
+
+# Profile fields captured by every measurement, in series order.
+MEASURED_FIELDS = ('age', 'height_cm', 'weight_kg')
+
+# Metric -> the profile fields or metrics it is computed from.
+METRIC_INPUTS = {
+    'bmi': ('height_cm', 'weight_kg'),
+    'bmi_category': ('bmi',),
+    'bmr': ('gender', 'age', 'height_cm', 'weight_kg'),
+    'tdee': ('bmr',),
+}
+
+
+def _field_inputs(name: str) -> Tuple[str, ...]:
+    """Profile fields a metric (transitively) depends on, in first-seen order."""
+    if name not in METRIC_INPUTS:
+        return (name,)
+    fields = []
+    for source in METRIC_INPUTS[name]:
+        fields.extend(field for field in _field_inputs(source) if field not in fields)
+    return tuple(fields)
+
+
+# Metric -> the profile fields its cached value is keyed on.
+_CACHE_KEY_FIELDS = {metric: _field_inputs(metric) for metric in METRIC_INPUTS}
+
+
+class TrendSeries(NamedTuple):
+    """Downsampled view of one measured field; only non-empty buckets are listed.
+
+    bucket_start is a datetime64[us] array (UTC), value the aggregated value and
+    count the number of measurements in each bucket.
+    """
+    bucket_start: np.ndarray
+    value: np.ndarray
+    count: np.ndarray
+
+
+class ProfileHistory:
+    """Time series of check-ins for one profile plus cached derived metrics."""
+
+    def __init__(self, profile: UserProfile, recorded_at: Optional[datetime] = None):
+        self.profile = profile
+        self._cache: Dict[str, Tuple[Tuple[Any, ...], Any]] = {}
+        self.computations: Dict[str, int] = {metric: 0 for metric in METRIC_INPUTS}
+        self._times = array('q')
+        self._values = {name: array('d') for name in MEASURED_FIELDS}
+        self._append(recorded_at or profile.updated_at)
+
+    # --- Recording ---
+
+    def record(self, recorded_at: Optional[datetime] = None, **changes: Any) -> None:
+        """Applies a check-in (e.g. weight_kg=71.2) and appends it to the history.
+
+        Values are validated like UserProfile.apply_updates (atomically).
+        Measurements must be recorded in time order; recorded_at defaults to
+        the current time (the profile's new updated_at when anything changed).
+        """
+        now = datetime.now(timezone.utc)
+        if self._times and to_micros(recorded_at or now) < self._times[-1]:
+            raise ValueError("measurements must be recorded in chronological order")
+        self.profile.apply_updates(changes)
+        self._append(recorded_at or (self.profile.updated_at if changes else now))
+
+    def _append(self, recorded_at: datetime) -> None:
+        self._times.append(to_micros(recorded_at))
+        for name, values in self._values.items():
+            values.append(getattr(self.profile, name))
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    # --- Derived metrics (cached) ---
+
+    @property
+    def bmi(self) -> float:
+        return self._metric('bmi')
+
+    @property
+    def bmi_category(self) -> str:
+        return self._metric('bmi_category')
+
+    @property
+    def bmr(self) -> float:
+        """BMR of the current state; raises ValueError like calculate_bmr (e.g. gender "other")."""
+        return self._metric('bmr')
+
+    @property
+    def tdee(self) -> Dict[str, float]:
+        """Activity level -> TDEE of the current state (a copy of the cached values)."""
+        return dict(self._metric('tdee'))
+
+    def _metric(self, metric: str) -> Any:
+        profile = self.profile
+        key = tuple([getattr(profile, name) for name in _CACHE_KEY_FIELDS[metric]])
+        cached = self._cache.get(metric)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        value = self._compute(metric)
+        self._cache[metric] = (key, value)
+        self.computations[metric] += 1
+        return value
+
+    def _compute(self, metric: str) -> Any:
+        profile = self.profile
+        if metric == 'bmi':
+            return calculate_bmi(profile.height_cm / 100, profile.weight_kg)
+        if metric == 'bmi_category':
+            return categorize_bmi(self.bmi)
+        if metric == 'bmr':
+            return calculate_bmr(profile.gender, profile.age, profile.height_cm, profile.weight_kg)
+        bmr = self.bmr
+        return {level: calculate_tdee(bmr, level) for level in ACTIVITY_COEFFICIENTS}
+
+    # --- Queries ---
+
+    def series(self, field: str, start: Optional[datetime] = None,
+               end: Optional[datetime] = None) -> TrendSeries:
+        """Raw measurements of field within [start, end) as a TrendSeries (count 1 each)."""
+        times, values = self._window(field, start, end)
+        return TrendSeries(times.astype('datetime64[us]'), values, np.ones(len(values), dtype=np.int64))
+
+    def trend(self, field: str, bucket: timedelta, start: Optional[datetime] = None,
+              end: Optional[datetime] = None, how: str = 'mean') -> TrendSeries:
+        """Downsamples field into fixed-width time buckets for dashboards.
+
+        Buckets are aligned to start (or to the first measurement) and the
+        values in each are combined with how: "mean", "min", "max" or "last".
+        """
+        if bucket <= timedelta(0):
+            raise ValueError("bucket must be a positive timedelta")
+        if how not in ('mean', 'min', 'max', 'last'):
+            raise ValueError(f"how must be one of mean, min, max, last, got {how!r}")
+        times, values = self._window(field, start, end)
+        if not len(times):
+            return TrendSeries(np.empty(0, dtype='datetime64[us]'), np.empty(0), np.empty(0, dtype=np.int64))
+
+        origin = to_micros(start) if start is not None else int(times[0])
+        width = bucket // ONE_MICROSECOND
+        buckets = (times - origin) // width
+        keys, first, counts = np.unique(buckets, return_index=True, return_counts=True)
+        if how == 'mean':
+            aggregated = np.add.reduceat(values, first) / counts
+        elif how == 'min':
+            aggregated = np.minimum.reduceat(values, first)
+        elif how == 'max':
+            aggregated = np.maximum.reduceat(values, first)
+        else:  # last
+            aggregated = values[first + counts - 1]
+        bucket_start = (origin + keys * width).astype('datetime64[us]')
+        return TrendSeries(bucket_start, aggregated, counts)
+
+    def _window(self, field: str, start: Optional[datetime], end: Optional[datetime]):
+        if field not in self._values:
+            raise ValueError(f"field must be one of {', '.join(MEASURED_FIELDS)}, got {field!r}")
+        times = np.frombuffer(self._times, dtype=np.int64)
+        values = np.frombuffer(self._values[field], dtype=np.float64)
+        lo = 0 if start is None else np.searchsorted(times, to_micros(start), side='left')
+        hi = len(times) if end is None else np.searchsorted(times, to_micros(end), side='left')
+        return times[lo:hi].copy(), values[lo:hi].copy()
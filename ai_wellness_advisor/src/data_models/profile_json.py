@@ -0,0 +1,72 @@
+# Fast JSON (de)serialization helpers for UserProfile
+# Path: ai_wellness_advisor/src/data_models/profile_json.py
+#
+# Thin wrappers over the model's pre-built pydantic-core serializer and
+# validator. They skip the Python-level json module entirely, produce exactly
+# the same JSON as model_dump_json() (UUIDs as strings, timestamps in
+# isoformat() style) and add a newline-delimited batch form.
+
+from typing import Any, Dict, Iterable, List, Union
+
+from pydantic import ValidationError
+from pydantic_core import SchemaSerializer
+
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import PRESERVE_TIMESTAMPS, UserProfile
+
+_SERIALIZER: SchemaSerializer = UserProfile.__pydantic_serializer__
+
+JsonInput = Union[str, bytes, bytearray]
+
+
+def to_bytes(profile: UserProfile) -> bytes:
+    """Serializes a profile to UTF-8 JSON, identical to model_dump_json()."""
+    return _SERIALIZER.to_json(profile)
+
+
+def from_bytes(data: JsonInput, preserve_timestamps: bool = False) -> UserProfile:
+    """Parses and validates one JSON profile in a single pydantic-core call.
+
+    Like UserProfile(**json.loads(data)), validation stamps a fresh updated_at;
+    pass preserve_timestamps=True to keep the one in the payload instead.
+    """
+    context = PRESERVE_TIMESTAMPS if preserve_timestamps else None
+    return UserProfile.model_validate_json(data, context=context)
+
+
+def to_ndjson(profiles: Iterable[UserProfile]) -> bytes:
+    """Serializes profiles as newline-delimited JSON (one record per line)."""
+    to_json = _SERIALIZER.to_json
+    return b''.join([to_json(profile) + b'\n' for profile in profiles])
+
+
+def from_ndjson(data: JsonInput, preserve_timestamps: bool = False) -> List[UserProfile]:
+    """Parses newline-delimited JSON profiles; blank lines are ignored.
+
+    Each line must hold exactly one JSON object and is validated on its own,
+    so a line such as '{...},{...}' is rejected rather than read as two
+    records. Errors from all lines are collected into one ValidationError
+    whose locations start with the 1-based line number in `data`.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    context = PRESERVE_TIMESTAMPS if preserve_timestamps else None
+    validate_json = UserProfile.model_validate_json
+    profiles: List[UserProfile] = []
+    line_errors: List[Dict[str, Any]] = []
+    for line_number, line in enumerate(data.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            profiles.append(validate_json(line, context=context))
+        except ValidationError as exc:
+            line_errors.extend(_at_line(line_number, error) for error in exc.errors(include_url=False))
+    if line_errors:
+        raise ValidationError.from_exception_data(UserProfile.__name__, line_errors)
+    return profiles
+
+
+def _at_line(line_number: int, error: Dict[str, Any]) -> Dict[str, Any]:
+    details = {'type': error['type'], 'loc': (line_number,) + error['loc'], 'input': error['input']}
+    if 'ctx' in error:
+        details['ctx'] = error['ctx']
+    return details
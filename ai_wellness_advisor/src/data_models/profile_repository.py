@@ -0,0 +1,278 @@
+# Append-only persistent repository for UserProfile records
+# Path: ai_wellness_advisor/src/data_models/profile_repository.py
+#
+# On-disk layout of a repository directory:
+#   CURRENT              name of the live generation, e.g. "profiles.000001"
+#   <generation>.ndjson  append-only log, one model_dump_json() record per line;
+#                        a delete appends {"user_id": ..., "deleted": true}
+#   <generation>.idx     binary index: an 8-byte header, then one fixed-size
+#                        entry (user_id bytes, log offset, record length) per
+#                        log record, appended right after the record; deletes
+#                        store the negated length
+#
+# Opening a repository reads only the index (no JSON parsing) to build the
+# user_id -> (offset, length) map; profiles are read on demand from a
+# memory-mapped view of the log. A record is written to the log before its
+# index entry, so after a crash the index can only lag the log: on open, any
+# unindexed complete lines at the end of the log are indexed and a torn last
+# line is truncated. compact() rewrites the live records into a new generation
+# and switches CURRENT atomically, so a crash mid-compaction leaves the old
+# generation intact.
+
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from ai_wellness_advisor.src.data_models.profile_json import from_bytes, to_bytes
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+
+_CURRENT = 'CURRENT'
+_INDEX_MAGIC = b'UPIX'
+_INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct('<4sI')
+_INDEX_ENTRY = struct.Struct('<16sQi')  # user_id bytes, offset, length (negated for deletes)
+
+
+class ProfileRepository:
+    """Persists UserProfile records in an append-only log with an on-disk index.
+
+    Saving appends the profile's JSON; the newest record for a user_id wins.
+    load() is O(1): one dict lookup and one slice of the memory-mapped log.
+    Stored profiles are loaded with their stored updated_at. Set sync=True to fsync after every write.
+    """
+
+    def __init__(self, directory: str, sync: bool = False):
+        self.directory = directory
+        self.sync = sync
+        os.makedirs(directory, exist_ok=True)
+        self._generation = self._read_current()
+        self._entries: Dict[UUID, Tuple[int, int]] = {}
+        self._live_bytes = 0
+        self._map: Optional[mmap.mmap] = None
+        self._open_generation()
+
+    # --- Public API ---
+
+    def save(self, profile: UserProfile) -> None:
+        """Appends the current state of profile."""
+        self._append(profile.user_id, to_bytes(profile), deleted=False)
+
+    def save_many(self, profiles: Iterable[UserProfile]) -> None:
+        for profile in profiles:
+            self.save(profile)
+
+    def delete(self, user_id: UUID) -> None:
+        """Removes a profile; raises KeyError if it is not stored."""
+        if user_id not in self._entries:
+            raise KeyError(user_id)
+        self._append(user_id, _tombstone(user_id), deleted=True)
+
+    def load(self, user_id: UUID) -> UserProfile:
+        """Loads the latest saved version of a profile; raises KeyError if absent."""
+        return from_bytes(self.load_json(user_id), preserve_timestamps=True)
+
+    def load_json(self, user_id: UUID) -> bytes:
+        """Returns the raw JSON record of a profile without validating it."""
+        offset, length = self._entries[user_id]
+        end = offset + length
+        if self._map is None or end > len(self._map):
+            self._remap()
+        return self._map[offset:end]
+
+    def user_ids(self) -> List[UUID]:
+        return list(self._entries)
+
+    def __contains__(self, user_id: UUID) -> bool:
+        return user_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def log_size(self) -> int:
+        """Current size of the log file in bytes."""
+        return self._log_end
+
+    @property
+    def stale_bytes(self) -> int:
+        """Bytes of the log held by superseded versions and deletes (reclaimable by compact())."""
+        return self._log_end - self._live_bytes
+
+    def compact(self) -> int:
+        """Rewrites only the live records into a new generation.
+
+        Records are copied as raw bytes (nothing is re-parsed). Returns the
+        number of bytes reclaimed.
+        """
+        self._writer_flush()
+        self._remap()
+        old_generation, old_size = self._generation, self._log_end
+        new_generation = _next_generation(old_generation)
+        log_path, index_path = self._paths(new_generation)
+
+        with open(log_path, 'wb') as log, open(index_path, 'wb') as index:
+            index.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION))
+            offset = 0
+            for user_id, (old_offset, length) in self._entries.items():
+                log.write(self._map[old_offset:old_offset + length + 1])  # Record plus its newline
+                index.write(_INDEX_ENTRY.pack(user_id.bytes, offset, length))
+                offset += length + 1
+            for handle in (log, index):
+                handle.flush()
+                os.fsync(handle.fileno())
+
+        self._close_files()
+        _write_atomic(os.path.join(self.directory, _CURRENT), new_generation.encode('ascii'))
+        for path in self._paths(old_generation):
+            if os.path.exists(path):
+                os.remove(path)
+        self._generation = new_generation
+        self._open_generation()
+        return old_size - self._log_end
+
+    def close(self) -> None:
+        self._close_files()
+
+    def __enter__(self) -> "ProfileRepository":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # --- Internals ---
+
+    def _paths(self, generation: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, generation)
+        return base + '.ndjson', base + '.idx'
+
+    def _read_current(self) -> str:
+        path = os.path.join(self.directory, _CURRENT)
+        if not os.path.exists(path):
+            _write_atomic(path, b'profiles.000001')
+        with open(path, 'rb') as f:
+            return f.read().decode('ascii').strip()
+
+    def _open_generation(self) -> None:
+        log_path, index_path = self._paths(self._generation)
+        self._entries = {}
+        self._live_bytes = 0
+        indexed_end = self._read_index(index_path)
+
+        self._log = open(log_path, 'ab+')
+        self._log.seek(0, os.SEEK_END)
+        log_size = self._log.tell()
+        self._index = open(index_path, 'ab')
+        if self._index.tell() == 0:
+            self._index.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION))
+            self._index.flush()
+
+        if log_size < indexed_end:
+            raise ValueError(f"index {index_path} references data beyond the end of {log_path}")
+        self._log_end = indexed_end
+        if log_size > indexed_end:
+            self._recover_tail(indexed_end, log_size)
+        self._remap()
+
+    def _read_index(self, index_path: str) -> int:
+        """Loads the index into memory; returns the log offset it covers up to."""
+        if not os.path.exists(index_path):
+            return 0
+        with open(index_path, 'rb') as f:
+            data = f.read()
+        if not data:
+            return 0
+        magic, version = _INDEX_HEADER.unpack_from(data)
+        if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+            raise ValueError(f"{index_path} is not a profile index (version {_INDEX_VERSION})")
+        body = memoryview(data)[_INDEX_HEADER.size:]
+        usable = len(body) - len(body) % _INDEX_ENTRY.size  # Drop a torn trailing entry
+        end = 0
+        for raw_id, offset, length in _INDEX_ENTRY.iter_unpack(body[:usable]):
+            end = self._apply_entry(UUID(bytes=raw_id), offset, length)
+        if usable != len(body):
+            with open(index_path, 'r+b') as f:
+                f.truncate(_INDEX_HEADER.size + usable)
+        return end
+
+    def _apply_entry(self, user_id: UUID, offset: int, length: int) -> int:
+        previous = self._entries.pop(user_id, None)
+        if previous is not None:
+            self._live_bytes -= previous[1] + 1
+        if length < 0:
+            return offset - length + 1
+        self._entries[user_id] = (offset, length)
+        self._live_bytes += length + 1
+        return offset + length + 1
+
+    def _recover_tail(self, start: int, log_size: int) -> None:
+        """Indexes complete log lines past the index; truncates a torn last line."""
+        self._log.seek(start)
+        offset = start
+        for line in self._log:
+            if not line.endswith(b'\n'):
+                break
+            record = json.loads(line)
+            user_id = UUID(record['user_id'])
+            length = 1 - len(line) if record.get('deleted') else len(line) - 1
+            self._write_index_entry(user_id, offset, length)
+            offset = self._apply_entry(user_id, offset, length)
+        if offset < log_size:
+            self._log.truncate(offset)
+        self._log.seek(0, os.SEEK_END)
+        self._log_end = offset
+        self._index.flush()
+
+    def _append(self, user_id: UUID, record: bytes, deleted: bool) -> None:
+        offset = self._log_end
+        self._log.write(record + b'\n')
+        self._writer_flush()
+        length = -len(record) if deleted else len(record)
+        self._write_index_entry(user_id, offset, length)
+        self._index.flush()
+        if self.sync:
+            os.fsync(self._index.fileno())
+        self._log_end = self._apply_entry(user_id, offset, length)
+
+    def _write_index_entry(self, user_id: UUID, offset: int, length: int) -> None:
+        self._index.write(_INDEX_ENTRY.pack(user_id.bytes, offset, length))
+
+    def _writer_flush(self) -> None:
+        self._log.flush()
+        if self.sync:
+            os.fsync(self._log.fileno())
+
+    def _remap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._log_end:
+            self._map = mmap.mmap(self._log.fileno(), self._log_end, access=mmap.ACCESS_READ)
+
+    def _close_files(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        for handle in (self._log, self._index):
+            if not handle.closed:
+                handle.close()
+
+
+def _tombstone(user_id: UUID) -> bytes:
+    return json.dumps({'user_id': str(user_id), 'deleted': True}).encode('utf-8')
+
+
+def _next_generation(generation: str) -> str:
+    prefix, number = generation.rsplit('.', 1)
+    return f"{prefix}.{int(number) + 1:06d}"
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,71 @@
+# Read-only snapshot of a UserProfile
+# Path: ai_wellness_advisor/src/data_models/profile_snapshot.py
+#
+# A frozen, slotted dataclass with the same fields as UserProfile. It has no
+# per-instance __dict__ and no pydantic bookkeeping, so it is much smaller and
+# faster to read in tight loops (advice, scoring). List fields become tuples so
+# the snapshot is hashable and cannot be mutated through a shared list.
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileSnapshot:
+    user_id: UUID
+    age: int
+    gender: str
+    height_cm: float
+    weight_kg: float
+    health_goals: Tuple[str, ...]
+    allergies: Optional[Tuple[str, ...]]
+    medical_conditions: Optional[Tuple[str, ...]]
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_profile(cls, profile: UserProfile) -> "ProfileSnapshot":
+        """Copies every field of an already validated UserProfile."""
+        return cls(
+            profile.user_id,
+            profile.age,
+            profile.gender,
+            profile.height_cm,
+            profile.weight_kg,
+            tuple(profile.health_goals),
+            _optional_tuple(profile.allergies),
+            _optional_tuple(profile.medical_conditions),
+            profile.created_at,
+            profile.updated_at,
+        )
+
+    def to_profile(self) -> UserProfile:
+        """Rebuilds an equal UserProfile without revalidating.
+
+        model_construct skips validation, so the snapshot's timestamps are kept
+        as they are instead of updated_at being bumped.
+        """
+        return UserProfile.model_construct(
+            user_id=self.user_id,
+            age=self.age,
+            gender=self.gender,
+            height_cm=self.height_cm,
+            weight_kg=self.weight_kg,
+            health_goals=list(self.health_goals),
+            allergies=_optional_list(self.allergies),
+            medical_conditions=_optional_list(self.medical_conditions),
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+
+def _optional_tuple(values):
+    return None if values is None else tuple(values)
+
+
+def _optional_list(values):
+    return None if values is None else list(values)
@@ -0,0 +1,375 @@
+# Columnar in-memory store for UserProfile records
+# Path: ai_wellness_advisor/src/data_models/profile_store.py
+#
+# Holds many profiles as typed numpy columns instead of model objects:
+#   - age/height/weight as int16/float64 arrays, gender as int8 codes
+#     (male/female match dcnc's Gender codes, so the columns feed
+#     calculate_bmr_batch directly; "other" gets its own code)
+#   - created_at/updated_at as int64 microseconds since the Unix epoch (UTC)
+#   - list fields as tuples of ids into a shared string pool (the exact
+#     strings of the profile), plus a tag index per list field in two parts:
+#       * a packed bit matrix over the vocabulary's known terms (row -> uint64
+#         words, bit i set when the row lists known term i or an alias of it),
+#         so filters on known terms are a vectorized np.bitwise_and. Its width
+#         is fixed by the vocabulary's known terms, not by the data
+#       * a sparse inverted index for every other term (normalized term ->
+#         set of rows), so free-text terms cost memory per occurrence and
+#         never widen the matrix
+#     Stored strings are never rewritten
+#   - user_id -> row in a dict for O(1) lookup
+# Rows are appended into over-allocated arrays (capacity doubles when full) and
+# removed by moving the last row into the freed slot, so row order is not
+# stable across removals.
+
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from ai_wellness_advisor.src.bmi.bmi_calculate_batch import calculate_bmi_batch
+from ai_wellness_advisor.src.bmi.bmi_categorize_batch import BMICategory, categorize_bmi_batch
+from ai_wellness_advisor.src.data_models.health_vocabulary import HealthVocabulary, normalize_term
+from ai_wellness_advisor.src.data_models.profile_snapshot import ProfileSnapshot
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+from ai_wellness_advisor.src.data_models.timestamps import from_micros, to_micros
+from ai_wellness_advisor.src.dcnc.calculate_bmr_batch import Gender
+from ai_wellness_advisor.src.dcnc.metabolic_profile import (
+    MetabolicProfileBatch,
+    calculate_metabolic_profile_batch,
+)
+
+GENDER_LABELS = ('male', 'female', 'other')
+GENDER_CODES = {'male': Gender.MALE, 'female': Gender.FEMALE, 'other': 2}
+
+_INITIAL_CAPACITY = 1024
+
+# Column name -> dtype for the numpy-backed columns.
+_COLUMNS = {
+    'ages': np.int16,
+    'gender_codes': np.int8,
+    'heights_cm': np.float64,
+    'weights_kg': np.float64,
+    'created_at_us': np.int64,
+    'updated_at_us': np.int64,
+}
+
+PooledStrings = Optional[Tuple[int, ...]]
+
+_TAG_COLUMNS = ('health_goals', 'allergies', 'medical_conditions')
+
+_WORD_BITS = 64
+
+
+class ProfileStore:
+    """Columnar container of profiles keyed by user_id.
+
+    Timestamps are kept as UTC instants: aware datetimes come back converted to
+    UTC and naive ones are taken to be UTC already. List terms are stored as
+    given; only the tag index resolves them, through the store's own
+    HealthVocabulary unless one is passed in (e.g. to share one alias table
+    between stores).
+    """
+
+    def __init__(self, profiles: Iterable[UserProfile] = (),
+                 vocabulary: Optional[HealthVocabulary] = None):
+        self.vocabulary = vocabulary if vocabulary is not None else HealthVocabulary()
+        self._size = 0
+        self._arrays: Dict[str, np.ndarray] = {
+            name: np.empty(_INITIAL_CAPACITY, dtype=dtype) for name, dtype in _COLUMNS.items()
+        }
+        self._user_ids: List[UUID] = []
+        self._rows: Dict[UUID, int] = {}
+        self._health_goals: List[Tuple[int, ...]] = []
+        self._allergies: List[PooledStrings] = []
+        self._medical_conditions: List[PooledStrings] = []
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        # Tag column -> (capacity, words) uint64 bit matrix over the known terms.
+        words = max(1, -(-self.vocabulary.known_terms // _WORD_BITS))
+        self._tag_bits: Dict[str, np.ndarray] = {
+            name: np.zeros((_INITIAL_CAPACITY, words), dtype=np.uint64) for name in _TAG_COLUMNS
+        }
+        # Tag column -> normalized unknown term -> rows listing it, and the
+        # reverse (row -> its unknown terms) to update the index on replace/remove.
+        self._extra_rows: Dict[str, Dict[str, Set[int]]] = {name: {} for name in _TAG_COLUMNS}
+        self._extra_tags: Dict[str, List[Tuple[str, ...]]] = {name: [] for name in _TAG_COLUMNS}
+        self.extend(profiles)
+
+    # --- Mutation ---
+
+    def add(self, profile: UserProfile) -> int:
+        """Inserts a profile, or replaces the stored row with the same user_id.
+
+        Returns the profile's row index.
+        """
+        row = self._rows.get(profile.user_id)
+        if row is None:
+            row = self._size
+            self._ensure_capacity(row + 1)
+            self._size += 1
+            self._rows[profile.user_id] = row
+            self._user_ids.append(profile.user_id)
+            self._health_goals.append(())
+            self._allergies.append(None)
+            self._medical_conditions.append(None)
+            for extra in self._extra_tags.values():
+                extra.append(())
+
+        arrays = self._arrays
+        arrays['ages'][row] = profile.age
+        arrays['gender_codes'][row] = GENDER_CODES[profile.gender]
+        arrays['heights_cm'][row] = profile.height_cm
+        arrays['weights_kg'][row] = profile.weight_kg
+        arrays['created_at_us'][row] = to_micros(profile.created_at)
+        arrays['updated_at_us'][row] = to_micros(profile.updated_at)
+        self._health_goals[row] = self._intern(profile.health_goals)
+        self._allergies[row] = self._intern_optional(profile.allergies)
+        self._medical_conditions[row] = self._intern_optional(profile.medical_conditions)
+        for column in _TAG_COLUMNS:
+            self._set_tags(column, row, getattr(profile, column) or ())
+        return row
+
+    def extend(self, profiles: Iterable[UserProfile]) -> None:
+        for profile in profiles:
+            self.add(profile)
+
+    def remove(self, user_id: UUID) -> None:
+        """Deletes a profile; raises KeyError if it is not stored."""
+        row = self._rows.pop(user_id)
+        last = self._size - 1
+        for column in _TAG_COLUMNS:
+            self._unindex_extra(column, row)
+        if row != last:
+            for array in self._arrays.values():
+                array[row] = array[last]
+            for bits in self._tag_bits.values():
+                bits[row] = bits[last]
+            for column, extra in self._extra_tags.items():
+                index = self._extra_rows[column]
+                for key in extra[last]:
+                    rows = index[key]
+                    rows.discard(last)
+                    rows.add(row)
+                extra[row] = extra[last]
+            moved_id = self._user_ids[last]
+            self._user_ids[row] = moved_id
+            self._rows[moved_id] = row
+            for column in (self._health_goals, self._allergies, self._medical_conditions):
+                column[row] = column[last]
+        for column in (self._user_ids, self._health_goals, self._allergies, self._medical_conditions):
+            column.pop()
+        for extra in self._extra_tags.values():
+            extra.pop()
+        self._size = last
+
+    # --- Lookup ---
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, user_id: UUID) -> bool:
+        return user_id in self._rows
+
+    def __iter__(self) -> Iterator[UUID]:
+        return iter(list(self._user_ids))
+
+    def row_of(self, user_id: UUID) -> int:
+        """Returns the row index of user_id; raises KeyError if it is not stored."""
+        return self._rows[user_id]
+
+    def user_ids(self, rows=None) -> List[UUID]:
+        """Returns the user_ids of the given rows (a boolean mask or indexes), or of all rows."""
+        if rows is None:
+            return list(self._user_ids)
+        rows = np.asarray(rows)
+        if rows.dtype == np.bool_:
+            rows = np.flatnonzero(rows)
+        return [self._user_ids[i] for i in rows.tolist()]
+
+    def snapshot(self, user_id: UUID) -> ProfileSnapshot:
+        """Materializes one stored profile as a read-only ProfileSnapshot."""
+        row = self._rows[user_id]
+        arrays = self._arrays
+        return ProfileSnapshot(
+            user_id,
+            int(arrays['ages'][row]),
+            GENDER_LABELS[arrays['gender_codes'][row]],
+            float(arrays['heights_cm'][row]),
+            float(arrays['weights_kg'][row]),
+            self._lookup(self._health_goals[row]),
+            self._lookup_optional(self._allergies[row]),
+            self._lookup_optional(self._medical_conditions[row]),
+            from_micros(int(arrays['created_at_us'][row])),
+            from_micros(int(arrays['updated_at_us'][row])),
+        )
+
+    def get(self, user_id: UUID) -> UserProfile:
+        """Materializes one stored profile as a UserProfile (without revalidating)."""
+        return self.snapshot(user_id).to_profile()
+
+    # --- Columns (read-only views over the live rows) ---
+
+    def column(self, name: str) -> np.ndarray:
+        """Returns a read-only view of one numeric column (see _COLUMNS)."""
+        view = self._arrays[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def ages(self) -> np.ndarray:
+        return self.column('ages')
+
+    @property
+    def gender_codes(self) -> np.ndarray:
+        return self.column('gender_codes')
+
+    @property
+    def heights_cm(self) -> np.ndarray:
+        return self.column('heights_cm')
+
+    @property
+    def weights_kg(self) -> np.ndarray:
+        return self.column('weights_kg')
+
+    # --- Vectorized queries ---
+
+    def bmi(self) -> np.ndarray:
+        """BMI of every row, identical to calculate_bmi(height_cm / 100, weight_kg)."""
+        return calculate_bmi_batch(self.heights_cm / 100, self.weights_kg).bmi
+
+    def metabolic_profile(self, activity_level=None) -> MetabolicProfileBatch:
+        """Runs the columnar BMI/BMR/TDEE calculators over every row.
+
+        Rows the calculators cannot handle (e.g. gender "other") are flagged in
+        error_mask, as in calculate_metabolic_profile_batch.
+        """
+        return calculate_metabolic_profile_batch(
+            self.gender_codes, self.ages, self.heights_cm, self.weights_kg, activity_level)
+
+    def mask(self, gender: Optional[str] = None, min_age: Optional[int] = None,
+             max_age: Optional[int] = None, bmi_category: Optional[BMICategory] = None,
+             health_goal: Optional[str] = None) -> np.ndarray:
+        """Boolean row mask matching every given criterion (ages are inclusive).
+
+        Example: all obese females over 50 ->
+        store.mask(gender="female", min_age=51, bmi_category=BMICategory.OBESE)
+        """
+        result = np.ones(self._size, dtype=bool)
+        if gender is not None:
+            result &= self.gender_codes == GENDER_CODES[gender]
+        if min_age is not None:
+            result &= self.ages >= min_age
+        if max_age is not None:
+            result &= self.ages <= max_age
+        if bmi_category is not None:
+            result &= categorize_bmi_batch(self.bmi()) == bmi_category
+        if health_goal is not None:
+            result &= self.has_health_goal(health_goal)
+        return result
+
+    def has_health_goal(self, goal: str) -> np.ndarray:
+        """Boolean row mask of profiles listing goal (or one of its aliases) in health_goals."""
+        return self.has_tags('health_goals', [goal])
+
+    def has_tags(self, column: str, terms: Iterable[str], match: str = 'any') -> np.ndarray:
+        """Boolean row mask of profiles whose list column contains any (or all) of terms.
+
+        Terms are matched through the vocabulary, so aliases and spelling
+        variants of a known term match it; other terms match case- and
+        whitespace-insensitively. A missing (None) list matches nothing.
+        """
+        if column not in _TAG_COLUMNS:
+            raise ValueError(f"column must be one of {', '.join(_TAG_COLUMNS)}, got {column!r}")
+        if match not in ('any', 'all'):
+            raise ValueError(f"match must be 'any' or 'all', got {match!r}")
+        bits = self._tag_bits[column][:self._size]
+        query = np.zeros(bits.shape[1], dtype=np.uint64)
+        extra_masks = []
+        for term in terms:
+            tag_id = self.vocabulary.lookup(term)
+            if tag_id is not None:
+                query[tag_id // _WORD_BITS] |= np.uint64(1) << np.uint64(tag_id % _WORD_BITS)
+                continue
+            rows = self._extra_rows[column].get(normalize_term(term))
+            if not rows:
+                # No stored row lists this term.
+                if match == 'all':
+                    return np.zeros(self._size, dtype=bool)
+                continue
+            mask = np.zeros(self._size, dtype=bool)
+            mask[np.fromiter(rows, dtype=np.intp, count=len(rows))] = True
+            extra_masks.append(mask)
+        if not query.any() and not extra_masks:
+            return np.zeros(self._size, dtype=bool)
+        if match == 'any':
+            result = np.bitwise_and(bits, query).any(axis=1)
+            for mask in extra_masks:
+                result |= mask
+        else:
+            result = (np.bitwise_and(bits, query) == query).all(axis=1)
+            for mask in extra_masks:
+                result &= mask
+        return result
+
+    # --- Internals ---
+
+    def _ensure_capacity(self, size: int) -> None:
+        capacity = len(self._arrays['ages'])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name, array in self._arrays.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._arrays[name] = grown
+        for name, bits in self._tag_bits.items():
+            grown = np.zeros((capacity, bits.shape[1]), dtype=np.uint64)
+            grown[:self._size] = bits[:self._size]
+            self._tag_bits[name] = grown
+
+    def _set_tags(self, column: str, row: int, terms: Iterable[str]) -> None:
+        bits = self._tag_bits[column]
+        bits[row] = 0
+        self._unindex_extra(column, row)
+        extra = {}
+        for term in terms:
+            tag_id = self.vocabulary.lookup(term)
+            if tag_id is None:
+                extra[normalize_term(term)] = None
+            else:
+                bits[row, tag_id // _WORD_BITS] |= np.uint64(1) << np.uint64(tag_id % _WORD_BITS)
+        index = self._extra_rows[column]
+        for key in extra:
+            index.setdefault(key, set()).add(row)
+        self._extra_tags[column][row] = tuple(extra)
+
+    def _unindex_extra(self, column: str, row: int) -> None:
+        index = self._extra_rows[column]
+        for key in self._extra_tags[column][row]:
+            rows = index[key]
+            rows.discard(row)
+            if not rows:
+                del index[key]
+        self._extra_tags[column][row] = ()
+
+    def _intern(self, values: List[str]) -> Tuple[int, ...]:
+        string_ids = self._string_ids
+        ids = []
+        for value in values:
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(self._strings)
+                self._strings.append(value)
+            ids.append(string_id)
+        return tuple(ids)
+
+    def _intern_optional(self, values: Optional[List[str]]) -> PooledStrings:
+        return None if values is None else self._intern(values)
+
+    def _lookup(self, ids: Tuple[int, ...]) -> Tuple[str, ...]:
+        strings = self._strings
+        return tuple(strings[i] for i in ids)
+
+    def _lookup_optional(self, ids: PooledStrings) -> Optional[Tuple[str, ...]]:
+        return None if ids is None else self._lookup(ids)
@@ -1,66 +1,91 @@
 # Pydantic model for User Profile
 # Path: /Users/bowhead/ai_dev_exercise_tdd/ai_wellness_advisor/src/data_models/pydantic_user_profile.py
 
-from typing import List, Optional, Literal
+from functools import lru_cache
+from typing import Annotated, Any, FrozenSet, List, Mapping, Optional, Literal
 from uuid import UUID, uuid4
 from datetime import datetime, timezone # Ensure timezone is imported
-from pydantic import BaseModel, Field, validator, root_validator, field_validator # Import field_validator for Pydantic V2 style
+from pydantic import (BaseModel, ConfigDict, Field, PlainSerializer, TypeAdapter, ValidationError,
+                      ValidationInfo, model_validator)
+from typing_extensions import TypedDict  # pydantic requires typing_extensions.TypedDict before Python 3.12
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# JSON output keeps the isoformat() offset style ("+00:00"); pydantic's native
+# datetime serialization would emit "Z" instead. Passing the unbound
+# datetime.isoformat avoids an extra Python frame per value. UUIDs need no
+# serializer: pydantic already dumps them as their canonical string.
+Timestamp = Annotated[datetime, PlainSerializer(datetime.isoformat, return_type=str, when_used='json')]
+
+# Validation context for re-loading stored profiles: keeps their stored
+# updated_at instead of stamping the load time, e.g.
+# UserProfile.model_validate_json(data, context=PRESERVE_TIMESTAMPS).
+PRESERVE_TIMESTAMPS = {'preserve_timestamps': True}
+
 
 class UserProfile(BaseModel):
+    # validate_assignment: re-validates (and bumps updated_at) whenever an attribute is assigned.
+    model_config = ConfigDict(validate_assignment=True)
+
     user_id: UUID = Field(default_factory=uuid4)
     age: int = Field(..., gt=0, lt=120, description="User's age in years")
     gender: Literal['male', 'female', 'other'] = Field(..., description="User's gender")
     height_cm: float = Field(..., gt=0, description="User's height in centimeters")
     weight_kg: float = Field(..., gt=0, description="User's weight in kilograms")
-    health_goals: List[str] = Field(..., min_length=1, description="List of user's health goals") # Pydantic V1: min_items, V2: min_length
+    health_goals: List[str] = Field(..., min_length=1, description="List of user's health goals")
     allergies: Optional[List[str]] = Field(default=None, description="List of user's allergies")
     medical_conditions: Optional[List[str]] = Field(default=None, description="List of user's medical conditions")
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Timestamp of profile creation")
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Timestamp of last profile update")
+    created_at: Timestamp = Field(default_factory=_utcnow, description="Timestamp of profile creation")
+    updated_at: Timestamp = Field(default_factory=_utcnow, description="Timestamp of last profile update")
 
-    @root_validator(skip_on_failure=True)
-    def _update_timestamp_on_any_validation(cls, values):
+    @model_validator(mode="after")
+    def _update_timestamp_on_any_validation(self, info: ValidationInfo) -> "UserProfile":
         """Sets updated_at to current UTC time whenever the model is validated."""
-        # This ensures updated_at reflects the time of the last validation/modification.
-        # This root_validator runs after default_factories and individual field validators.
-        values['updated_at'] = datetime.now(timezone.utc)
-        return values
-
-    # Pydantic V2 uses model_config as a dictionary, not a class
-    # For Pydantic V1, Config class is used.
-    class Config:
-        validate_assignment = True # Allows re-validation when an attribute is assigned a new value.
-        json_encoders = {
-            UUID: lambda v: str(v), # Serializes UUID to string for JSON output.
-            datetime: lambda v: v.isoformat() # Serializes datetime to ISO 8601 string.
-        }
-        # Pydantic V1 anystr_strip_whitespace = True # Strips whitespace from strings (char, byte, str)
-        # This is no longer a config option in Pydantic V2. Whitespace stripping needs to be handled by @validator or @field_validator.
-
-        # Example for Pydantic V2 model_config (if migrating):
-        # model_config = {
-        #     "validate_assignment": True,
-        #     "json_encoders": {
-        #         UUID: lambda v: str(v),
-        #         datetime: lambda v: v.isoformat()
-        #     },
-        #     "title": "User Health Profile",
-        #     "json_schema_extra": {
-        #         "examples": [
-        #             {
-        #                 "user_id": "123e4567-e89b-12d3-a456-426614174000",
-        #                 "age": 30,
-        #                 "gender": "female",
-        #                 "height_cm": 165.5,
-        #                 "weight_kg": 60.2,
-        #                 "health_goals": ["Lose weight", "Improve stamina"],
-        #                 "allergies": ["Pollen", "Dust mites"],
-        #                 "medical_conditions": ["Asthma"],
-        #                 # created_at and updated_at are usually set by the model
-        #             }
-        #         ]
-        #     }
-        # }
+        # Runs after construction and after every validated assignment. Writing to
+        # __dict__ directly avoids re-entering assignment validation and, like the
+        # old root_validator, leaves updated_at out of model_fields_set.
+        if not (info.context and info.context.get('preserve_timestamps')):
+            self.__dict__['updated_at'] = _utcnow()
+        return self
+
+    def apply_updates(self, updates: Mapping[str, Any]) -> "UserProfile":
+        """Validates and applies several field updates at once.
+
+        Only the given fields are validated (in a single pydantic-core call),
+        the model validator does not rerun, and updated_at is bumped once for
+        the whole batch. Updates are atomic: if any value is invalid, a
+        ValidationError listing every bad field is raised and nothing changes.
+        Intended for high-frequency writes such as weight/height check-ins.
+        """
+        if not updates:
+            return self
+        unknown = [name for name in updates if name not in type(self).model_fields]
+        if unknown:
+            raise ValueError(f'"{type(self).__name__}" object has no field "{unknown[0]}"')
+        try:
+            validated = _updates_adapter(type(self), frozenset(updates)).validate_python(updates)
+        except ValidationError as exc:
+            # Re-titled so the error reads like one raised by the model itself.
+            raise ValidationError.from_exception_data(type(self).__name__, exc.errors()) from None
+        self.__dict__.update(validated)
+        self.__pydantic_fields_set__.update(validated)
+        self.__dict__['updated_at'] = _utcnow()
+        return self
+
+
+@lru_cache(maxsize=64)
+def _updates_adapter(model: type, fields: FrozenSet[str]) -> TypeAdapter:
+    """Builds (once per field set) a validator for a partial update of model.
+
+    Each field keeps its annotation and Field() constraints, so the result is
+    what validated assignment would produce for that field.
+    """
+    annotations = {name: Annotated[model.model_fields[name].annotation, model.model_fields[name]]
+                   for name in sorted(fields)}
+    return TypeAdapter(TypedDict(f"{model.__name__}Update", annotations))
 
 # Example Usage (can be run directly for quick testing):
 if __name__ == "__main__":
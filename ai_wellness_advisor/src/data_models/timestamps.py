@@ -0,0 +1,25 @@
+# Integer microsecond timestamps shared by the columnar and binary profile formats
+# Path: ai_wellness_advisor/src/data_models/timestamps.py
+#
+# ProfileStore, ProfileHistory and the binary record format all store
+# datetimes as int64 microseconds since the Unix epoch. Naive datetimes are
+# read as UTC, so a naive and an aware value of the same wall-clock time in
+# UTC map to the same integer.
+
+from datetime import datetime, timedelta, timezone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(value: datetime) -> int:
+    """Microseconds since the Unix epoch; naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // ONE_MICROSECOND
+
+
+def from_micros(micros: int, naive: bool = False) -> datetime:
+    """Inverse of to_micros: an aware UTC datetime, or a naive one if naive is set."""
+    value = EPOCH + timedelta(microseconds=micros)
+    return value.replace(tzinfo=None) if naive else value
@@ -34,6 +34,48 @@ def calculate_bmr(gender: str, age: int, height: float, weight: float) -> float:
     Returns:
         float: 每日基础代谢率（卡路里/天），保留1位小数
     
+    Raises:
+        TypeError: 当参数类型不正确时
+        ValueError: 当参数值超出合理范围或性别无效时
+    """
+    gender_lower = _validate_bmr_inputs(gender, age, height, weight)
+    
+    # Calculate BMR based on gender
+    if gender_lower == 'male':
+        bmr = _calculate_bmr_male(age, height, weight)
+    else:  # female
+        bmr = _calculate_bmr_female(age, height, weight)
+    
+    # Round to 1 decimal place
+    return round(bmr, 1)
+
+
+def calculate_bmr_trusted(gender: str, age: int, height: float, weight: float) -> float:
+    """计算BMR，跳过全部参数校验（可信输入快速路径）。
+    
+    算术与舍入与 ``calculate_bmr`` 完全相同，但不做类型检查、性别标准化和范围检查。
+    仅用于输入已被校验过的场景，例如数据来自已通过 ``calculate_bmr`` 同等规则
+    校验的记录。注意 ``UserProfile`` 的校验并不覆盖这些规则（允许 "other" 性别、
+    身高体重只要求为正数），来自档案的数据仍需先确认满足下列前提。
+    
+    Args:
+        gender (str): 小写的 "male" 或 "female"（不做大小写转换）
+        age (int): 年龄（岁），调用方保证在 1-120 范围内
+        height (float): 身高（厘米），调用方保证在 50-300 范围内
+        weight (float): 体重（千克），调用方保证在 10-500 范围内
+    
+    Returns:
+        float: 每日基础代谢率（卡路里/天），保留1位小数
+    
+    Raises:
+        KeyError: 当 gender 不是小写的 "male" 或 "female" 时
+    """
+    return round(_BMR_FORMULAS[gender](age, height, weight), 1)
+
+
+def _validate_bmr_inputs(gender: str, age: int, height: float, weight: float) -> str:
+    """校验BMR输入参数，返回小写的性别字符串。
+    
     Raises:
         TypeError: 当参数类型不正确时
         ValueError: 当参数值超出合理范围或性别无效时
@@ -65,14 +107,7 @@ def calculate_bmr(gender: str, age: int, height: float, weight: float) -> float:
     if not (10 <= weight <= 500):
         raise ValueError(f"weight must be between 10 and 500 kg, got {weight}")
     
-    # Calculate BMR based on gender
-    if gender_lower == 'male':
-        bmr = _calculate_bmr_male(age, height, weight)
-    else:  # female
-        bmr = _calculate_bmr_female(age, height, weight)
-    
-    # Round to 1 decimal place
-    return round(bmr, 1)
+    return gender_lower
 
 
 def _calculate_bmr_male(age: int, height: float, weight: float) -> float:
@@ -98,4 +133,10 @@ def _calculate_bmr_female(age: int, height: float, weight: float) -> float:
     return (constants['base'] + 
             constants['weight_factor'] * weight + 
             constants['height_factor'] * height - 
-            constants['age_factor'] * age)
\ No newline at end of file
+            constants['age_factor'] * age)
+
+
+_BMR_FORMULAS = {
+    'male': _calculate_bmr_male,
+    'female': _calculate_bmr_female,
+}
@@ -5,6 +5,9 @@ based on BMR and activity level using standard activity coefficients.
 """
 
 import math
+from enum import IntEnum
+from functools import lru_cache
+from typing import Optional, Union
 
 # 活动水平系数常量 - 基于Harris-Benedict标准
 ACTIVITY_COEFFICIENTS = {
@@ -20,7 +23,43 @@ MIN_BMR = 500   # 最小合理BMR值
 MAX_BMR = 5000  # 最大合理BMR值
 
 
-def calculate_tdee(bmr: float, activity_level: str) -> float:
+class ActivityLevel(IntEnum):
+    """活动水平编码，数值为该水平在 ACTIVITY_COEFFICIENTS 中的顺序下标。
+    
+    热路径中可直接传入 ``ActivityLevel`` 成员，避免逐次的字符串标准化和字典查找；
+    字符串可通过 ``parse_activity_level`` 一次性转换。
+    """
+    SEDENTARY = 0
+    LIGHTLY_ACTIVE = 1
+    MODERATELY_ACTIVE = 2
+    VERY_ACTIVE = 3
+    EXTRA_ACTIVE = 4
+    
+    @property
+    def key(self) -> str:
+        """对应的 ACTIVITY_COEFFICIENTS 键，例如 "sedentary"。"""
+        return _ACTIVITY_LEVEL_KEYS[self]
+    
+    @property
+    def coefficient(self) -> float:
+        """对应的活动系数。"""
+        return _ACTIVITY_COEFFICIENTS_BY_CODE[self]
+
+
+# 编码 -> 键 / 系数，下标即 ActivityLevel 的值
+_ACTIVITY_LEVEL_KEYS = tuple(ACTIVITY_COEFFICIENTS)
+_ACTIVITY_COEFFICIENTS_BY_CODE = tuple(ACTIVITY_COEFFICIENTS.values())
+_ACTIVITY_LEVEL_BY_KEY = {key: ActivityLevel(i) for i, key in enumerate(_ACTIVITY_LEVEL_KEYS)}
+_VALID_ACTIVITY_LEVELS = list(ACTIVITY_COEFFICIENTS)
+
+# 可信路径的系数表：同时接受标准化的键和 ActivityLevel 成员
+_TRUSTED_COEFFICIENTS = {
+    **ACTIVITY_COEFFICIENTS,
+    **{level: level.coefficient for level in ActivityLevel},
+}
+
+
+def calculate_tdee(bmr: float, activity_level: Union[str, ActivityLevel]) -> float:
     """计算每日总能量消耗（TDEE）。
     
     基于基础代谢率（BMR）和日常活动水平计算每日总能量消耗。
@@ -34,6 +73,7 @@ def calculate_tdee(bmr: float, activity_level: str) -> float:
             - "moderately_active": 中度活动，中度运动3-5天/周 (系数: 1.55)
             - "very_active": 重度活动，重度运动6-7天/周 (系数: 1.725)
             - "extra_active": 极重度活动，非常重度运动或体力工作 (系数: 1.9)
+            也可以直接传入 ``ActivityLevel`` 成员，跳过字符串标准化。
     
     Returns:
         float: 每日总能量消耗（卡路里/天），保留1位小数
@@ -55,29 +95,75 @@ def calculate_tdee(bmr: float, activity_level: str) -> float:
     if not isinstance(bmr, (int, float)):
         raise TypeError(f"bmr must be int or float, got {type(bmr).__name__}")
     
-    # 2. 活动水平类型验证
-    if not isinstance(activity_level, str):
+    # 2. 活动水平类型验证（ActivityLevel 成员无需标准化）
+    is_code = type(activity_level) is ActivityLevel
+    if not is_code and not isinstance(activity_level, str):
         raise TypeError(f"activity_level must be str, got {type(activity_level).__name__}")
     
-    # 3. BMR特殊值验证
-    if math.isnan(bmr) or math.isinf(bmr):
-        raise ValueError(f"bmr must be a finite number, got {bmr}")
-    
-    # 4. BMR范围验证
-    if not (MIN_BMR <= bmr <= MAX_BMR):
-        raise ValueError(f"bmr must be between {MIN_BMR} and {MAX_BMR}, got {bmr}")
-    
-    # 5. 活动水平标准化
-    activity_level_normalized = activity_level.lower().strip()
+    # 3-4. BMR特殊值与范围验证
+    _validate_bmr_value(bmr)
     
-    # 6. 活动水平有效性验证
-    if activity_level_normalized not in ACTIVITY_COEFFICIENTS:
-        valid_levels = list(ACTIVITY_COEFFICIENTS.keys())
-        raise ValueError(f"activity_level must be one of {valid_levels}, got '{activity_level}'")
+    # 5-6. 活动水平标准化与有效性验证
+    if not is_code:
+        activity_level = parse_activity_level(activity_level)
     
     # 7. 计算TDEE
-    activity_coefficient = ACTIVITY_COEFFICIENTS[activity_level_normalized]
+    activity_coefficient = _ACTIVITY_COEFFICIENTS_BY_CODE[activity_level]
     tdee = bmr * activity_coefficient
     
     # 8. 返回结果（保留1位小数）
-    return round(tdee, 1)
\ No newline at end of file
+    return round(tdee, 1)
+
+
+def calculate_tdee_trusted(bmr: float, activity_level: Union[str, ActivityLevel]) -> float:
+    """计算TDEE，跳过全部参数校验（可信输入快速路径）。
+    
+    算术与舍入与 ``calculate_tdee`` 完全相同，但不做类型检查、特殊值/范围检查和
+    活动水平标准化。仅用于输入已被校验过的场景，例如 ``bmr`` 来自
+    ``calculate_bmr``/``calculate_bmr_trusted`` 且已确认在 MIN_BMR-MAX_BMR 范围内。
+    
+    Args:
+        bmr (float): 基础代谢率（卡路里/天），调用方保证在 500-5000 范围内
+        activity_level (Union[str, ActivityLevel]): ``ActivityLevel`` 成员，或已标准化的
+            ``ACTIVITY_COEFFICIENTS`` 键
+    
+    Returns:
+        float: 每日总能量消耗（卡路里/天），保留1位小数
+    
+    Raises:
+        KeyError: 当 activity_level 既不是 ActivityLevel 也不是有效的键时
+    """
+    return round(bmr * _TRUSTED_COEFFICIENTS[activity_level], 1)
+
+
+def parse_activity_level(activity_level: str) -> ActivityLevel:
+    """把活动水平字符串（不区分大小写，忽略首尾空白）转换为 ``ActivityLevel``。
+    
+    标准化结果按原始字符串缓存，重复出现的写法不会再次做字符串处理。
+    
+    Raises:
+        ValueError: 当活动水平无效时
+    """
+    code = _activity_level_code(activity_level)
+    if code is None:
+        raise ValueError(f"activity_level must be one of {_VALID_ACTIVITY_LEVELS}, got '{activity_level}'")
+    return code
+
+
+@lru_cache(maxsize=1024)
+def _activity_level_code(activity_level: str) -> Optional[ActivityLevel]:
+    return _ACTIVITY_LEVEL_BY_KEY.get(activity_level.lower().strip())
+
+
+def _validate_bmr_value(bmr: float) -> None:
+    """校验BMR是有限数值且在 MIN_BMR-MAX_BMR 范围内。"""
+    if math.isnan(bmr) or math.isinf(bmr):
+        raise ValueError(f"bmr must be a finite number, got {bmr}")
+    
+    if not (MIN_BMR <= bmr <= MAX_BMR):
+        raise ValueError(f"bmr must be between {MIN_BMR} and {MAX_BMR}, got {bmr}")
+
+
+def _normalize_activity_level(activity_level: str) -> str:
+    """标准化活动水平字符串并校验有效性，返回 ACTIVITY_COEFFICIENTS 中的键。"""
+    return _ACTIVITY_LEVEL_KEYS[parse_activity_level(activity_level)]
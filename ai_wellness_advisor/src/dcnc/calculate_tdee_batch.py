@@ -0,0 +1,109 @@
+"""Columnar TDEE (Total Daily Energy Expenditure) calculation module.
+
+This module computes TDEE for whole columns of BMR values at once. Results are
+bit-identical to ``calculate_tdee``; BMR values outside the valid range and
+invalid per-row activity codes are reported through an error mask instead of
+raising.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from ..common.array_utils import as_float_array, round_like_builtin
+from .calculate_tdee import (
+    _ACTIVITY_COEFFICIENTS_BY_CODE,
+    MAX_BMR,
+    MIN_BMR,
+    ActivityLevel,
+    _activity_level_code,
+    parse_activity_level,
+)
+
+# 无法识别的活动水平编码
+INVALID_ACTIVITY_LEVEL = -1
+
+_COEFFICIENT_TABLE = np.array(_ACTIVITY_COEFFICIENTS_BY_CODE, dtype=np.float64)
+
+
+class TDEEBatchResult(NamedTuple):
+    """批量TDEE计算结果。
+
+    Attributes:
+        tdee (np.ndarray): 每行的TDEE（卡路里/天），保留1位小数；无效行为 NaN。
+        error_mask (np.ndarray): 布尔数组，True 表示该行BMR或活动水平编码无效。
+    """
+    tdee: np.ndarray
+    error_mask: np.ndarray
+
+
+def parse_activity_levels(activity_levels) -> np.ndarray:
+    """把活动水平字符串列转换为 ``ActivityLevel`` 编码数组。
+
+    每个不同的字符串只标准化一次（并共享 ``parse_activity_level`` 的缓存），
+    适合在进入热循环前一次性转换整列。
+
+    Args:
+        activity_levels: 活动水平字符串序列
+
+    Returns:
+        np.ndarray: int8 编码数组；无效值为 ``INVALID_ACTIVITY_LEVEL``。
+    """
+    values = np.asarray(activity_levels, dtype=object)
+    if values.size == 0:
+        return np.empty(values.shape, dtype=np.int8)
+    uniques, inverse = np.unique(values.astype(str), return_inverse=True)
+    unique_codes = np.array([_code_or_invalid(value) for value in uniques.tolist()], dtype=np.int8)
+    return unique_codes[inverse].reshape(values.shape)
+
+
+def _code_or_invalid(activity_level: str) -> int:
+    code = _activity_level_code(activity_level)
+    return INVALID_ACTIVITY_LEVEL if code is None else code
+
+
+def calculate_tdee_batch(bmrs, activity_level) -> TDEEBatchResult:
+    """批量计算每日总能量消耗（TDEE）。
+
+    Args:
+        bmrs: BMR（卡路里/天）序列，范围 500-5000
+        activity_level: 所有行共用的活动水平（字符串或 ``ActivityLevel``），
+            或逐行的 ``ActivityLevel`` 编码数组（可用 ``parse_activity_levels`` 生成）
+
+    Returns:
+        TDEEBatchResult: ``(tdee, error_mask)``，超出范围或非有限数值的BMR、
+            以及无效的逐行编码被标记为无效。
+
+    Raises:
+        TypeError: 当 activity_level 既不是字符串/ActivityLevel 也不是整数编码数组时
+        ValueError: 当共用的活动水平无效、BMR无法转换为数字或列长度不一致时
+    """
+    bmr = as_float_array(bmrs, "bmrs must be numeric")
+
+    if type(activity_level) is ActivityLevel:
+        return _tdee_from_valid_coefficient(bmr, activity_level.coefficient)
+    if isinstance(activity_level, str):
+        return _tdee_from_valid_coefficient(bmr, parse_activity_level(activity_level).coefficient)
+
+    codes = np.asarray(activity_level)
+    if codes.ndim == 0 or not np.issubdtype(codes.dtype, np.integer):
+        raise TypeError(f"activity_level must be str, ActivityLevel or an integer code array, "
+                        f"got {type(activity_level).__name__}")
+    if codes.shape != bmr.shape:
+        raise ValueError(f"activity codes must have the same shape as bmrs, got {codes.shape} and {bmr.shape}")
+
+    invalid_code = (codes < 0) | (codes >= len(_COEFFICIENT_TABLE))
+    coefficients = _COEFFICIENT_TABLE[np.where(invalid_code, 0, codes)]
+    result = _tdee_from_valid_coefficient(bmr, coefficients)
+    if invalid_code.any():
+        result = TDEEBatchResult(np.where(invalid_code, np.nan, result.tdee),
+                                 result.error_mask | invalid_code)
+    return result
+
+
+def _tdee_from_valid_coefficient(bmr: np.ndarray, coefficient) -> TDEEBatchResult:
+    """以已校验的活动系数（标量或逐行数组）计算TDEE。"""
+    with np.errstate(invalid='ignore'):
+        error_mask = ~((bmr >= MIN_BMR) & (bmr <= MAX_BMR))
+    tdee = np.where(error_mask, np.nan, bmr * coefficient)
+    return TDEEBatchResult(round_like_builtin(tdee, 1), error_mask)
@@ -0,0 +1,172 @@
+"""Fused metabolic profile module.
+
+This module computes BMI, BMI category, BMR and TDEE in one call. Inputs are
+validated once up front instead of once per calculator, and every value is
+identical to what the chain ``calculate_bmi`` -> ``categorize_bmi`` ->
+``calculate_bmr`` -> ``calculate_tdee`` would return.
+"""
+
+from bisect import bisect_right
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from ..bmi.bmi_calculate_batch import calculate_bmi_batch
+from ..bmi.bmi_categorize import BMI_CATEGORY_BOUNDARIES, BMI_CATEGORY_LABELS
+from ..bmi.bmi_categorize_batch import categorize_bmi_batch
+from ..common.array_utils import as_float_array
+from .calculate_bmr import _calculate_bmr_female, _calculate_bmr_male, _validate_bmr_inputs
+from .calculate_bmr_batch import calculate_bmr_batch
+from .calculate_tdee import ACTIVITY_COEFFICIENTS, ActivityLevel, _normalize_activity_level, _validate_bmr_value
+from .calculate_tdee_batch import _tdee_from_valid_coefficient
+
+
+class MetabolicProfile(NamedTuple):
+    """单个用户的代谢指标。
+
+    Attributes:
+        bmi (float): BMI，保留2位小数（身高按 height_cm / 100 换算为米）
+        bmi_category (str): BMI分类标签，与 ``categorize_bmi`` 返回值相同
+        bmr (float): 基础代谢率（卡路里/天），保留1位小数
+        tdee (Dict[str, float]): 活动水平 -> TDEE（卡路里/天），保留1位小数
+    """
+    bmi: float
+    bmi_category: str
+    bmr: float
+    tdee: Dict[str, float]
+
+
+class MetabolicProfileBatch(NamedTuple):
+    """批量代谢指标，各数组按行对齐。
+
+    Attributes:
+        bmi (np.ndarray): BMI；无效行为 NaN
+        bmi_category (np.ndarray): int8 BMI分类编码（见 ``BMICategory``）
+        bmr (np.ndarray): BMR；无效行为 NaN
+        tdee (Dict[str, np.ndarray]): 活动水平 -> TDEE 数组；无效行为 NaN
+        error_mask (np.ndarray): 布尔数组，True 表示该行任一指标无法计算
+    """
+    bmi: np.ndarray
+    bmi_category: np.ndarray
+    bmr: np.ndarray
+    tdee: Dict[str, np.ndarray]
+    error_mask: np.ndarray
+
+
+def calculate_metabolic_profile(gender: str, age: int, height_cm: float, weight_kg: float,
+                                activity_level: Optional[Union[str, ActivityLevel]] = None
+                                ) -> MetabolicProfile:
+    """一次性计算单个用户的 BMI、BMI分类、BMR 和 TDEE。
+
+    Args:
+        gender (str): 性别，"male" 或 "female"
+        age (int): 年龄（岁），范围 1-120
+        height_cm (float): 身高（厘米），范围 50-300
+        weight_kg (float): 体重（千克），范围 10-500
+        activity_level (Optional[Union[str, ActivityLevel]]): 活动水平；为 None 时计算全部
+            ``ACTIVITY_COEFFICIENTS`` 水平的TDEE
+
+    Returns:
+        MetabolicProfile: 代谢指标
+
+    Raises:
+        TypeError: 当参数类型不正确时
+        ValueError: 当参数值超出合理范围，或计算出的BMR超出TDEE允许范围时
+            （错误信息与对应的单项计算函数相同）
+    """
+    gender_lower = _validate_bmr_inputs(gender, age, height_cm, weight_kg)
+    levels = _resolve_activity_levels(activity_level)
+
+    height_m = float(height_cm) / 100
+    bmi = round(float(weight_kg) / (height_m ** 2), 2)
+    bmi_category = BMI_CATEGORY_LABELS[bisect_right(BMI_CATEGORY_BOUNDARIES, bmi)]
+
+    if gender_lower == 'male':
+        bmr = round(_calculate_bmr_male(age, height_cm, weight_kg), 1)
+    else:  # female
+        bmr = round(_calculate_bmr_female(age, height_cm, weight_kg), 1)
+
+    _validate_bmr_value(bmr)
+    tdee = {level: round(bmr * ACTIVITY_COEFFICIENTS[level], 1) for level in levels}
+
+    return MetabolicProfile(bmi, bmi_category, bmr, tdee)
+
+
+def calculate_metabolic_profile_for(profile,
+                                    activity_level: Optional[Union[str, ActivityLevel]] = None
+                                    ) -> MetabolicProfile:
+    """为一个用户档案对象计算代谢指标。
+
+    接受任何带有 ``gender``、``age``、``height_cm``、``weight_kg`` 属性的对象，
+    例如 ``UserProfile`` 或只读的 ``ProfileSnapshot``。
+
+    Args:
+        profile: 用户档案
+        activity_level (Optional[Union[str, ActivityLevel]]): 同 ``calculate_metabolic_profile``
+
+    Returns:
+        MetabolicProfile: 代谢指标
+
+    Raises:
+        TypeError: 当参数类型不正确时
+        ValueError: 当参数值超出合理范围时（例如性别为 "other"）
+    """
+    return calculate_metabolic_profile(profile.gender, profile.age, profile.height_cm,
+                                       profile.weight_kg, activity_level)
+
+
+def calculate_metabolic_profile_batch(gender_codes, ages, heights_cm, weights_kg,
+                                      activity_level: Optional[Union[str, ActivityLevel]] = None
+                                      ) -> MetabolicProfileBatch:
+    """批量计算 BMI、BMI分类、BMR 和 TDEE。
+
+    各列只转换一次，随后依次经过各个列式计算核心；无效行通过 ``error_mask`` 报告。
+
+    Args:
+        gender_codes: 性别编码序列（见 ``Gender`` / ``encode_genders``）
+        ages: 年龄（岁）序列，范围 1-120
+        heights_cm: 身高（厘米）序列，范围 50-300
+        weights_kg: 体重（千克）序列，范围 10-500
+        activity_level (Optional[Union[str, ActivityLevel]]): 所有行共用的活动水平；
+            为 None 时计算全部水平。逐行的活动水平请用 ``calculate_tdee_batch``
+
+    Returns:
+        MetabolicProfileBatch: 按行对齐的代谢指标
+
+    Raises:
+        TypeError: 当 activity_level 不是字符串时
+        ValueError: 当活动水平无效、输入无法转换为数字或各列长度不一致时
+    """
+    levels = _resolve_activity_levels(activity_level)
+
+    heights = as_float_array(heights_cm, "heights_cm must be numeric")
+    weights = as_float_array(weights_kg, "weights_kg must be numeric")
+
+    bmr_result = calculate_bmr_batch(gender_codes, ages, heights, weights)
+    bmi_result = calculate_bmi_batch(heights / 100, weights)
+
+    tdee = {}
+    error_mask = bmr_result.error_mask | bmi_result.error_mask
+    for level in levels:
+        tdee_result = _tdee_from_valid_coefficient(bmr_result.bmr, ACTIVITY_COEFFICIENTS[level])
+        tdee[level] = tdee_result.tdee
+        error_mask = error_mask | tdee_result.error_mask
+
+    return MetabolicProfileBatch(
+        bmi=bmi_result.bmi,
+        bmi_category=categorize_bmi_batch(bmi_result.bmi),
+        bmr=bmr_result.bmr,
+        tdee=tdee,
+        error_mask=error_mask,
+    )
+
+
+def _resolve_activity_levels(activity_level) -> Tuple[str, ...]:
+    """把 activity_level 参数解析为要计算的 ACTIVITY_COEFFICIENTS 键。"""
+    if activity_level is None:
+        return tuple(ACTIVITY_COEFFICIENTS)
+    if type(activity_level) is ActivityLevel:
+        return (activity_level.key,)
+    if not isinstance(activity_level, str):
+        raise TypeError(f"activity_level must be str, got {type(activity_level).__name__}")
+    return (_normalize_activity_level(activity_level),)
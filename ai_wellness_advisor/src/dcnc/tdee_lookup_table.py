@@ -0,0 +1,317 @@
+"""Precomputed BMR/TDEE lookup tables.
+
+This module provides an optional lookup-table mode for the interactive path,
+where ages are whole years, heights whole centimeters and weights multiples of
+0.1 kg. Values are stored on disk as int32 tenths of a calorie and read back
+through ``mmap``, so answering a query is one indexed read:
+
+- ``bmr_tenths.int32``: shape (gender, age, height, weight) over the grid
+- ``tdee_tenths.int32``: shape (activity level, BMR tenths in MIN_BMR-MAX_BMR)
+
+Tables are built from the columnar kernels, which match ``calculate_bmr`` and
+``calculate_tdee`` bit-for-bit. Inputs outside the grid fall back to the
+formula path.
+
+With the default grid the BMR table is about 1.2 GB (2 x 120 x 251 x 4901
+int32 entries) and takes a while to compute. A query against a directory
+without a matching table builds it on the spot, so build it ahead of time
+(``TDEELookupTable(DIR).build()`` at deploy time, or the command line) rather
+than letting the first interactive request pay for it::
+
+    python -m ai_wellness_advisor.src.dcnc.tdee_lookup_table --build DIR
+    python -m ai_wellness_advisor.src.dcnc.tdee_lookup_table --verify DIR
+
+Every file is written to a uniquely named temporary file in the same directory
+and moved into place with ``os.replace``, so processes that build the same
+directory concurrently never write into each other's files; readers only ever
+see complete files.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from .calculate_bmr import FEMALE_BMR_CONSTANTS, MALE_BMR_CONSTANTS, calculate_bmr
+from .calculate_bmr_batch import AGE_RANGE, HEIGHT_RANGE, WEIGHT_RANGE, Gender, calculate_bmr_batch
+from .calculate_tdee import (
+    ACTIVITY_COEFFICIENTS,
+    MAX_BMR,
+    MIN_BMR,
+    ActivityLevel,
+    _validate_bmr_value,
+    calculate_tdee,
+    parse_activity_level,
+)
+from .calculate_tdee_batch import _tdee_from_valid_coefficient
+
+TABLE_FORMAT_VERSION = 1
+
+META_FILENAME = "meta.json"
+BMR_FILENAME = "bmr_tenths.int32"
+TDEE_FILENAME = "tdee_tenths.int32"
+
+_ACTIVITY_LEVELS = tuple(ACTIVITY_COEFFICIENTS)
+_GENDER_INDEX = {'male': Gender.MALE, 'female': Gender.FEMALE}
+
+# Weight grid resolution: 10 steps per kilogram (0.1 kg).
+_WEIGHT_STEPS_PER_KG = 10
+
+
+class TDEELookupTable:
+    """基于内存映射文件的 BMR/TDEE 查找表。
+
+    表在首次查询时按需加载；目录中没有与当前网格和公式常量匹配的表时，首次查询会
+    同步构建整张表（默认网格约 1.2 GB），因此应在部署时预先调用 build()。
+
+    Args:
+        directory (str): 表文件所在目录
+        age_range (Tuple[int, int]): 年龄网格（岁，含边界），默认与 calculate_bmr 一致
+        height_range (Tuple[int, int]): 身高网格（整厘米，含边界）
+        weight_range (Tuple[int, int]): 体重网格（千克，含边界，步长 0.1 kg）
+    """
+
+    def __init__(self, directory: str,
+                 age_range: Tuple[int, int] = AGE_RANGE,
+                 height_range: Tuple[int, int] = HEIGHT_RANGE,
+                 weight_range: Tuple[int, int] = WEIGHT_RANGE):
+        self.directory = directory
+        self.age_range = tuple(age_range)
+        self.height_range = tuple(height_range)
+        self.weight_range = tuple(weight_range)
+
+        self._ages = np.arange(age_range[0], age_range[1] + 1, dtype=np.float64)
+        self._heights = np.arange(height_range[0], height_range[1] + 1, dtype=np.float64)
+        # k / 10 is the same float as the decimal literal, e.g. 703 / 10 == 70.3.
+        self._weights = np.arange(
+            weight_range[0] * _WEIGHT_STEPS_PER_KG, weight_range[1] * _WEIGHT_STEPS_PER_KG + 1,
+            dtype=np.float64,
+        ) / _WEIGHT_STEPS_PER_KG
+        self._bmr_shape = (len(_GENDER_INDEX), len(self._ages), len(self._heights), len(self._weights))
+        self._tdee_shape = (len(_ACTIVITY_LEVELS), (MAX_BMR - MIN_BMR) * 10 + 1)
+
+        # Row-major strides of the BMR table, used to compute flat indexes.
+        self._bmr_strides = (
+            self._bmr_shape[1] * self._bmr_shape[2] * self._bmr_shape[3],
+            self._bmr_shape[2] * self._bmr_shape[3],
+            self._bmr_shape[3],
+        )
+
+        self._mmaps = []
+        self._bmr_values: Optional[memoryview] = None
+        self._tdee_values: Optional[memoryview] = None
+
+    # --- Queries ---
+
+    def bmr(self, gender: Union[str, int], age: int, height: float, weight: float) -> float:
+        """查询BMR，结果与 ``calculate_bmr`` 相同；网格外的输入走公式计算。"""
+        tenths = self._lookup_bmr_tenths(gender, age, height, weight)
+        if tenths is None:
+            return calculate_bmr(_gender_name(gender), age, height, weight)
+        return tenths / 10
+
+    def tdee(self, gender: Union[str, int], age: int, height: float, weight: float,
+             activity_level: Union[str, ActivityLevel]) -> float:
+        """查询TDEE，结果与 ``calculate_tdee(calculate_bmr(...), activity_level)`` 相同。"""
+        tenths = self._lookup_bmr_tenths(gender, age, height, weight)
+        if tenths is None:
+            bmr = calculate_bmr(_gender_name(gender), age, height, weight)
+            return calculate_tdee(bmr, activity_level)
+
+        is_code = type(activity_level) is ActivityLevel
+        if not is_code and not isinstance(activity_level, str):
+            raise TypeError(f"activity_level must be str, got {type(activity_level).__name__}")
+        _validate_bmr_value(tenths / 10)
+        level = activity_level if is_code else parse_activity_level(activity_level)
+        return self._tdee_values[level * self._tdee_shape[1] + tenths - MIN_BMR * 10] / 10
+
+    def _lookup_bmr_tenths(self, gender, age, height, weight) -> Optional[int]:
+        index = self._grid_index(gender, age, height, weight)
+        if index is None:
+            return None
+        if self._bmr_values is None:
+            self._ensure_loaded()
+        return self._bmr_values[index]
+
+    def _grid_index(self, gender, age, height, weight) -> Optional[int]:
+        """返回输入在BMR表中的扁平下标；不在网格上时返回 None。"""
+        if isinstance(gender, str):
+            g = _GENDER_INDEX.get(gender.lower())
+        elif isinstance(gender, int) and gender in (Gender.MALE, Gender.FEMALE):
+            g = int(gender)
+        else:
+            g = None
+        if g is None or type(age) is not int or not isinstance(height, (int, float)) \
+                or not isinstance(weight, (int, float)):
+            return None
+
+        a = age - self.age_range[0]
+        h = height - self.height_range[0]
+        w_steps = weight * _WEIGHT_STEPS_PER_KG - self.weight_range[0] * _WEIGHT_STEPS_PER_KG
+        if not (0 <= a < self._bmr_shape[1] and 0 <= h < self._bmr_shape[2]
+                and 0 <= w_steps <= self._bmr_shape[3] - 1):
+            return None
+        h_index, w_index = round(h), round(w_steps)
+        if h != h_index or (self.weight_range[0] * _WEIGHT_STEPS_PER_KG + w_index) / _WEIGHT_STEPS_PER_KG != weight:
+            return None
+        g_stride, a_stride, h_stride = self._bmr_strides
+        return g * g_stride + a * a_stride + h_index * h_stride + w_index
+
+    # --- Build / verify ---
+
+    def is_built(self) -> bool:
+        """目录中是否存在与当前网格和公式常量匹配的表。"""
+        try:
+            with open(os.path.join(self.directory, META_FILENAME), encoding='utf-8') as f:
+                return json.load(f) == self._meta()
+        except (OSError, ValueError):
+            return False
+
+    def build(self) -> None:
+        """计算并写入全部表文件（每个文件先写唯一命名的临时文件再原子替换，最后写入元数据）。
+
+        多个进程同时构建同一目录时各自写自己的临时文件；表内容是确定的，
+        后替换的文件与先替换的完全相同，读取方看到的总是完整文件。
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.close()
+        meta_path = os.path.join(self.directory, META_FILENAME)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+        with self._temp_file(BMR_FILENAME) as tmp_path:
+            bmr_table = np.memmap(tmp_path, dtype=np.int32, mode='w+', shape=self._bmr_shape)
+            for g in range(self._bmr_shape[0]):
+                for a in range(self._bmr_shape[1]):
+                    bmr_table[g, a] = self._compute_bmr_slab(g, a)
+            bmr_table.flush()
+            del bmr_table
+
+        with self._temp_file(TDEE_FILENAME) as tmp_path:
+            tdee_table = np.memmap(tmp_path, dtype=np.int32, mode='w+', shape=self._tdee_shape)
+            tdee_table[:] = self._compute_tdee_table()
+            tdee_table.flush()
+            del tdee_table
+
+        with self._temp_file(META_FILENAME) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._meta(), f, indent=2)
+
+    @contextmanager
+    def _temp_file(self, filename: str) -> Iterator[str]:
+        """产出目录内唯一命名的临时文件路径；正常退出时原子替换为 filename，出错时删除。"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{filename}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            yield tmp_path
+            os.replace(tmp_path, os.path.join(self.directory, filename))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def verify(self) -> bool:
+        """用公式路径重新计算全部表项并与磁盘上的表逐项比较。"""
+        if not self.is_built():
+            return False
+        self._ensure_loaded()
+        bmr_table = np.frombuffer(self._bmr_values, dtype=np.int32).reshape(self._bmr_shape)
+        tdee_table = np.frombuffer(self._tdee_values, dtype=np.int32).reshape(self._tdee_shape)
+        for g in range(self._bmr_shape[0]):
+            for a in range(self._bmr_shape[1]):
+                if not np.array_equal(bmr_table[g, a], self._compute_bmr_slab(g, a)):
+                    return False
+        return bool(np.array_equal(tdee_table, self._compute_tdee_table()))
+
+    def _compute_bmr_slab(self, g: int, a: int) -> np.ndarray:
+        heights, weights = np.meshgrid(self._heights, self._weights, indexing='ij')
+        codes = np.full(heights.shape, g, dtype=np.int8)
+        ages = np.full(heights.shape, self._ages[a])
+        result = calculate_bmr_batch(codes, ages, heights, weights)
+        return np.rint(result.bmr * 10).astype(np.int32)
+
+    def _compute_tdee_table(self) -> np.ndarray:
+        bmrs = np.arange(MIN_BMR * 10, MAX_BMR * 10 + 1, dtype=np.float64) / 10
+        rows = [_tdee_from_valid_coefficient(bmrs, ACTIVITY_COEFFICIENTS[level]).tdee
+                for level in _ACTIVITY_LEVELS]
+        return np.rint(np.stack(rows) * 10).astype(np.int32)
+
+    def _ensure_loaded(self) -> None:
+        if self._bmr_values is not None:
+            return
+        if not self.is_built():
+            self.build()
+        self._bmr_values = self._map(BMR_FILENAME, self._bmr_shape)
+        self._tdee_values = self._map(TDEE_FILENAME, self._tdee_shape)
+
+    def _map(self, filename: str, shape: Tuple[int, ...]) -> memoryview:
+        """只读映射表文件，返回按 int32 解释的扁平 memoryview（读取即得 Python int）。"""
+        with open(os.path.join(self.directory, filename), 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        values = memoryview(mapped).cast('i')
+        if len(values) != int(np.prod(shape)):
+            values.release()
+            mapped.close()
+            raise ValueError(f"lookup table file {filename} has unexpected size")
+        self._mmaps.append(mapped)
+        return values
+
+    def close(self) -> None:
+        """释放内存映射；之后的查询会重新映射。"""
+        for values in (self._bmr_values, self._tdee_values):
+            if values is not None:
+                values.release()
+        self._bmr_values = None
+        self._tdee_values = None
+        for mapped in self._mmaps:
+            mapped.close()
+        self._mmaps = []
+
+    def _meta(self) -> dict:
+        return {
+            'format_version': TABLE_FORMAT_VERSION,
+            'age_range': list(self.age_range),
+            'height_range': list(self.height_range),
+            'weight_range': list(self.weight_range),
+            'male_bmr_constants': MALE_BMR_CONSTANTS,
+            'female_bmr_constants': FEMALE_BMR_CONSTANTS,
+            'activity_coefficients': ACTIVITY_COEFFICIENTS,
+            'bmr_range': [MIN_BMR, MAX_BMR],
+        }
+
+
+def _gender_name(gender: Union[str, int]):
+    """把 Gender 编码还原为 calculate_bmr 接受的字符串，其他值原样交给公式路径校验。"""
+    if not isinstance(gender, str) and gender in (Gender.MALE, Gender.FEMALE):
+        return Gender(gender).name.lower()
+    return gender
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build or verify the BMR/TDEE lookup table.")
+    parser.add_argument("directory", help="directory holding the table files")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--build", action="store_true", help="(re)build the table")
+    mode.add_argument("--verify", action="store_true",
+                      help="recompute every entry and compare with the table on disk")
+    args = parser.parse_args(argv)
+
+    table = TDEELookupTable(args.directory)
+    if args.build:
+        table.build()
+        print(f"Built lookup table in {args.directory}")
+        return 0
+
+    ok = table.verify()
+    print("Lookup table OK" if ok else "Lookup table missing, stale or corrupt")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
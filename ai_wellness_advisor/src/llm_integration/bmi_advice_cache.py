@@ -0,0 +1,226 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+
+from ai_wellness_advisor.src.bmi.bmi_categorize import BMI_CATEGORY_LABELS, categorize_bmi
+from ai_wellness_advisor.src.llm_integration.deepseek_api_setup import (
+    DEEPSEEK_MODEL_NAME,
+    SimpleBMIAdvice,
+    get_simple_bmi_advice_from_deepseek,
+)
+
+AdviceResult = Union[SimpleBMIAdvice, Dict[str, Any]]
+
+KEY_BY_BMI = "bmi"
+KEY_BY_CATEGORY = "category"
+
+# BMI sent to the API for each category when key_by="category": a value inside
+# the category (interior bands use their midpoint), so every variant of a
+# category is written for the same BMI.
+CATEGORY_REPRESENTATIVE_BMI: Dict[str, float] = dict(zip(BMI_CATEGORY_LABELS, (17.0, 21.2, 26.0, 29.0, 32.5)))
+
+
+class _Variant:
+    __slots__ = ("advice", "fetched_at")
+
+    def __init__(self, advice: SimpleBMIAdvice, fetched_at: float):
+        self.advice = advice
+        self.fetched_at = fetched_at
+
+
+class BMIAdviceCache:
+    """
+    Advice cache in front of get_simple_bmi_advice_from_deepseek.
+
+    The prompt only carries the BMI rounded to one decimal, so advice is keyed
+    by that rounded value (key_by="bmi") or, more coarsely, by the
+    categorize_bmi label (key_by="category"). In category mode the advice is
+    fetched for the category's CATEGORY_REPRESENTATIVE_BMI, not the caller's
+    BMI, so its text quotes that value: use it for aggregate or internal
+    summaries only, never for advice shown to a user.
+
+    Each key keeps up to `variants` successful responses: until a key is full
+    every call goes to the API and adds a variant, afterwards a random variant
+    is returned without a call, which keeps the variety of the temperature=0.7
+    prompt.
+
+    With ttl set, variants older than ttl seconds are stale. A stale key is
+    refreshed synchronously, or, with background_refresh=True, served from the
+    cache while one variant is re-fetched on a worker thread.
+
+    Error dictionaries from the API are returned to the caller but never cached.
+    Every call returns its own copy of the advice, so callers may modify it.
+
+    Args:
+        fetch (Callable): Function (bmi_value, model_name) -> advice result.
+        key_by (str): "bmi" or "category".
+        variants (int): Number of responses kept per key.
+        ttl (Optional[float]): Seconds a variant stays fresh; None never expires.
+        background_refresh (bool): Refresh stale keys on a worker thread.
+        model_name (str): Model passed to fetch.
+        clock (Callable): Time source, in seconds.
+    """
+
+    def __init__(self,
+                 fetch: Callable[[float, str], AdviceResult] = get_simple_bmi_advice_from_deepseek,
+                 key_by: str = KEY_BY_BMI,
+                 variants: int = 3,
+                 ttl: Optional[float] = None,
+                 background_refresh: bool = False,
+                 model_name: str = DEEPSEEK_MODEL_NAME,
+                 clock: Callable[[], float] = time.monotonic):
+        if key_by not in (KEY_BY_BMI, KEY_BY_CATEGORY):
+            raise ValueError(f"key_by must be '{KEY_BY_BMI}' or '{KEY_BY_CATEGORY}', got {key_by!r}")
+        if variants < 1:
+            raise ValueError("variants must be at least 1")
+        self.fetch = fetch
+        self.key_by = key_by
+        self.variants = variants
+        self.ttl = ttl
+        self.background_refresh = background_refresh
+        self.model_name = model_name
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Union[float, str], List[_Variant]] = {}
+        self._refreshing: Set[Union[float, str]] = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._random = random.Random()
+
+    def key_for(self, bmi_value: float) -> Union[float, str]:
+        """Cache key of a BMI value: the one-decimal BMI or its category label."""
+        if self.key_by == KEY_BY_CATEGORY:
+            return categorize_bmi(bmi_value)
+        return round(float(bmi_value), 1)
+
+    def fetch_bmi_for(self, bmi_value: float) -> float:
+        """BMI passed to fetch for bmi_value: itself, or its category's representative BMI."""
+        if self.key_by == KEY_BY_CATEGORY:
+            return CATEGORY_REPRESENTATIVE_BMI[categorize_bmi(bmi_value)]
+        return bmi_value
+
+    def get(self, bmi_value: float) -> AdviceResult:
+        """
+        Returns advice for a BMI value, from the cache when the key is full and fresh.
+
+        Args:
+            bmi_value (float): The BMI value to get advice for.
+
+        Returns:
+            Union[SimpleBMIAdvice, Dict[str, Any]]:
+                Cached or freshly fetched advice, or the error dictionary of a failed fetch.
+        """
+        key = self.key_for(bmi_value)
+        now = self.clock()
+        with self._lock:
+            pool = self._entries.get(key, [])
+            fresh = [variant for variant in pool if not self._is_stale(variant, now)]
+            if len(fresh) >= self.variants:
+                self.hits += 1
+                return self._random.choice(fresh).advice.model_copy()
+            if pool and self.background_refresh and len(pool) >= self.variants:
+                self.hits += 1
+                self._schedule_refresh(key, self.fetch_bmi_for(bmi_value))
+                return self._random.choice(pool).advice.model_copy()
+            self.misses += 1
+        return self._fetch_into(key, self.fetch_bmi_for(bmi_value))
+
+    def warm(self, bmi_values: Iterable[float]) -> None:
+        """Fills every key of bmi_values with `variants` responses ahead of time."""
+        for bmi_value in bmi_values:
+            key = self.key_for(bmi_value)
+            for _ in range(self.variants):
+                with self._lock:
+                    if len(self._entries.get(key, [])) >= self.variants:
+                        break
+                if not isinstance(self._fetch_into(key, self.fetch_bmi_for(bmi_value)), SimpleBMIAdvice):
+                    break
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "keys": len(self._entries),
+                "variants": sum(len(pool) for pool in self._entries.values()),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """Waits for background refreshes and stops the worker thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_stale(self, variant: _Variant, now: float) -> bool:
+        return self.ttl is not None and now - variant.fetched_at > self.ttl
+
+    def _fetch_into(self, key: Union[float, str], bmi_value: float) -> AdviceResult:
+        result = self.fetch(bmi_value, self.model_name)
+        if isinstance(result, SimpleBMIAdvice):
+            now = self.clock()
+            with self._lock:
+                pool = [variant for variant in self._entries.get(key, []) if not self._is_stale(variant, now)]
+                pool.append(_Variant(result, now))
+                self._entries[key] = pool[-self.variants:]
+            return result.model_copy()
+        return result
+
+    def _schedule_refresh(self, key: Union[float, str], bmi_value: float) -> None:
+        # Called with the lock held; at most one refresh per key is in flight.
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bmi-advice-refresh")
+        self._executor.submit(self._refresh, key, bmi_value)
+
+    def _refresh(self, key: Union[float, str], bmi_value: float) -> None:
+        try:
+            result = self.fetch(bmi_value, self.model_name)
+            if isinstance(result, SimpleBMIAdvice):
+                with self._lock:
+                    pool = self._entries.get(key, [])
+                    pool.sort(key=lambda variant: variant.fetched_at)
+                    pool.append(_Variant(result, self.clock()))
+                    self._entries[key] = pool[-self.variants:]
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+_default_cache: Optional[BMIAdviceCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cached_bmi_advice(bmi_value: float) -> AdviceResult:
+    """
+    Drop-in replacement for get_simple_bmi_advice_from_deepseek backed by a
+    process-wide BMIAdviceCache (keyed by rounded BMI, 3 variants, no expiry).
+
+    The advice is user-facing, so this cache must stay keyed by BMI: with
+    key_by="category" the text would quote the category's representative BMI
+    instead of the user's own value.
+
+    Args:
+        bmi_value (float): The BMI value to get advice for.
+
+    Returns:
+        Union[SimpleBMIAdvice, Dict[str, Any]]:
+            Pydantic model instance if successful, or a dictionary with error info.
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = BMIAdviceCache()
+    return _default_cache.get(bmi_value)
@@ -0,0 +1,5 @@
+"""Cohort scoring module.
+
+This module streams files of user measurements through the batch
+BMI/BMR/TDEE calculators.
+"""
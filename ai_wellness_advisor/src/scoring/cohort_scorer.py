@@ -0,0 +1,491 @@
+"""Streaming cohort scorer.
+
+Reads a CSV or Parquet file of user measurements in fixed-size chunks, runs
+each chunk through the fused batch calculator and writes an enriched copy of
+the file. Only one chunk is held in memory at a time. Invalid rows are skipped
+and reported with the same error message the scalar calculators would raise.
+
+Input columns: ``gender``, ``age``, ``height_cm``, ``weight_kg`` and an
+optional per-row ``activity_level``; any other columns are passed through.
+
+Usage::
+
+    python -m ai_wellness_advisor.score input.csv output.csv --chunk-size 50000
+    python -m ai_wellness_advisor.score input.parquet output.parquet --workers 8
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..bmi.bmi_calculate_batch import calculate_bmi_batch
+from ..bmi.bmi_categorize_batch import bmi_category_labels, categorize_bmi_batch
+from ..dcnc.calculate_bmr_batch import calculate_bmr_batch, encode_genders
+from ..dcnc.calculate_tdee import ACTIVITY_COEFFICIENTS, parse_activity_level
+from ..dcnc.calculate_tdee_batch import calculate_tdee_batch, parse_activity_levels
+from ..dcnc.metabolic_profile import (
+    calculate_metabolic_profile,
+    calculate_metabolic_profile_batch,
+)
+
+REQUIRED_COLUMNS = ('gender', 'age', 'height_cm', 'weight_kg')
+ACTIVITY_COLUMN = 'activity_level'
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Result column -> Parquet type name; bmi_category is written as its label.
+RESULT_TYPES = {'bmi': 'float64', 'bmi_category': 'string', 'bmr': 'float64', 'tdee': 'float64'}
+
+# Number of skipped-row reasons kept in the summary; the rest are only counted
+# (and written to the rejects file when one is given).
+MAX_SAMPLE_ERRORS = 5
+
+Chunk = Dict[str, list]
+
+
+@dataclass
+class ScoreSummary:
+    """一次评分运行的统计信息。"""
+    rows_read: int = 0
+    rows_written: int = 0
+    rows_skipped: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    sample_errors: List[str] = field(default_factory=list)
+
+    def add(self, scored: 'ScoredRows', rejects: Optional['_CsvChunkWriter'] = None) -> None:
+        """计入一个已评分的数据块（行号按读取顺序累加），并写出被跳过的行。"""
+        for i, error, values in scored.skipped:
+            row_number = self.rows_read + i + 1
+            if len(self.sample_errors) < MAX_SAMPLE_ERRORS:
+                self.sample_errors.append(f"row {row_number}: {error}")
+            if rejects is not None:
+                rejects.write_row([row_number, error] + values)
+        self.rows_read += scored.n_rows
+        self.rows_skipped += len(scored.skipped)
+        self.rows_written += scored.n_rows - len(scored.skipped)
+        self.chunks += 1
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"rows read:    {self.rows_read}",
+            f"rows written: {self.rows_written}",
+            f"rows skipped: {self.rows_skipped}",
+            f"chunks:       {self.chunks}",
+            f"elapsed:      {self.elapsed_seconds:.3f} s",
+            f"throughput:   {self.rows_per_second:,.0f} rows/s",
+        ]
+        lines.extend(f"  skipped: {error}" for error in self.sample_errors)
+        return "\n".join(lines)
+
+
+class ChunkArrays(NamedTuple):
+    """一个数据块解析后的数值列，可直接交给 ``score_arrays``（或放入共享内存）。
+
+    Attributes:
+        gender_codes (np.ndarray): int8 性别编码
+        ages (np.ndarray): float64 年龄；无法解析为 NaN
+        heights_cm (np.ndarray): float64 身高（厘米）
+        weights_kg (np.ndarray): float64 体重（千克）
+        activity_index (Optional[np.ndarray]): int8 逐行 ``ActivityLevel`` 编码（-1 为无效）；
+            为 None 时计算全部活动水平
+    """
+    gender_codes: np.ndarray
+    ages: np.ndarray
+    heights_cm: np.ndarray
+    weights_kg: np.ndarray
+    activity_index: Optional[np.ndarray]
+
+
+def prepare_chunk(columns: Chunk, activity_level: Optional[str] = None) -> ChunkArrays:
+    """把一个数据块的原始列解析为数值列。
+
+    Args:
+        columns (Chunk): 列名 -> 值列表（CSV 中为字符串）
+        activity_level (Optional[str]): 所有行共用的活动水平；为 None 时优先使用
+            ``activity_level`` 列，没有该列则计算全部水平
+
+    Returns:
+        ChunkArrays: 数值列
+    """
+    n_rows = len(columns['gender'])
+    if activity_level is not None:
+        activity_index = np.full(n_rows, parse_activity_level(activity_level), dtype=np.int8)
+    elif ACTIVITY_COLUMN in columns:
+        activity_index = parse_activity_levels(columns[ACTIVITY_COLUMN])
+    else:
+        activity_index = None
+    return ChunkArrays(
+        encode_genders(columns['gender']),
+        _parse_numeric(columns['age']),
+        _parse_numeric(columns['height_cm']),
+        _parse_numeric(columns['weight_kg']),
+        activity_index,
+    )
+
+
+def score_arrays(arrays: ChunkArrays) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """为解析后的数值列计算 BMI、BMI分类编码、BMR 和 TDEE。
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], np.ndarray]: 结果列（逐行活动水平时为 ``tdee``，
+            否则为各水平的 ``tdee_<level>``），以及无效行的布尔掩码
+    """
+    if arrays.activity_index is not None:
+        heights = arrays.heights_cm
+        bmr_result = calculate_bmr_batch(arrays.gender_codes, arrays.ages, heights, arrays.weights_kg)
+        bmi_result = calculate_bmi_batch(heights / 100, arrays.weights_kg)
+        tdee_result = calculate_tdee_batch(bmr_result.bmr, arrays.activity_index)
+        results = {
+            'bmi': bmi_result.bmi,
+            'bmi_category': categorize_bmi_batch(bmi_result.bmi),
+            'bmr': bmr_result.bmr,
+            'tdee': tdee_result.tdee,
+        }
+        error_mask = bmr_result.error_mask | bmi_result.error_mask | tdee_result.error_mask
+        return results, error_mask
+
+    batch = calculate_metabolic_profile_batch(
+        arrays.gender_codes, arrays.ages, arrays.heights_cm, arrays.weights_kg)
+    error_mask = batch.error_mask
+    results = {
+        'bmi': batch.bmi,
+        'bmi_category': batch.bmi_category,
+        'bmr': batch.bmr,
+    }
+    for level, values in batch.tdee.items():
+        results[f'tdee_{level}'] = values
+
+    return results, error_mask
+
+
+def score_chunk(columns: Chunk, activity_level: Optional[str] = None, scorer=None
+                ) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """为一个数据块计算 BMI、BMI分类、BMR 和 TDEE。
+
+    Args:
+        columns (Chunk): 列名 -> 值列表（CSV 中为字符串）
+        activity_level (Optional[str]): 见 ``prepare_chunk``
+        scorer (Optional[ParallelScorer]): 若提供，数值计算在其进程池中完成
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], np.ndarray]: 结果列（``bmi_category`` 为标签字符串），
+            以及无效行的布尔掩码
+    """
+    arrays = prepare_chunk(columns, activity_level)
+    results, error_mask = score_arrays(arrays) if scorer is None else scorer.score(arrays)
+    results['bmi_category'] = bmi_category_labels(results['bmi_category'])
+    return results, error_mask
+
+
+def result_columns(input_columns: Sequence[str], activity_level: Optional[str] = None) -> List[str]:
+    """``score_chunk`` 产出的结果列名（与输入数据无关，可在读取前确定输出表头）。"""
+    if activity_level is not None or ACTIVITY_COLUMN in input_columns:
+        return ['bmi', 'bmi_category', 'bmr', 'tdee']
+    return ['bmi', 'bmi_category', 'bmr'] + [f'tdee_{level}' for level in ACTIVITY_COEFFICIENTS]
+
+
+def score_file(input_path: str, output_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               activity_level: Optional[str] = None,
+               rejects_path: Optional[str] = None,
+               workers: int = 1, task_size: Optional[int] = None) -> ScoreSummary:
+    """以固定大小的数据块流式评分整个文件。
+
+    Args:
+        input_path (str): 输入文件（.csv 或 .parquet）
+        output_path (str): 输出文件（.csv 或 .parquet），包含原始列和结果列
+        chunk_size (int): 每个数据块的行数
+        activity_level (Optional[str]): 见 ``score_chunk``
+        rejects_path (Optional[str]): 若提供，将被跳过的行及原因写入该 CSV 文件
+        workers (int): 大于 1 时由 ``score_file_parallel`` 在多个进程中读取、解析和评分
+        task_size (Optional[int]): 并行模式下每个任务的行数（近似），默认等于 chunk_size
+
+    Returns:
+        ScoreSummary: 统计信息
+
+    Raises:
+        ValueError: 当 chunk_size 无效、文件格式不受支持或缺少必需列时
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if workers > 1:
+        from .parallel_scorer import score_file_parallel
+        return score_file_parallel(input_path, output_path, task_size or chunk_size,
+                                   activity_level, rejects_path, workers)
+
+    summary = ScoreSummary()
+    start = time.perf_counter()
+    input_columns, source_schema = read_input_columns(input_path)
+    result_names = result_columns(input_columns, activity_level)
+    writer = None
+    rejects = None
+    try:
+        # Opened before the first chunk so that an input without data rows
+        # still produces a header-only CSV / empty Parquet file.
+        writer = _open_writer(output_path, input_columns, result_names, source_schema)
+        if rejects_path is not None:
+            rejects = _CsvChunkWriter(rejects_path, ['row', 'error'] + input_columns)
+        for chunk in read_chunks(input_path, chunk_size):
+            scored = score_rows(chunk, input_columns, result_names, activity_level,
+                                with_reject_values=rejects is not None)
+            writer.write(scored.output)
+            summary.add(scored, rejects)
+    finally:
+        if writer is not None:
+            writer.close()
+        if rejects is not None:
+            rejects.close()
+
+    summary.elapsed_seconds = time.perf_counter() - start
+    return summary
+
+
+class ScoredRows(NamedTuple):
+    """一个数据块的评分结果：有效行的输出列、行数，以及被跳过行的 (块内序号, 原因, 原始值)。"""
+    output: Dict[str, Sequence]
+    n_rows: int
+    skipped: List[Tuple[int, str, Optional[list]]]
+
+
+def score_rows(chunk: Chunk, input_columns: List[str], result_names: List[str],
+               activity_level: Optional[str] = None, with_reject_values: bool = False) -> ScoredRows:
+    """对一个数据块评分，并为每个无效行生成与标量计算函数相同的错误信息。"""
+    results, error_mask = score_chunk(chunk, activity_level)
+    keep = ~error_mask
+    output = {name: _select(chunk[name], keep) for name in input_columns}
+    output.update({name: results[name][keep] for name in result_names})
+    skipped = [
+        (i, _describe_row_error(chunk, i, activity_level),
+         [chunk[name][i] for name in input_columns] if with_reject_values else None)
+        for i in np.flatnonzero(error_mask).tolist()
+    ]
+    return ScoredRows(output, len(error_mask), skipped)
+
+
+# --- Readers / writers ---
+
+def read_chunks(path: str, chunk_size: int) -> Iterator[Chunk]:
+    """按扩展名选择 CSV 或 Parquet 读取器，逐块产出列字典。"""
+    file_format = _file_format(path)
+    if file_format == 'csv':
+        return _read_csv_chunks(path, chunk_size)
+    return _read_parquet_chunks(path, chunk_size)
+
+
+def read_input_columns(path: str):
+    """读取输入文件的列名（以及 Parquet 输入的 Arrow schema，CSV 为 None）。
+
+    Raises:
+        ValueError: 当文件格式不受支持或缺少必需列时
+    """
+    if _file_format(path) == 'csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), None)
+        if header is None:
+            return [], None
+        _check_columns(header)
+        return header, None
+    schema = _import_pyarrow_parquet().read_schema(path)
+    _check_columns(schema.names)
+    return list(schema.names), schema
+
+
+def _read_csv_chunks(path: str, chunk_size: int) -> Iterator[Chunk]:
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        _check_columns(header)
+        while True:
+            rows = [row for _, row in zip(range(chunk_size), reader)]
+            if not rows:
+                return
+            yield {name: [row[i] if i < len(row) else '' for row in rows]
+                   for i, name in enumerate(header)}
+
+
+def _read_parquet_chunks(path: str, chunk_size: int) -> Iterator[Chunk]:
+    pq = _import_pyarrow_parquet()
+    parquet_file = pq.ParquetFile(path)
+    _check_columns(parquet_file.schema_arrow.names)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        yield {name: column.to_pylist() for name, column in zip(batch.schema.names, batch.columns)}
+
+
+class _CsvChunkWriter:
+    def __init__(self, path: str, header: List[str]):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(header)
+
+    def write(self, columns: Dict[str, Sequence]) -> None:
+        self._writer.writerows(zip(*(_to_list(values) for values in columns.values())))
+
+    def write_text(self, text: str) -> None:
+        """写入已格式化的行（见 ``format_csv_rows``）。"""
+        self._file.write(text)
+
+    def write_row(self, row: list) -> None:
+        self._writer.writerow(row)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetChunkWriter:
+    """Writes chunks under one explicit schema fixed up front.
+
+    The schema is never inferred from a chunk: a chunk with no valid rows, or a
+    pass-through column whose kept values are all None, would otherwise yield
+    null-typed columns that later chunks cannot be appended to.
+    """
+
+    def __init__(self, path: str, input_columns: List[str], result_names: List[str], source_schema=None):
+        self._schema = output_schema(input_columns, result_names, source_schema)
+        self._writer = _import_pyarrow_parquet().ParquetWriter(path, self._schema)
+
+    def write(self, columns: Dict[str, Sequence]) -> None:
+        self._writer.write_table(to_arrow_table(columns, self._schema))
+
+    def write_table(self, table) -> None:
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def output_schema(input_columns: List[str], result_names: List[str], source_schema=None):
+    """Parquet 输出的 Arrow schema：透传列沿用输入 Parquet 的类型（CSV 输入为字符串）。"""
+    pa = __import__('pyarrow')
+    fields = []
+    for name in input_columns:
+        data_type = source_schema.field(name).type if source_schema is not None else pa.string()
+        fields.append(pa.field(name, data_type))
+    for name in result_names:
+        fields.append(pa.field(name, pa.type_for_alias(RESULT_TYPES.get(name, 'float64'))))
+    return pa.schema(fields)
+
+
+def to_arrow_table(columns: Dict[str, Sequence], schema):
+    return __import__('pyarrow').table({name: _to_list(values) for name, values in columns.items()},
+                                       schema=schema)
+
+
+def format_csv_rows(columns: Dict[str, Sequence]) -> str:
+    """把输出列格式化为 CSV 文本，与 ``_CsvChunkWriter.write`` 写出的内容相同。"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(zip(*(_to_list(values) for values in columns.values())))
+    return buffer.getvalue()
+
+
+def _open_writer(path: str, input_columns: List[str], result_names: List[str], source_schema=None):
+    if _file_format(path) == 'csv':
+        return _CsvChunkWriter(path, input_columns + result_names)
+    return _ParquetChunkWriter(path, input_columns, result_names, source_schema)
+
+
+def _file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    raise ValueError(f"Unsupported file type: {path}")
+
+
+def _import_pyarrow_parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet support requires pyarrow: pip install pyarrow")
+    return pq
+
+
+def _check_columns(names: Sequence[str]) -> None:
+    missing = [name for name in REQUIRED_COLUMNS if name not in names]
+    if missing:
+        raise ValueError(f"input is missing required columns: {missing}")
+
+
+# --- Helpers ---
+
+def _parse_numeric(values: list) -> np.ndarray:
+    """把一列值转换为 float64；无法解析的值记为 NaN（随后在批量校验中被标记为无效）。"""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([_to_float_or_nan(value) for value in values], dtype=np.float64)
+
+
+def _to_float_or_nan(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _describe_row_error(chunk: Chunk, i: int, activity_level: Optional[str]) -> str:
+    """用标量计算函数重算一行，得到与其相同的错误信息。"""
+    raw = {name: chunk[name][i] for name in REQUIRED_COLUMNS}
+    parsed = {}
+    for name in ('age', 'height_cm', 'weight_kg'):
+        value = _to_float_or_nan(raw[name])
+        if value != value:
+            return f"{name} must be a number, got {raw[name]!r}"
+        parsed[name] = int(value) if name == 'age' and value.is_integer() else value
+    if activity_level is None and ACTIVITY_COLUMN in chunk:
+        activity_level = chunk[ACTIVITY_COLUMN][i]
+    try:
+        calculate_metabolic_profile(raw['gender'], parsed['age'], parsed['height_cm'],
+                                    parsed['weight_kg'], activity_level)
+    except (TypeError, ValueError) as e:
+        return str(e)
+    return "invalid row"
+
+
+def _select(values: list, keep: np.ndarray) -> list:
+    return [value for value, kept in zip(values, keep.tolist()) if kept]
+
+
+def _to_list(values) -> list:
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Score a CSV/Parquet file of user measurements with BMI, BMR and TDEE.")
+    parser.add_argument("input", help="input .csv or .parquet file")
+    parser.add_argument("output", help="output .csv or .parquet file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"rows per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--activity-level", choices=tuple(ACTIVITY_COEFFICIENTS),
+                        help="activity level for every row (default: the activity_level "
+                             "column, or all levels)")
+    parser.add_argument("--rejects", help="write skipped rows and their errors to this CSV file")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes that read, parse and score file ranges "
+                             "(default: 1, in-process)")
+    parser.add_argument("--task-size", type=int,
+                        help="approximate rows per worker task when --workers > 1 "
+                             "(default: --chunk-size)")
+    args = parser.parse_args(argv)
+
+    summary = score_file(args.input, args.output, args.chunk_size,
+                         args.activity_level, args.rejects, args.workers, args.task_size)
+    print(summary.format(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,375 @@
+"""Multi-process cohort scoring.
+
+``score_file_parallel`` splits the input file itself between worker processes:
+a CSV file is cut into byte ranges that end on record boundaries (found by
+quote parity, so quoted fields may contain newlines) and a Parquet file into
+groups of row groups. Each worker reads its range, parses and scores it,
+describes the invalid rows and formats the output (CSV text or an Arrow
+table). The parent process only scans for boundaries and writes the finished
+pieces in input order, with a bounded number of tasks in flight.
+
+``ParallelScorer`` covers the in-memory case: the parsed numeric columns of a
+chunk are copied into a reusable ``multiprocessing.shared_memory`` block,
+together with preallocated output columns. Workers attach to the block by
+name, score a ``[start, stop)`` slice with ``score_arrays`` and write results
+straight into the output columns, so only slice bounds and the block layout
+are pickled.
+"""
+
+import csv
+import io
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ..dcnc.calculate_tdee import ACTIVITY_COEFFICIENTS
+from .cohort_scorer import (
+    ChunkArrays,
+    ScoreSummary,
+    ScoredRows,
+    _CsvChunkWriter,
+    _file_format,
+    _import_pyarrow_parquet,
+    _open_writer,
+    format_csv_rows,
+    output_schema,
+    read_input_columns,
+    result_columns,
+    score_arrays,
+    score_rows,
+    to_arrow_table,
+)
+
+DEFAULT_TASK_SIZE = 250_000
+
+# Bytes sampled after the CSV header to estimate the average row size.
+_ROW_SIZE_SAMPLE = 1 << 20
+
+# Tasks kept in flight per worker; bounds parent memory to a few results.
+_TASKS_PER_WORKER = 2
+
+# Column start offsets are rounded up to this many bytes.
+_ALIGNMENT = 64
+
+_INPUT_DTYPES = {
+    'gender_codes': np.int8,
+    'ages': np.float64,
+    'heights_cm': np.float64,
+    'weights_kg': np.float64,
+    'activity_index': np.int8,
+}
+
+
+class _ColumnSpec(NamedTuple):
+    name: str
+    dtype: str
+    offset: int
+
+
+class _BlockSpec(NamedTuple):
+    """共享内存块的布局，作为任务参数传给子进程（只含名称和偏移量）。"""
+    shm_name: str
+    n_rows: int
+    inputs: Tuple[_ColumnSpec, ...]
+    outputs: Tuple[_ColumnSpec, ...]
+    has_activity_index: bool
+
+
+class ParallelScorer:
+    """把数值列分片到进程池中并行评分。
+
+    Args:
+        workers (Optional[int]): 工作进程数，默认 ``os.cpu_count()``
+        task_size (int): 每个任务（分片）的行数
+    """
+
+    def __init__(self, workers: Optional[int] = None, task_size: int = DEFAULT_TASK_SIZE):
+        if workers is not None and workers <= 0:
+            raise ValueError(f"workers must be positive, got {workers}")
+        if task_size <= 0:
+            raise ValueError(f"task_size must be positive, got {task_size}")
+        self.workers = workers or os.cpu_count() or 1
+        self.task_size = task_size
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+    def score(self, arrays: ChunkArrays) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """与 ``score_arrays`` 返回相同的结果，计算在工作进程中完成。"""
+        n_rows = len(arrays.gender_codes)
+        has_activity_index = arrays.activity_index is not None
+        input_names = [name for name in _INPUT_DTYPES
+                       if name != 'activity_index' or has_activity_index]
+        output_columns = _output_columns(has_activity_index)
+
+        inputs, offset = _layout([(name, _INPUT_DTYPES[name]) for name in input_names], n_rows, 0)
+        outputs, size = _layout(output_columns, n_rows, offset)
+
+        shm = self._block(size)
+        spec = _BlockSpec(shm.name, n_rows, inputs, outputs, has_activity_index)
+        views = _views(shm, spec)
+        try:
+            for column in inputs:
+                views[column.name][:] = getattr(arrays, column.name)
+
+            futures = [self._executor.submit(_score_slice, spec, start, min(start + self.task_size, n_rows))
+                       for start in range(0, n_rows, self.task_size)]
+            for future in futures:
+                future.result()
+
+            results = {column.name: views[column.name].copy() for column in outputs}
+        finally:
+            # Views pin the block's buffer; drop them so it can be closed later.
+            views = None
+
+        error_mask = results.pop('error_mask')
+        return results, error_mask
+
+    def _block(self, size: int) -> shared_memory.SharedMemory:
+        """返回至少 size 字节的共享内存块；只在不够大时重新分配（按需翻倍）。"""
+        if self._shm is not None and self._shm.size >= size:
+            return self._shm
+        capacity = max(size, 1)
+        if self._shm is not None:
+            capacity = max(capacity, 2 * self._shm.size)
+            self._release_block()
+        self._shm = shared_memory.SharedMemory(create=True, size=capacity)
+        return self._shm
+
+    def _release_block(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        self._release_block()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _output_columns(has_activity_index: bool) -> List[Tuple[str, type]]:
+    columns = [('bmi', np.float64), ('bmi_category', np.int8), ('bmr', np.float64)]
+    if has_activity_index:
+        columns.append(('tdee', np.float64))
+    else:
+        columns.extend((f'tdee_{level}', np.float64) for level in ACTIVITY_COEFFICIENTS)
+    columns.append(('error_mask', np.bool_))
+    return columns
+
+
+def _layout(columns, n_rows: int, offset: int) -> Tuple[Tuple[_ColumnSpec, ...], int]:
+    specs = []
+    for name, dtype in columns:
+        dtype = np.dtype(dtype)
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        specs.append(_ColumnSpec(name, dtype.str, offset))
+        offset += dtype.itemsize * n_rows
+    return tuple(specs), offset
+
+
+def _views(shm: shared_memory.SharedMemory, spec: _BlockSpec) -> Dict[str, np.ndarray]:
+    return {
+        column.name: np.ndarray((spec.n_rows,), dtype=np.dtype(column.dtype),
+                                buffer=shm.buf, offset=column.offset)
+        for column in spec.inputs + spec.outputs
+    }
+
+
+def _score_slice(spec: _BlockSpec, start: int, stop: int) -> None:
+    """子进程任务：对共享内存中的 ``[start, stop)`` 行评分并就地写回结果。"""
+    shm = shared_memory.SharedMemory(name=spec.shm_name)
+    views = arrays = None
+    try:
+        views = {name: view[start:stop] for name, view in _views(shm, spec).items()}
+        arrays = ChunkArrays(
+            views['gender_codes'], views['ages'], views['heights_cm'], views['weights_kg'],
+            views['activity_index'] if spec.has_activity_index else None,
+        )
+        results, error_mask = score_arrays(arrays)
+        for name, values in results.items():
+            views[name][:] = values
+        views['error_mask'][:] = error_mask
+    finally:
+        # Release the views first so a BufferError cannot mask the original exception.
+        views = arrays = None
+        shm.close()
+
+
+# --- File-range parallel scoring ---
+
+class _RangeTask(NamedTuple):
+    """一个工作进程任务：输入文件的一段（CSV 字节范围或 Parquet 行组）及输出格式。"""
+    path: str
+    input_columns: List[str]
+    result_names: List[str]
+    activity_level: Optional[str]
+    with_reject_values: bool
+    output_format: str
+    schema: object
+    byte_range: Optional[Tuple[int, int]] = None
+    row_groups: Optional[List[int]] = None
+
+
+class _RangeResult(NamedTuple):
+    scored: ScoredRows  # output replaced by the formatted payload
+    payload: object
+
+
+def score_file_parallel(input_path: str, output_path: str, task_size: int = DEFAULT_TASK_SIZE,
+                        activity_level: Optional[str] = None,
+                        rejects_path: Optional[str] = None,
+                        workers: Optional[int] = None) -> ScoreSummary:
+    """在多个进程中读取、解析和评分输入文件的各段，输出与 ``score_file`` 串行模式相同。
+
+    Args:
+        input_path (str): 输入文件（.csv 或 .parquet）
+        output_path (str): 输出文件（.csv 或 .parquet）
+        task_size (int): 每个任务的近似行数（CSV 按平均行长度换算为字节数；
+            Parquet 按行组累加）
+        activity_level (Optional[str]): 见 ``score_chunk``
+        rejects_path (Optional[str]): 若提供，将被跳过的行及原因写入该 CSV 文件
+        workers (Optional[int]): 工作进程数，默认 ``os.cpu_count()``
+
+    Returns:
+        ScoreSummary: 统计信息（``chunks`` 为任务数）
+    """
+    if task_size <= 0:
+        raise ValueError(f"task_size must be positive, got {task_size}")
+    if workers is not None and workers <= 0:
+        raise ValueError(f"workers must be positive, got {workers}")
+    workers = workers or os.cpu_count() or 1
+
+    summary = ScoreSummary()
+    start = time.perf_counter()
+    input_columns, source_schema = read_input_columns(input_path)
+    result_names = result_columns(input_columns, activity_level)
+    output_format = _file_format(output_path)
+    schema = output_schema(input_columns, result_names, source_schema) if output_format == 'parquet' else None
+    template = _RangeTask(input_path, input_columns, result_names, activity_level,
+                          rejects_path is not None, output_format, schema)
+
+    writer = rejects = executor = None
+    try:
+        writer = _open_writer(output_path, input_columns, result_names, source_schema)
+        if rejects_path is not None:
+            rejects = _CsvChunkWriter(rejects_path, ['row', 'error'] + input_columns)
+        executor = ProcessPoolExecutor(max_workers=workers)
+        pending = deque()
+        for task in _split_tasks(template, task_size):
+            pending.append(executor.submit(_score_range, task))
+            if len(pending) >= workers * _TASKS_PER_WORKER:
+                _write_result(pending.popleft().result(), writer, output_format, summary, rejects)
+        while pending:
+            _write_result(pending.popleft().result(), writer, output_format, summary, rejects)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if writer is not None:
+            writer.close()
+        if rejects is not None:
+            rejects.close()
+
+    summary.elapsed_seconds = time.perf_counter() - start
+    return summary
+
+
+def _write_result(result: _RangeResult, writer, output_format: str, summary: ScoreSummary,
+                  rejects: Optional[_CsvChunkWriter]) -> None:
+    if output_format == 'csv':
+        writer.write_text(result.payload)
+    else:
+        writer.write_table(result.payload)
+    summary.add(result.scored, rejects)
+
+
+def _split_tasks(template: _RangeTask, task_size: int) -> Iterator[_RangeTask]:
+    if _file_format(template.path) == 'csv':
+        for byte_range in csv_record_ranges(template.path, task_size):
+            yield template._replace(byte_range=byte_range)
+        return
+    metadata = _import_pyarrow_parquet().ParquetFile(template.path).metadata
+    groups, rows = [], 0
+    for i in range(metadata.num_row_groups):
+        groups.append(i)
+        rows += metadata.row_group(i).num_rows
+        if rows >= task_size:
+            yield template._replace(row_groups=groups)
+            groups, rows = [], 0
+    if groups:
+        yield template._replace(row_groups=groups)
+
+
+def csv_record_ranges(path: str, task_size: int) -> Iterator[Tuple[int, int]]:
+    """把 CSV 文件的数据部分（表头之后）切成约 task_size 行的字节范围。
+
+    每个范围都结束在记录分隔符之后：换行符之前的双引号个数为偶数时它才是
+    记录分隔符（RFC 4180 中转义引号成对出现），因此带换行的引号字段不会被切开。
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            start = _next_record_end(data, 0, False)
+            if start >= size:
+                return
+            sample = data[start:start + _ROW_SIZE_SAMPLE]
+            row_bytes = len(sample) / max(sample.count(b'\n'), 1)
+            range_bytes = max(int(row_bytes * task_size), 1)
+            while start < size:
+                candidate = start + range_bytes
+                if candidate >= size:
+                    end = size
+                else:
+                    in_quotes = data[start:candidate].count(b'"') % 2 == 1
+                    end = _next_record_end(data, candidate, in_quotes)
+                yield start, end
+                start = end
+
+
+def _next_record_end(data, pos: int, in_quotes: bool) -> int:
+    """pos 之后第一个记录分隔换行符的下一个字节偏移；in_quotes 为 pos 处是否位于引号字段内。"""
+    while True:
+        newline = data.find(b'\n', pos)
+        if newline < 0:
+            return len(data)
+        in_quotes ^= data[pos:newline].count(b'"') % 2 == 1
+        if not in_quotes:
+            return newline + 1
+        pos = newline + 1
+
+
+def _score_range(task: _RangeTask) -> _RangeResult:
+    """子进程任务：读取并评分一段输入，返回格式化好的输出和被跳过的行。"""
+    chunk = _read_range(task)
+    scored = score_rows(chunk, task.input_columns, task.result_names, task.activity_level,
+                        task.with_reject_values)
+    if task.output_format == 'csv':
+        payload = format_csv_rows(scored.output)
+    else:
+        payload = to_arrow_table(scored.output, task.schema)
+    return _RangeResult(scored._replace(output={}), payload)
+
+
+def _read_range(task: _RangeTask) -> Dict[str, list]:
+    if task.byte_range is not None:
+        start, end = task.byte_range
+        with open(task.path, 'rb') as f:
+            f.seek(start)
+            text = f.read(end - start).decode('utf-8')
+        rows = list(csv.reader(io.StringIO(text, newline='')))
+        return {name: [row[i] if i < len(row) else '' for row in rows]
+                for i, name in enumerate(task.input_columns)}
+    table = _import_pyarrow_parquet().ParquetFile(task.path).read_row_groups(task.row_groups)
+    return {name: table.column(name).to_pylist() for name in task.input_columns}
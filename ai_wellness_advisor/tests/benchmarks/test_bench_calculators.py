@@ -0,0 +1,60 @@
+"""Tests for the benchmark runner (not the benchmark numbers themselves)."""
+
+import json
+
+from ai_wellness_advisor.benchmarks.bench_calculators import (
+    BenchmarkCase,
+    compare,
+    main,
+    run_case,
+    run_suite,
+)
+
+
+def _report(**ops_per_sec):
+    return {"results": {name: {"ops_per_sec": ops} for name, ops in ops_per_sec.items()}}
+
+
+def test_run_case_reports_all_metrics():
+    result = run_case(BenchmarkCase("sum", lambda: sum(range(10)), rows=10, inner=10), min_time=0.001)
+    assert result.calls >= 50
+    assert result.rows_per_sec == result.ops_per_sec * 10
+    assert 0 < result.batch_p50_ns <= result.batch_p99_ns
+    assert result.peak_traced_bytes >= 0
+    assert result.allocated_blocks_per_call >= 0
+
+
+def test_allocated_blocks_count_retained_results():
+    result = run_case(BenchmarkCase("list", lambda: [object() for _ in range(8)], inner=10),
+                      min_time=0.001)
+    # the list plus its eight objects survive each call
+    assert 9 <= result.allocated_blocks_per_call < 12
+
+
+def test_run_suite_filter_and_json_round_trip():
+    report = run_suite(min_time=0.001, name_filter="categorize_bmi")
+    assert set(report["results"]) == {"categorize_bmi", "categorize_bmi_batch"}
+    assert json.loads(json.dumps(report)) == report
+
+
+def test_compare_flags_only_drops_beyond_threshold():
+    baseline = _report(a=1000.0, b=1000.0, c=1000.0)
+    current = _report(a=850.0, b=950.0, c=2000.0, new=1.0)
+    regressions = compare(baseline, current, threshold=0.10)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("a:")
+
+
+def test_main_writes_output_and_fails_on_regression(tmp_path, capsys):
+    output = tmp_path / "current.json"
+    assert main(["--min-time", "0.001", "--filter", "categorize_bmi_batch",
+                 "--output", str(output)]) == 0
+
+    inflated = json.loads(output.read_text())
+    inflated["results"]["categorize_bmi_batch"]["ops_per_sec"] *= 100
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(inflated))
+
+    assert main(["--min-time", "0.001", "--filter", "categorize_bmi_batch",
+                 "--compare", str(baseline)]) == 1
+    assert "REGRESSION categorize_bmi_batch" in capsys.readouterr().out
@@ -0,0 +1,62 @@
+import array
+
+import numpy as np
+import pytest
+
+from ai_wellness_advisor.src.bmi.bmi_calculate import calculate_bmi
+from ai_wellness_advisor.src.bmi.bmi_calculate_batch import calculate_bmi_batch
+
+
+class TestBmiCalculateBatch:
+    def test_matches_scalar_known_values(self):
+        """批量结果与标量函数的已知用例一致"""
+        result = calculate_bmi_batch([1.75, 1.60, 1.80, 2], [70, 55.5, 60, 80])
+        assert result.bmi.tolist() == [22.86, 21.68, 18.52, 20.00]
+        assert not result.error_mask.any()
+
+    def test_matches_scalar_exactly_on_random_cohort(self):
+        """随机人群上与标量函数逐位一致（包括接近 .5 的舍入边界）"""
+        rng = np.random.default_rng(42)
+        heights = np.round(rng.uniform(0.5, 2.5, 20_000), 2)
+        weights = np.round(rng.uniform(2.0, 300.0, 20_000), 1)
+
+        result = calculate_bmi_batch(heights, weights)
+
+        expected = [calculate_bmi(h, w) for h, w in zip(heights.tolist(), weights.tolist())]
+        assert result.bmi.tolist() == expected
+
+    def test_invalid_rows_are_masked_not_raised(self):
+        """无效行被标记而不是抛出异常"""
+        result = calculate_bmi_batch([1.75, 0, -1.75, 1.75, 1.75, np.nan],
+                                     [70, 70, 70, 0, -70, 70])
+        assert result.error_mask.tolist() == [False, True, True, True, True, True]
+        assert result.bmi[0] == 22.86
+        assert np.isnan(result.bmi[1:]).all()
+
+    def test_non_finite_values_are_masked(self):
+        result = calculate_bmi_batch([np.inf, 1.75], [70, np.inf])
+        assert result.error_mask.tolist() == [True, True]
+
+    def test_accepts_buffer_protocol_inputs(self):
+        """接受 array.array 与 memoryview 等缓冲区协议对象"""
+        heights = array.array('d', [1.75, 1.60])
+        weights = memoryview(array.array('d', [70.0, 55.5]))
+        result = calculate_bmi_batch(heights, weights)
+        assert result.bmi.tolist() == [22.86, 21.68]
+
+    def test_empty_input(self):
+        result = calculate_bmi_batch([], [])
+        assert result.bmi.shape == (0,)
+        assert result.error_mask.shape == (0,)
+
+    def test_shape_mismatch_raises(self):
+        with pytest.raises(ValueError, match="身高与体重的数量必须一致"):
+            calculate_bmi_batch([1.75, 1.80], [70])
+
+    def test_non_numeric_height_raises(self):
+        with pytest.raises(ValueError, match="身高必须是一个有效的数字。"):
+            calculate_bmi_batch(["abc"], [70])
+
+    def test_non_numeric_weight_raises(self):
+        with pytest.raises(ValueError, match="体重必须是一个有效的数字。"):
+            calculate_bmi_batch([1.75], ["xyz"])
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from ai_wellness_advisor.src.bmi.bmi_categorize import categorize_bmi
+from ai_wellness_advisor.src.bmi.bmi_categorize_batch import (
+    INVALID_BMI_CATEGORY,
+    BMICategory,
+    bmi_category_labels,
+    categorize_bmi_batch,
+)
+
+# 每个阈值两侧的边界值
+BOUNDARY_VALUES = [10.0, 18.49, 18.5, 22.0, 23.99, 24.0, 26.0, 27.99, 28.0, 29.0, 29.99, 30.0, 35.0]
+
+
+def test_codes_match_scalar_categorization_on_boundaries():
+    codes = categorize_bmi_batch(BOUNDARY_VALUES)
+    labels = bmi_category_labels(codes)
+    assert labels.tolist() == [categorize_bmi(v) for v in BOUNDARY_VALUES]
+
+
+def test_codes_are_compact_int8():
+    codes = categorize_bmi_batch([17.0, 22.0, 26.0, 29.0, 31.0])
+    assert codes.dtype == np.int8
+    assert codes.tolist() == [
+        BMICategory.UNDERWEIGHT,
+        BMICategory.HEALTHY_WEIGHT,
+        BMICategory.OVERWEIGHT,
+        BMICategory.PRE_OBESE,
+        BMICategory.OBESE,
+    ]
+
+
+def test_random_cohort_matches_scalar():
+    rng = np.random.default_rng(7)
+    values = np.round(rng.uniform(10.0, 45.0, 5_000), 2)
+    labels = bmi_category_labels(categorize_bmi_batch(values))
+    assert labels.tolist() == [categorize_bmi(v) for v in values.tolist()]
+
+
+def test_invalid_values_get_invalid_code():
+    codes = categorize_bmi_batch([0, -5.0, np.nan, 22.0])
+    assert codes.tolist() == [INVALID_BMI_CATEGORY] * 3 + [BMICategory.HEALTHY_WEIGHT]
+    assert bmi_category_labels(codes).tolist()[:3] == [None, None, None]
+
+
+def test_labels_are_shared_objects():
+    """同一分类的标签是同一个字符串对象，而不是逐行新建"""
+    labels = bmi_category_labels(categorize_bmi_batch([22.0, 23.0]))
+    assert labels[0] is labels[1]
+    assert labels[0] is categorize_bmi(22.0)
+
+
+def test_non_numeric_raises():
+    with pytest.raises(ValueError, match="BMI值必须是有效的数字"):
+        categorize_bmi_batch(["abc"])
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from ai_wellness_advisor.src.common.array_utils import as_float_array, round_like_builtin
+
+
+class TestRoundLikeBuiltin:
+    @pytest.mark.parametrize("ndigits", [1, 2])
+    def test_near_tie_values_match_builtin_round(self, ndigits):
+        values = np.array([2.675, 0.125, 0.375, 1.005, 2.5, 3.5, -2.675, 1695.65, 1e300])
+        expected = [round(v, ndigits) for v in values.tolist()]
+        assert round_like_builtin(values, ndigits).tolist() == expected
+
+    def test_nan_is_preserved(self):
+        result = round_like_builtin(np.array([np.nan, 1.25]), 1)
+        assert np.isnan(result[0])
+        assert result[1] == round(1.25, 1)
+
+
+class TestAsFloatArray:
+    def test_float64_array_is_not_copied(self):
+        values = np.array([1.0, 2.0])
+        assert as_float_array(values, "bad") is values
+
+    def test_non_numeric_raises_given_message(self):
+        with pytest.raises(ValueError, match="bad input"):
+            as_float_array(["x"], "bad input")
@@ -0,0 +1,76 @@
+# Test cases for bulk UserProfile validation
+# Path: ai_wellness_advisor/tests/data_models/test_bulk_user_profile.py
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from ai_wellness_advisor.src.data_models.bulk_user_profile import (
+    validate_profiles,
+    validate_profiles_json,
+)
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+
+VALID_PROFILE = {
+    "age": 30,
+    "gender": "female",
+    "height_cm": 165.5,
+    "weight_kg": 60.2,
+    "health_goals": ["Lose weight"],
+}
+
+
+def _batch():
+    return [
+        VALID_PROFILE,
+        {**VALID_PROFILE, "age": -5},
+        {**VALID_PROFILE, "gender": "unknown", "health_goals": []},
+        {**VALID_PROFILE, "age": 45},
+    ]
+
+
+def test_all_valid_profiles():
+    result = validate_profiles([VALID_PROFILE] * 3)
+    assert result.error_count == 0
+    assert result.indexes == [0, 1, 2]
+    assert all(isinstance(p, UserProfile) for p in result.profiles)
+    assert len({p.user_id for p in result.profiles}) == 3  # Default factories run per item
+
+
+def test_invalid_profiles_are_reported_by_index():
+    result = validate_profiles(_batch())
+    assert result.indexes == [0, 3]
+    assert [p.age for p in result.profiles] == [30, 45]
+    assert list(result.errors) == [1, 2]
+    assert [e["loc"] for e in result.errors[1]] == [("age",)]
+    assert {e["loc"] for e in result.errors[2]} == {("gender",), ("health_goals",)}
+
+
+def test_matches_single_profile_validation():
+    result = validate_profiles(_batch())
+    for i, profile in zip(result.indexes, result.profiles):
+        expected = UserProfile(**_batch()[i])
+        assert profile.model_dump(exclude={"user_id", "created_at", "updated_at"}) == \
+            expected.model_dump(exclude={"user_id", "created_at", "updated_at"})
+
+
+def test_json_array():
+    result = validate_profiles_json(json.dumps(_batch()))
+    assert result.indexes == [0, 3]
+    assert list(result.errors) == [1, 2]
+
+
+def test_json_not_an_array_raises():
+    with pytest.raises(ValidationError):
+        validate_profiles_json(json.dumps(VALID_PROFILE))
+
+
+def test_malformed_json_raises():
+    with pytest.raises(ValidationError):
+        validate_profiles_json(b'[{"age": 30,')
+
+
+def test_empty_input():
+    result = validate_profiles([])
+    assert result.profiles == [] and result.errors == {}
@@ -0,0 +1,80 @@
+# Test cases for the health vocabulary
+# Path: ai_wellness_advisor/tests/data_models/test_health_vocabulary.py
+
+import pytest
+
+from ai_wellness_advisor.src.data_models.health_vocabulary import (
+    DEFAULT_TERMS,
+    UNKNOWN_TAG,
+    HealthVocabulary,
+    normalize_term,
+)
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+
+MINIMAL_USER_PROFILE_DATA = {
+    "age": 25,
+    "gender": "male",
+    "height_cm": 180.0,
+    "weight_kg": 75.0,
+    "health_goals": ["Build muscle"],
+}
+
+
+def test_normalize_term():
+    assert normalize_term("  Weight\tLOSS ") == "weight loss"
+    assert normalize_term("ＡＳＴＨＭＡ") == "asthma"  # Full-width letters (NFKC)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("weight loss", "Lose weight"),
+    ("  LOSE   weight", "Lose weight"),
+    ("hay fever", "Pollen"),
+    ("减肥", "Lose weight"),
+    ("Some  custom   goal ", "Some  custom   goal "),  # Unknown terms are returned unchanged
+])
+def test_canonical(text, expected):
+    assert HealthVocabulary().canonical(text) == expected
+
+
+def test_known_terms_get_stable_ids():
+    first, second = HealthVocabulary(), HealthVocabulary()
+    assert len(first) == first.known_terms == len(DEFAULT_TERMS)
+    assert first.tag_id("Asthma") == second.tag_id("Asthma") < first.known_terms
+    assert first.lookup("asthma") == first.lookup("哮喘") == first.tag_id("Asthma")
+
+
+def test_unknown_terms_are_not_interned():
+    vocabulary = HealthVocabulary()
+    assert vocabulary.tag_ids([f"Run marathon {i}" for i in range(1000)]) == (UNKNOWN_TAG,) * 1000
+    assert vocabulary.lookup("Run marathon 1") is None
+    assert len(vocabulary) == vocabulary.known_terms
+
+
+@pytest.mark.parametrize("broader, term", [
+    ("diabetes", "Type 2 diabetes"),
+    ("joint pain", "Arthritis"),
+    ("lactose", "Milk"),
+    ("seafood", "Shellfish"),
+    ("nuts", "Tree nuts"),
+    ("endurance", "Improve stamina"),
+])
+def test_related_terms_are_not_aliases(broader, term):
+    vocabulary = HealthVocabulary()
+    assert vocabulary.canonical(broader) == broader
+    assert vocabulary.tag_id(broader) == UNKNOWN_TAG != vocabulary.tag_id(term)
+
+
+def test_tag_id_resolves_aliases():
+    vocabulary = HealthVocabulary()
+    assert vocabulary.tag_id("high blood pressure") == vocabulary.tag_id("Hypertension")
+    assert len(vocabulary) == vocabulary.known_terms
+
+
+def test_user_profile_keeps_terms_as_entered():
+    profile = UserProfile(**{**MINIMAL_USER_PROFILE_DATA,
+                             "health_goals": ["weight loss", "My  own goal"],
+                             "allergies": ["HAY FEVER"],
+                             "medical_conditions": ["diabetes"]})
+    assert profile.health_goals == ["weight loss", "My  own goal"]
+    assert profile.allergies == ["HAY FEVER"]
+    assert profile.medical_conditions == ["diabetes"]
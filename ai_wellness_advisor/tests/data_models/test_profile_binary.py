@@ -0,0 +1,107 @@
+# Test cases for the compact binary UserProfile encoding
+# Path: ai_wellness_advisor/tests/data_models/test_profile_binary.py
+
+import struct
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from ai_wellness_advisor.src.data_models.profile_binary import (
+    FORMAT_VERSION,
+    decode,
+    decode_from,
+    decode_snapshot_from,
+    encode,
+    encode_many,
+    iter_decode,
+)
+from ai_wellness_advisor.src.data_models.profile_json import from_bytes, to_bytes
+from ai_wellness_advisor.src.data_models.profile_snapshot import ProfileSnapshot
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+
+VALID_USER_PROFILE_DATA = {
+    "age": 30,
+    "gender": "female",
+    "height_cm": 165.5,
+    "weight_kg": 60.2,
+    "health_goals": ["Lose weight", "Improve stamina"],
+    "allergies": ["Pollen", "Dust mites"],
+    "medical_conditions": ["Asthma"],
+}
+
+
+@pytest.fixture
+def profiles():
+    return [
+        UserProfile(**VALID_USER_PROFILE_DATA),
+        UserProfile(age=25, gender="other", height_cm=180.0, weight_kg=75.0, health_goals=["睡得更好"]),
+        UserProfile(**VALID_USER_PROFILE_DATA, created_at=datetime(2024, 1, 1, 12, 30)),  # Naive timestamp
+    ]
+
+
+def test_round_trip(profiles):
+    for profile in profiles:
+        assert decode(encode(profile)) == profile
+
+
+def test_compatible_with_json_form(profiles):
+    """Test that binary and JSON round trips yield the same profile and the same JSON."""
+    for profile in profiles:
+        via_binary = decode(encode(profile))
+        via_json = from_bytes(to_bytes(profile), preserve_timestamps=True)
+        assert via_binary == via_json
+        assert to_bytes(via_binary) == to_bytes(profile)
+
+
+def test_much_smaller_than_json(profiles):
+    assert len(encode(profiles[0])) < len(to_bytes(profiles[0])) / 2
+
+
+def test_optional_lists_distinguish_none_from_empty():
+    empty = UserProfile(**{**VALID_USER_PROFILE_DATA, "allergies": [], "medical_conditions": None})
+    decoded = decode(encode(empty))
+    assert decoded.allergies == [] and decoded.medical_conditions is None
+
+
+def test_decode_in_place_from_memoryview(profiles):
+    buffer = memoryview(bytearray(b"xx" + encode_many(profiles)))
+    offset = 2
+    for profile in profiles:
+        decoded, offset = decode_from(buffer, offset)
+        assert decoded == profile
+    assert offset == len(buffer)
+    assert list(iter_decode(buffer[2:])) == profiles
+    assert decode_snapshot_from(buffer, 2)[0] == ProfileSnapshot.from_profile(profiles[0])
+
+
+def test_rejects_bad_records(profiles):
+    record = encode(profiles[0])
+    with pytest.raises(ValueError, match="truncated"):
+        decode(record[:-3])
+    with pytest.raises(ValueError, match="not a profile"):
+        decode(b"XX" + record[2:])
+    with pytest.raises(ValueError, match="version"):
+        decode(record[:2] + bytes([FORMAT_VERSION + 1]) + record[3:])
+    with pytest.raises(ValueError, match="trailing"):
+        decode(record + b"\x00")
+
+
+@pytest.mark.parametrize("offset, value, field", [
+    (36, struct.pack("<H", 0), "age"),                      # age must be > 0
+    (39, struct.pack("<d", float("nan")), "height_cm"),     # height must be > 0
+])
+def test_decoded_values_are_validated(profiles, offset, value, field):
+    record = bytearray(encode(profiles[0]))
+    record[offset:offset + len(value)] = value
+    with pytest.raises(ValidationError) as exc_info:
+        decode(record)
+    assert exc_info.value.errors()[0]["loc"] == (field,)
+    with pytest.raises(ValueError, match=field):
+        decode_snapshot_from(record)
+
+
+def test_decode_keeps_stored_timestamps(profiles):
+    decoded = decode(encode(profiles[2]))
+    assert decoded.updated_at == profiles[2].updated_at
+    assert decoded.created_at == datetime(2024, 1, 1, 12, 30)
@@ -0,0 +1,120 @@
+# Test cases for ProfileHistory
+# Path: ai_wellness_advisor/tests/data_models/test_profile_history.py
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from ai_wellness_advisor.src.data_models.profile_history import ProfileHistory
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+from ai_wellness_advisor.src.dcnc.metabolic_profile import calculate_metabolic_profile_for
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def history():
+    profile = UserProfile(age=30, gender="female", height_cm=165.5, weight_kg=60.2,
+                          health_goals=["Lose weight"])
+    return ProfileHistory(profile, recorded_at=START)
+
+
+def _touch_all(history):
+    return history.bmi, history.bmi_category, history.bmr, history.tdee
+
+
+def test_metrics_match_metabolic_profile(history):
+    expected = calculate_metabolic_profile_for(history.profile)
+    assert _touch_all(history) == tuple(expected)
+    history.record(START + timedelta(days=1), weight_kg=95.0)
+    assert _touch_all(history) == tuple(calculate_metabolic_profile_for(history.profile))
+
+
+def test_metrics_are_cached(history):
+    _touch_all(history)
+    _touch_all(history)
+    assert history.computations == {"bmi": 1, "bmi_category": 1, "bmr": 1, "tdee": 1}
+
+
+def test_weight_change_recomputes_everything(history):
+    _touch_all(history)
+    history.record(START + timedelta(days=1), weight_kg=61.0)
+    _touch_all(history)
+    assert history.computations == {"bmi": 2, "bmi_category": 2, "bmr": 2, "tdee": 2}
+
+
+def test_age_change_only_recomputes_bmr_and_tdee(history):
+    _touch_all(history)
+    history.record(START + timedelta(days=1), age=31)
+    _touch_all(history)
+    assert history.computations == {"bmi": 1, "bmi_category": 1, "bmr": 2, "tdee": 2}
+
+
+def test_unchanged_value_keeps_cache(history):
+    _touch_all(history)
+    history.record(START + timedelta(days=1), weight_kg=60.2)
+    _touch_all(history)
+    assert history.computations["bmi"] == 1
+    assert len(history) == 2
+
+
+def test_direct_assignment_does_not_leave_stale_metrics(history):
+    _touch_all(history)
+    history.profile.weight_kg = 90
+    assert _touch_all(history) == tuple(calculate_metabolic_profile_for(history.profile))
+    history.profile.age = 31
+    history.bmi
+    history.bmr
+    assert history.computations == {"bmi": 2, "bmi_category": 2, "bmr": 3, "tdee": 2}
+
+
+def test_invalid_check_in_is_rejected_atomically(history):
+    with pytest.raises(ValidationError):
+        history.record(START + timedelta(days=1), weight_kg=-1)
+    assert len(history) == 1 and history.profile.weight_kg == 60.2
+    history.record(START + timedelta(days=2), weight_kg=61.0)
+    with pytest.raises(ValueError, match="chronological"):
+        history.record(START + timedelta(days=1), weight_kg=62.0)
+
+
+def test_default_timestamp_is_checked_against_history(history):
+    history.record(datetime.now(timezone.utc) + timedelta(days=1), weight_kg=61.0)
+    with pytest.raises(ValueError, match="chronological"):
+        history.record(weight_kg=62.0)
+    assert len(history) == 2 and history.profile.weight_kg == 61.0
+
+
+def test_default_timestamp_is_now(history):
+    history.record(weight_kg=61.0)
+    history.record()
+    times = history.series("weight_kg").bucket_start
+    assert len(times) == 3 and times[1] <= times[2]
+    assert times[1] == np.datetime64(history.profile.updated_at.replace(tzinfo=None), "us")
+
+
+def test_series_and_trend(history):
+    for day in range(1, 14):
+        history.record(START + timedelta(days=day), weight_kg=60.0 + day)
+    series = history.series("weight_kg", start=START + timedelta(days=7))
+    assert series.value.tolist() == [67.0 + i for i in range(7)]
+    assert series.bucket_start[0] == np.datetime64("2024-01-08T00:00:00", "us")
+
+    weekly = history.trend("weight_kg", timedelta(days=7))
+    assert weekly.count.tolist() == [7, 7]
+    assert weekly.value.tolist() == pytest.approx([(60.2 + sum(range(61, 67))) / 7, 70.0])
+    assert weekly.bucket_start.tolist() == [START.replace(tzinfo=None), (START + timedelta(days=7)).replace(tzinfo=None)]
+
+    last = history.trend("weight_kg", timedelta(days=7), how="last")
+    assert last.value.tolist() == [66.0, 73.0]
+    assert history.trend("age", timedelta(days=30), how="max").value.tolist() == [30.0]
+
+
+def test_trend_rejects_bad_arguments(history):
+    with pytest.raises(ValueError):
+        history.trend("weight_kg", timedelta(0))
+    with pytest.raises(ValueError):
+        history.trend("weight_kg", timedelta(days=1), how="median")
+    with pytest.raises(ValueError):
+        history.series("gender")
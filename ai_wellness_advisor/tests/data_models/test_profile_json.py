@@ -0,0 +1,75 @@
+# Test cases for the UserProfile JSON helpers
+# Path: ai_wellness_advisor/tests/data_models/test_profile_json.py
+
+import json
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from ai_wellness_advisor.src.data_models.profile_json import from_bytes, from_ndjson, to_bytes, to_ndjson
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+
+VALID_USER_PROFILE_DATA = {
+    "age": 30,
+    "gender": "female",
+    "height_cm": 165.5,
+    "weight_kg": 60.2,
+    "health_goals": ["Lose weight", "Improve stamina"],
+    "allergies": ["Pollen"],
+}
+
+
+@pytest.fixture
+def profile():
+    return UserProfile(**VALID_USER_PROFILE_DATA)
+
+
+def test_to_bytes_matches_model_dump_json(profile):
+    assert to_bytes(profile) == profile.model_dump_json().encode()
+    data = json.loads(to_bytes(profile))
+    assert data["user_id"] == str(profile.user_id)
+    assert data["created_at"] == profile.created_at.isoformat()
+
+
+def test_from_bytes_round_trip(profile):
+    time.sleep(0.01)
+    restored = from_bytes(to_bytes(profile))
+    assert restored.model_dump(exclude={"updated_at"}) == profile.model_dump(exclude={"updated_at"})
+    assert restored.updated_at > profile.updated_at  # Same as UserProfile(**json.loads(...))
+    assert from_bytes(to_bytes(profile), preserve_timestamps=True) == profile
+
+
+def test_from_bytes_validates(profile):
+    data = json.loads(to_bytes(profile))
+    data["age"] = -1
+    with pytest.raises(ValidationError):
+        from_bytes(json.dumps(data))
+
+
+def test_ndjson_round_trip(profile):
+    profiles = [profile, UserProfile(**{**VALID_USER_PROFILE_DATA, "gender": "other"})]
+    payload = to_ndjson(profiles)
+    assert payload.count(b"\n") == 2 and payload.endswith(b"\n")
+    assert from_ndjson(payload, preserve_timestamps=True) == profiles
+    assert from_ndjson(payload.decode() + "\n\n", preserve_timestamps=True) == profiles
+
+
+def test_ndjson_error_reports_line(profile):
+    bad = json.dumps({**VALID_USER_PROFILE_DATA, "weight_kg": 0}).encode()
+    with pytest.raises(ValidationError) as exc_info:
+        from_ndjson(to_bytes(profile) + b"\n\n" + bad + b"\n")
+    assert [error["loc"] for error in exc_info.value.errors()] == [(3, "weight_kg")]
+
+
+def test_ndjson_rejects_several_objects_on_one_line(profile):
+    line = to_bytes(profile)
+    with pytest.raises(ValidationError) as exc_info:
+        from_ndjson(line + b"\n" + line + b"," + line + b"\n")
+    errors = exc_info.value.errors()
+    assert [(error["loc"], error["type"]) for error in errors] == [((2,), "json_invalid")]
+
+
+def test_empty_ndjson():
+    assert to_ndjson([]) == b""
+    assert from_ndjson(b"") == []
@@ -0,0 +1,109 @@
+# Test cases for the append-only ProfileRepository
+# Path: ai_wellness_advisor/tests/data_models/test_profile_repository.py
+
+import os
+import time
+from uuid import uuid4
+
+import pytest
+
+from ai_wellness_advisor.src.data_models.profile_repository import ProfileRepository
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+
+MINIMAL_USER_PROFILE_DATA = {
+    "age": 25,
+    "gender": "male",
+    "height_cm": 180.0,
+    "weight_kg": 75.0,
+    "health_goals": ["Build muscle"],
+}
+
+
+@pytest.fixture
+def repo_dir(tmp_path):
+    return str(tmp_path / "profiles")
+
+
+def _log_path(directory):
+    with open(os.path.join(directory, "CURRENT")) as f:
+        return os.path.join(directory, f.read().strip() + ".ndjson")
+
+
+def test_save_and_load_round_trip(repo_dir):
+    profile = UserProfile(**MINIMAL_USER_PROFILE_DATA, allergies=["Nuts"])
+    with ProfileRepository(repo_dir) as repo:
+        repo.save(profile)
+        time.sleep(0.01)
+        loaded = repo.load(profile.user_id)
+    assert loaded == profile
+    assert loaded.updated_at == profile.updated_at  # Loading does not bump updated_at
+
+
+def test_latest_version_wins_and_survives_reopen(repo_dir):
+    profile = UserProfile(**MINIMAL_USER_PROFILE_DATA)
+    other = UserProfile(**MINIMAL_USER_PROFILE_DATA)
+    with ProfileRepository(repo_dir) as repo:
+        repo.save_many([profile, other])
+        profile.weight_kg = 72.5
+        repo.save(profile)
+    with ProfileRepository(repo_dir) as repo:
+        assert len(repo) == 2
+        assert repo.load(profile.user_id).weight_kg == 72.5
+        assert repo.load(other.user_id) == other
+
+
+def test_missing_profile_raises_key_error(repo_dir):
+    with ProfileRepository(repo_dir) as repo:
+        with pytest.raises(KeyError):
+            repo.load(uuid4())
+        with pytest.raises(KeyError):
+            repo.delete(uuid4())
+
+
+def test_delete_persists(repo_dir):
+    profile = UserProfile(**MINIMAL_USER_PROFILE_DATA)
+    with ProfileRepository(repo_dir) as repo:
+        repo.save(profile)
+        repo.delete(profile.user_id)
+        assert profile.user_id not in repo
+    with ProfileRepository(repo_dir) as repo:
+        assert profile.user_id not in repo and len(repo) == 0
+
+
+def test_compaction_reclaims_superseded_versions(repo_dir):
+    profiles = [UserProfile(**MINIMAL_USER_PROFILE_DATA) for _ in range(5)]
+    with ProfileRepository(repo_dir) as repo:
+        repo.save_many(profiles)
+        for profile in profiles:
+            profile.age += 1
+        repo.save_many(profiles)
+        repo.delete(profiles[0].user_id)
+        stale = repo.stale_bytes
+        assert stale > 0
+        assert repo.compact() == stale
+        assert repo.stale_bytes == 0
+        for profile in profiles[1:]:
+            assert repo.load(profile.user_id) == profile
+        repo.save(profiles[0])  # Appending still works after compaction
+    with ProfileRepository(repo_dir) as repo:
+        assert len(repo) == 5
+        assert repo.load(profiles[0].user_id) == profiles[0]
+    assert sorted(os.listdir(repo_dir)) == ["CURRENT", "profiles.000002.idx", "profiles.000002.ndjson"]
+
+
+def test_recovers_unindexed_tail_and_torn_line(repo_dir):
+    indexed = UserProfile(**MINIMAL_USER_PROFILE_DATA)
+    unindexed = UserProfile(**MINIMAL_USER_PROFILE_DATA)
+    with ProfileRepository(repo_dir) as repo:
+        repo.save(indexed)
+    # Simulate a crash: one complete record whose index entry was never
+    # written, followed by a partially written record.
+    with open(_log_path(repo_dir), "ab") as log:
+        log.write(unindexed.model_dump_json().encode() + b"\n")
+        log.write(b'{"user_id": "trunc')
+    with ProfileRepository(repo_dir) as repo:
+        assert repo.load(unindexed.user_id) == unindexed
+        assert repo.load(indexed.user_id) == indexed
+        assert repo.log_size == os.path.getsize(_log_path(repo_dir))
+    with ProfileRepository(repo_dir) as repo:  # The recovered entry was indexed
+        assert len(repo) == 2
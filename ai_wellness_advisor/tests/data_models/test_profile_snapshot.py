@@ -0,0 +1,67 @@
+# Test cases for the read-only ProfileSnapshot
+# Path: ai_wellness_advisor/tests/data_models/test_profile_snapshot.py
+
+import dataclasses
+import sys
+
+import pytest
+
+from ai_wellness_advisor.src.data_models.profile_snapshot import ProfileSnapshot
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+from ai_wellness_advisor.src.dcnc.metabolic_profile import (
+    calculate_metabolic_profile,
+    calculate_metabolic_profile_for,
+)
+
+VALID_USER_PROFILE_DATA = {
+    "age": 30,
+    "gender": "female",
+    "height_cm": 165.5,
+    "weight_kg": 60.2,
+    "health_goals": ["Lose weight", "Improve stamina"],
+    "allergies": ["Pollen"],
+}
+
+
+@pytest.fixture
+def profile():
+    return UserProfile(**VALID_USER_PROFILE_DATA)
+
+
+def test_round_trip_is_lossless(profile):
+    snapshot = ProfileSnapshot.from_profile(profile)
+    restored = snapshot.to_profile()
+    assert restored == profile
+    assert restored.model_dump_json() == profile.model_dump_json()
+    assert restored.updated_at == profile.updated_at  # No revalidation on the way back
+
+
+def test_list_fields_become_tuples(profile):
+    snapshot = ProfileSnapshot.from_profile(profile)
+    assert snapshot.health_goals == ("Lose weight", "Improve stamina")
+    assert snapshot.allergies == ("Pollen",)
+    assert snapshot.medical_conditions is None
+    hash(snapshot)
+
+
+def test_snapshot_is_frozen_and_slotted(profile):
+    snapshot = ProfileSnapshot.from_profile(profile)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.age = 31
+    assert not hasattr(snapshot, "__dict__")
+    assert sys.getsizeof(snapshot) < sys.getsizeof(profile) + sys.getsizeof(profile.__dict__)
+
+
+def test_snapshot_does_not_track_profile_changes(profile):
+    snapshot = ProfileSnapshot.from_profile(profile)
+    profile.health_goals.append("Sleep more")
+    profile.weight_kg = 58.0
+    assert snapshot.weight_kg == 60.2
+    assert len(snapshot.health_goals) == 2
+
+
+def test_metabolic_calculator_accepts_snapshot(profile):
+    snapshot = ProfileSnapshot.from_profile(profile)
+    expected = calculate_metabolic_profile("female", 30, 165.5, 60.2, "sedentary")
+    assert calculate_metabolic_profile_for(snapshot, "sedentary") == expected
+    assert calculate_metabolic_profile_for(profile, "sedentary") == expected
@@ -0,0 +1,171 @@
+# Test cases for the columnar ProfileStore
+# Path: ai_wellness_advisor/tests/data_models/test_profile_store.py
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from ai_wellness_advisor.src.bmi.bmi_calculate import calculate_bmi
+from ai_wellness_advisor.src.bmi.bmi_categorize_batch import BMICategory
+from ai_wellness_advisor.src.data_models.profile_snapshot import ProfileSnapshot
+from ai_wellness_advisor.src.data_models.profile_store import ProfileStore
+from ai_wellness_advisor.src.data_models.pydantic_user_profile import UserProfile
+from ai_wellness_advisor.src.dcnc.metabolic_profile import calculate_metabolic_profile
+
+
+def _profile(**overrides):
+    data = {
+        "age": 30,
+        "gender": "female",
+        "height_cm": 165.5,
+        "weight_kg": 60.2,
+        "health_goals": ["Lose weight"],
+    }
+    data.update(overrides)
+    return UserProfile(**data)
+
+
+@pytest.fixture
+def profiles():
+    return [
+        _profile(),
+        _profile(age=55, weight_kg=95.0, allergies=["Pollen"], health_goals=["Lose weight", "Sleep"]),
+        _profile(age=60, gender="male", weight_kg=100.0),
+        _profile(age=52, gender="other", medical_conditions=["Asthma"]),
+    ]
+
+
+def test_round_trip_by_user_id(profiles):
+    store = ProfileStore(profiles)
+    assert len(store) == 4
+    for profile in profiles:
+        assert profile.user_id in store
+        assert store.get(profile.user_id) == profile
+        assert store.snapshot(profile.user_id) == ProfileSnapshot.from_profile(profile)
+
+
+def test_add_replaces_existing_user(profiles):
+    store = ProfileStore(profiles)
+    profiles[1].weight_kg = 70.0
+    assert store.add(profiles[1]) == store.row_of(profiles[1].user_id)
+    assert len(store) == 4
+    assert store.get(profiles[1].user_id).weight_kg == 70.0
+
+
+def test_remove_moves_last_row(profiles):
+    store = ProfileStore(profiles)
+    store.remove(profiles[0].user_id)
+    assert len(store) == 3
+    assert profiles[0].user_id not in store
+    for profile in profiles[1:]:
+        assert store.get(profile.user_id) == profile
+    with pytest.raises(KeyError):
+        store.remove(profiles[0].user_id)
+
+
+def test_grows_past_initial_capacity():
+    profiles = [_profile(age=20 + i % 60) for i in range(2500)]
+    store = ProfileStore(profiles)
+    assert len(store) == 2500
+    assert store.get(profiles[-1].user_id) == profiles[-1]
+    assert store.ages.tolist() == [p.age for p in profiles]
+
+
+def test_vectorized_filter(profiles):
+    store = ProfileStore(profiles)
+    mask = store.mask(gender="female", min_age=51, bmi_category=BMICategory.OBESE)
+    assert store.user_ids(mask) == [profiles[1].user_id]
+    assert store.user_ids(store.mask(health_goal="Sleep")) == [profiles[1].user_id]
+    assert not store.mask(health_goal="Unknown goal").any()
+
+
+def test_columns_are_read_only(profiles):
+    store = ProfileStore(profiles)
+    with pytest.raises(ValueError):
+        store.weights_kg[0] = 1.0
+
+
+def test_feeds_batch_calculators(profiles):
+    store = ProfileStore(profiles)
+    assert store.bmi().tolist() == [calculate_bmi(p.height_cm / 100, p.weight_kg) for p in profiles]
+    batch = store.metabolic_profile("sedentary")
+    assert batch.error_mask.tolist() == [False, False, False, True]  # "other" has no BMR formula
+    for row, profile in enumerate(profiles[:3]):
+        expected = calculate_metabolic_profile(profile.gender, profile.age, profile.height_cm,
+                                               profile.weight_kg, "sedentary")
+        assert batch.bmr[row] == expected.bmr
+        assert batch.tdee["sedentary"][row] == expected.tdee["sedentary"]
+
+
+def test_timestamps_are_normalized_to_utc():
+    local = timezone(timedelta(hours=8))
+    profile = _profile(created_at=datetime(2024, 1, 1, 8, 0, tzinfo=local))
+    stored = ProfileStore([profile]).get(profile.user_id)
+    assert stored.created_at == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert stored.created_at.tzinfo == timezone.utc
+
+
+def test_set_style_tag_filters(profiles):
+    store = ProfileStore(profiles)
+    assert store.user_ids(store.has_tags("allergies", ["hay fever"])) == [profiles[1].user_id]
+    assert store.has_tags("health_goals", ["weight loss", "Sleep"], match="all").tolist() == \
+        [False, True, False, False]
+    assert store.has_tags("health_goals", ["weight loss", "Sleep"]).tolist() == [True, True, True, True]
+    assert not store.has_tags("medical_conditions", ["Unknown"]).any()
+    with pytest.raises(ValueError):
+        store.has_tags("gender", ["male"])
+
+
+def test_aliases_match_tags_but_stored_strings_are_kept():
+    profile = _profile(health_goals=["weight loss", "My  own goal"], allergies=["HAY FEVER"])
+    store = ProfileStore([_profile(), profile])
+    assert store.get(profile.user_id) == profile
+    assert store.snapshot(profile.user_id).health_goals == ("weight loss", "My  own goal")
+    assert store.has_tags("health_goals", ["Lose weight"]).tolist() == [True, True]
+    assert store.user_ids(store.has_tags("allergies", ["pollen"])) == [profile.user_id]
+    assert store.user_ids(store.has_tags("health_goals", ["my own goal"])) == [profile.user_id]
+
+
+def test_tag_filters_past_one_bitmask_word_and_after_removal():
+    profiles = [_profile(health_goals=[f"goal {i}", f"goal {i + 1}"], allergies=None if i % 3 else [f"a{i}"])
+                for i in range(150)]
+    store = ProfileStore(profiles)
+    store.remove(profiles[12].user_id)
+    store.add(_profile(user_id=profiles[20].user_id, health_goals=["goal 130"]))
+    stored = {user_id: store.get(user_id) for user_id in store}
+
+    for terms, match in [(["goal 130"], "any"), (["goal 5", "goal 140"], "any"),
+                         (["goal 70", "goal 71"], "all"), (["goal 11"], "all"), (["goal 1", "nope"], "all")]:
+        expected = [any(term in stored[user_id].health_goals for term in terms) if match == "any"
+                    else all(term in stored[user_id].health_goals for term in terms)
+                    for user_id in store.user_ids()]
+        assert store.has_tags("health_goals", terms, match=match).tolist() == expected
+    assert store.user_ids(store.has_tags("allergies", ["a99"])) == [profiles[99].user_id]
+    assert store.user_ids(store.has_tags("allergies", ["a12"])) == []
+
+
+def test_stores_can_share_a_vocabulary(profiles):
+    first = ProfileStore(profiles[:2])
+    second = ProfileStore(profiles[2:], vocabulary=first.vocabulary)
+    assert second.vocabulary is first.vocabulary
+    assert second.get(profiles[3].user_id) == profiles[3]
+
+
+def test_free_text_terms_do_not_widen_tag_bits():
+    profiles = [_profile(health_goals=["Lose weight", f"Custom goal {i}"], allergies=[f"allergen {i}"],
+                         medical_conditions=["Asthma"] if i % 2 else None)
+                for i in range(3000)]
+    store = ProfileStore(profiles)
+    assert all(bits.shape[1] == 1 for bits in store._tag_bits.values())
+
+    store.remove(profiles[7].user_id)
+    store.add(_profile(user_id=profiles[8].user_id, health_goals=["custom  GOAL 9"]))
+    assert store.user_ids(store.has_tags("health_goals", ["Custom goal 2999"])) == [profiles[2999].user_id]
+    assert set(store.user_ids(store.has_tags("health_goals", ["Custom goal 9"]))) == \
+        {profiles[8].user_id, profiles[9].user_id}
+    assert store.user_ids(store.has_tags("health_goals", ["Custom goal 7", "Custom goal 8"])) == []
+    assert store.user_ids(store.has_tags("health_goals", ["weight loss", "Custom goal 5"], match="all")) == \
+        [profiles[5].user_id]
+    assert store.user_ids(store.has_tags("allergies", ["allergen 8"])) == []
+    assert "allergen 8" not in store._extra_rows["allergies"]
+    assert store.has_tags("medical_conditions", ["asthma"]).sum() == 1499
@@ -185,4 +185,80 @@ class TestUserProfileSerialization:
         assert str(profile.user_id) == data_from_json["user_id"]
         assert profile.age == data_from_json["age"]
         assert profile.gender == data_from_json["gender"]
-        assert profile.created_at.isoformat().startswith(data_from_json["created_at"])
\ No newline at end of file
+        assert profile.created_at.isoformat().startswith(data_from_json["created_at"])
+
+    def test_timestamps_serialize_with_isoformat_offset(self, user_profile_model):
+        """Test that JSON timestamps keep the isoformat() "+00:00" offset style."""
+
+
+        import json
+        created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        profile = user_profile_model(**MINIMAL_USER_PROFILE_DATA, created_at=created_at)
+        data_from_json = json.loads(profile.model_dump_json())
+        assert data_from_json["created_at"] == "2024-01-01T00:00:00+00:00"
+        assert data_from_json["updated_at"] == profile.updated_at.isoformat()
+        assert profile.model_dump(mode="json") == data_from_json
+        assert profile.model_dump()["created_at"] == created_at
+
+    def test_failed_assignment_keeps_updated_at(self, user_profile_model):
+        """Test that a rejected assignment leaves the model and updated_at untouched."""
+
+
+        profile = user_profile_model(**MINIMAL_USER_PROFILE_DATA)
+        initial_updated_at = profile.updated_at
+        with pytest.raises(ValidationError):
+            profile.age = -1
+        assert profile.age == MINIMAL_USER_PROFILE_DATA["age"]
+        assert profile.updated_at == initial_updated_at
+        assert "updated_at" not in profile.model_fields_set
+
+
+class TestUserProfileApplyUpdates:
+    def test_apply_updates_sets_fields_and_bumps_updated_at(self, user_profile_model):
+        """Test that a batched update validates, coerces and bumps updated_at once."""
+
+
+        profile = user_profile_model(**MINIMAL_USER_PROFILE_DATA)
+        initial_updated_at = profile.updated_at
+        time.sleep(0.01)
+        assert profile.apply_updates({"weight_kg": "71.2", "height_cm": 181}) is profile
+        assert profile.weight_kg == 71.2
+        assert profile.height_cm == 181.0 and isinstance(profile.height_cm, float)
+        assert profile.updated_at > initial_updated_at
+        assert {"weight_kg", "height_cm"} <= profile.model_fields_set
+
+    def test_apply_updates_is_atomic(self, user_profile_model):
+        """Test that one invalid value rejects the whole batch and reports every bad field."""
+
+
+        profile = user_profile_model(**MINIMAL_USER_PROFILE_DATA)
+        before = profile.model_dump()
+        with pytest.raises(ValidationError) as exc_info:
+            profile.apply_updates({"weight_kg": 80.0, "age": 200, "health_goals": []})
+        assert exc_info.value.title == "UserProfile"
+        assert {e["loc"] for e in exc_info.value.errors()} == {("age",), ("health_goals",)}
+        assert profile.model_dump() == before
+
+    def test_apply_updates_matches_assignment(self, user_profile_model):
+        """Test that batched updates store the same values as validated assignment."""
+
+
+        batched = user_profile_model(**MINIMAL_USER_PROFILE_DATA)
+        assigned = user_profile_model(**MINIMAL_USER_PROFILE_DATA)
+        updates = {"age": "40", "gender": "other", "allergies": ["Nuts"]}
+        batched.apply_updates(updates)
+        for name, value in updates.items():
+            setattr(assigned, name, value)
+        exclude = {"user_id", "created_at", "updated_at"}
+        assert batched.model_dump(exclude=exclude) == assigned.model_dump(exclude=exclude)
+
+    def test_apply_updates_unknown_field_raises(self, user_profile_model):
+        profile = user_profile_model(**MINIMAL_USER_PROFILE_DATA)
+        with pytest.raises(ValueError, match="no field"):
+            profile.apply_updates({"shoe_size": 42})
+
+    def test_apply_empty_updates_is_noop(self, user_profile_model):
+        profile = user_profile_model(**MINIMAL_USER_PROFILE_DATA)
+        initial_updated_at = profile.updated_at
+        profile.apply_updates({})
+        assert profile.updated_at == initial_updated_at
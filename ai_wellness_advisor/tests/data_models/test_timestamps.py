@@ -0,0 +1,20 @@
+# Test cases for the shared microsecond timestamp helpers
+# Path: ai_wellness_advisor/tests/data_models/test_timestamps.py
+
+from datetime import datetime, timedelta, timezone
+
+from ai_wellness_advisor.src.data_models.timestamps import from_micros, to_micros
+
+
+def test_naive_values_are_read_as_utc():
+    aware = datetime(2024, 5, 6, 7, 8, 9, 123456, tzinfo=timezone.utc)
+    assert to_micros(aware.replace(tzinfo=None)) == to_micros(aware)
+    assert to_micros(aware.astimezone(timezone(timedelta(hours=8)))) == to_micros(aware)
+
+
+def test_round_trip_keeps_microseconds_and_naivety():
+    aware = datetime(1969, 12, 31, 23, 59, 59, 999999, tzinfo=timezone.utc)
+    assert to_micros(aware) == -1
+    assert from_micros(to_micros(aware)) == aware
+    naive = from_micros(to_micros(aware), naive=True)
+    assert naive.tzinfo is None and naive == aware.replace(tzinfo=None)
@@ -5,7 +5,7 @@ following TDD principles.
 """
 
 import pytest
-from src.dcnc.calculate_bmr import calculate_bmr
+from src.dcnc.calculate_bmr import calculate_bmr, calculate_bmr_trusted
 
 
 class TestCalculateBMRNormalCases:
@@ -223,4 +223,24 @@ class TestCalculateBMRReturnType:
     def test_result_is_positive(self):
         """Test that BMR result is always positive."""
         result = calculate_bmr("female", 1, 50, 10)  # Minimum values
-        assert result > 0
\ No newline at end of file
+        assert result > 0
+
+class TestCalculateBMRTrusted:
+    """Test the trusted-input fast path."""
+    
+    @pytest.mark.parametrize("gender,age,height,weight", [
+        ("male", 30, 175, 70),
+        ("female", 25, 165, 60),
+        ("male", 1, 50, 10),
+        ("female", 120, 300, 500),
+        ("female", 47, 163.7, 58.9),
+    ])
+    def test_matches_validated_path(self, gender, age, height, weight):
+        """Test identical results to calculate_bmr for valid inputs."""
+        assert calculate_bmr_trusted(gender, age, height, weight) == \
+            calculate_bmr(gender, age, height, weight)
+    
+    def test_gender_is_not_normalized(self):
+        """Test that the fast path does not lower-case gender."""
+        with pytest.raises(KeyError):
+            calculate_bmr_trusted("Male", 30, 175, 70)
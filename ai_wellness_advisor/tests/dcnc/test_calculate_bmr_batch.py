@@ -0,0 +1,91 @@
+"""Tests for calculate_bmr_batch function.
+
+This module checks that the columnar BMR calculation matches the scalar
+calculate_bmr bit-for-bit and reports invalid rows through the error mask.
+"""
+
+import numpy as np
+import pytest
+from src.dcnc.calculate_bmr import calculate_bmr
+from src.dcnc.calculate_bmr_batch import (
+    INVALID_GENDER_CODE,
+    Gender,
+    calculate_bmr_batch,
+    encode_genders,
+)
+
+
+class TestCalculateBMRBatchNormalCases:
+    """Test that batch results match the scalar function."""
+
+    def test_known_values(self):
+        """Test the standard male/female cases from the scalar tests."""
+        result = calculate_bmr_batch([Gender.MALE, Gender.MALE], [30, 25], [175, 180], [70, 80])
+        assert result.bmr.tolist() == [calculate_bmr("male", 30, 175, 70),
+                                       calculate_bmr("male", 25, 180, 80)]
+        assert not result.error_mask.any()
+
+    def test_random_cohort_matches_scalar_bit_for_bit(self):
+        """Test a random mixed-gender cohort against the scalar path."""
+        rng = np.random.default_rng(3)
+        n = 20_000
+        codes = rng.integers(0, 2, n).astype(np.int8)
+        ages = rng.integers(1, 121, n)
+        heights = np.round(rng.uniform(50, 300, n), 1)
+        weights = np.round(rng.uniform(10, 500, n), 1)
+
+        result = calculate_bmr_batch(codes, ages, heights, weights)
+
+        names = {Gender.MALE: "male", Gender.FEMALE: "female"}
+        expected = [
+            calculate_bmr(names[g], a, h, w)
+            for g, a, h, w in zip(codes.tolist(), ages.tolist(), heights.tolist(), weights.tolist())
+        ]
+        assert result.bmr.tolist() == expected
+
+    def test_boundary_values_are_valid(self):
+        """Test inclusive range boundaries."""
+        result = calculate_bmr_batch([0, 1], [1, 120], [50, 300], [10, 500])
+        assert not result.error_mask.any()
+
+
+class TestCalculateBMRBatchErrorMask:
+    """Test per-row validation."""
+
+    @pytest.mark.parametrize("code,age,height,weight", [
+        (INVALID_GENDER_CODE, 30, 175, 70),
+        (2, 30, 175, 70),
+        (0, 0, 175, 70),
+        (0, 121, 175, 70),
+        (0, 30.5, 175, 70),
+        (0, 30, 49.9, 70),
+        (0, 30, 300.1, 70),
+        (0, 30, 175, 9.9),
+        (0, 30, 175, 500.1),
+        (0, 30, float("nan"), 70),
+    ])
+    def test_invalid_row_is_masked(self, code, age, height, weight):
+        """Test that each kind of invalid row is flagged and not raised."""
+        result = calculate_bmr_batch([code, 0], [age, 30], [height, 175], [weight, 70])
+        assert result.error_mask.tolist() == [True, False]
+        assert np.isnan(result.bmr[0])
+        assert result.bmr[1] == calculate_bmr("male", 30, 175, 70)
+
+    def test_shape_mismatch_raises(self):
+        with pytest.raises(ValueError, match="same shape"):
+            calculate_bmr_batch([0, 1], [30], [175, 165], [70, 60])
+
+    def test_non_integer_gender_codes_raise(self):
+        with pytest.raises(ValueError, match="gender_codes"):
+            calculate_bmr_batch(["male"], [30], [175], [70])
+
+
+class TestEncodeGenders:
+    """Test gender string column encoding."""
+
+    def test_case_insensitive_encoding(self):
+        codes = encode_genders(["male", "Female", "MALE", "other"])
+        assert codes.tolist() == [Gender.MALE, Gender.FEMALE, Gender.MALE, INVALID_GENDER_CODE]
+
+    def test_empty_column(self):
+        assert encode_genders([]).shape == (0,)
@@ -6,7 +6,13 @@ including normal cases, boundary values, error handling, and return type validat
 
 import pytest
 import math
-from src.dcnc.calculate_tdee import calculate_tdee
+from src.dcnc.calculate_tdee import (
+    ACTIVITY_COEFFICIENTS,
+    ActivityLevel,
+    calculate_tdee,
+    calculate_tdee_trusted,
+    parse_activity_level,
+)
 
 
 class TestCalculateTDEENormalCases:
@@ -315,4 +321,45 @@ class TestCalculateTDEEIntegration:
         for bmr in test_bmrs:
             result = calculate_tdee(bmr, activity_level)
             expected = bmr * coefficient
-            assert result == expected, f"TDEE should be {expected} for BMR {bmr}"
\ No newline at end of file
+            assert result == expected, f"TDEE should be {expected} for BMR {bmr}"
+
+class TestCalculateTDEETrusted:
+    """Test the trusted-input fast path."""
+    
+    @pytest.mark.parametrize("activity_level", list(ACTIVITY_COEFFICIENTS))
+    def test_matches_validated_path(self, activity_level):
+        """Test identical results to calculate_tdee over a BMR sweep."""
+        for bmr in (500, 1234.5, 1695.7, 2000, 4999.9, 5000):
+            assert calculate_tdee_trusted(bmr, activity_level) == calculate_tdee(bmr, activity_level)
+    
+    def test_activity_level_is_not_normalized(self):
+        """Test that the fast path expects an already normalized key."""
+        with pytest.raises(KeyError):
+            calculate_tdee_trusted(1500, " Sedentary")
+
+
+class TestActivityLevel:
+    """Test the ActivityLevel enum and the cached string parser."""
+    
+    def test_codes_follow_coefficient_order(self):
+        """Test that enum members line up with ACTIVITY_COEFFICIENTS."""
+        assert [level.key for level in ActivityLevel] == list(ACTIVITY_COEFFICIENTS)
+        assert [level.coefficient for level in ActivityLevel] == list(ACTIVITY_COEFFICIENTS.values())
+    
+    @pytest.mark.parametrize("level", list(ActivityLevel))
+    def test_enum_matches_string(self, level):
+        """Test that an ActivityLevel gives the same result as its key."""
+        assert calculate_tdee(1695.7, level) == calculate_tdee(1695.7, level.key)
+        assert calculate_tdee_trusted(1695.7, level) == calculate_tdee(1695.7, level.key)
+    
+    def test_parse_normalizes(self):
+        assert parse_activity_level("  Very_Active ") is ActivityLevel.VERY_ACTIVE
+    
+    def test_parse_invalid_raises(self):
+        with pytest.raises(ValueError, match="activity_level must be one of"):
+            parse_activity_level("couch_potato")
+    
+    def test_plain_int_is_rejected(self):
+        """Test that bare integers are not mistaken for activity codes."""
+        with pytest.raises(TypeError, match="activity_level must be str"):
+            calculate_tdee(1500, 1)
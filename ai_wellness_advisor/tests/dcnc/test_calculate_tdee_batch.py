@@ -0,0 +1,70 @@
+"""Tests for calculate_tdee_batch function."""
+
+import numpy as np
+import pytest
+from src.dcnc.calculate_tdee import ACTIVITY_COEFFICIENTS, ActivityLevel, calculate_tdee
+from src.dcnc.calculate_tdee_batch import INVALID_ACTIVITY_LEVEL, calculate_tdee_batch, parse_activity_levels
+
+
+class TestCalculateTDEEBatch:
+    """Test columnar TDEE calculation."""
+
+    @pytest.mark.parametrize("activity_level", list(ACTIVITY_COEFFICIENTS))
+    def test_matches_scalar_for_every_level(self, activity_level):
+        """Test bit-for-bit equality with calculate_tdee over a BMR sweep."""
+        bmrs = np.round(np.arange(500.0, 5000.0, 0.7), 1)
+        result = calculate_tdee_batch(bmrs, activity_level)
+        assert result.tdee.tolist() == [calculate_tdee(b, activity_level) for b in bmrs.tolist()]
+
+    def test_activity_level_is_normalized(self):
+        """Test case and whitespace normalization of the shared level."""
+        assert calculate_tdee_batch([1500], "  SEDENTARY ").tdee.tolist() == [1800.0]
+
+    def test_out_of_range_bmr_is_masked(self):
+        """Test that invalid BMR rows are flagged instead of raised."""
+        result = calculate_tdee_batch([499.9, 1500, 5000.1, float("nan")], "sedentary")
+        assert result.error_mask.tolist() == [True, False, True, True]
+        assert result.tdee[1] == 1800.0
+
+    def test_invalid_activity_level_raises(self):
+        with pytest.raises(ValueError, match="activity_level must be one of"):
+            calculate_tdee_batch([1500], "couch_potato")
+
+    def test_non_string_activity_level_raises(self):
+        with pytest.raises(TypeError, match="activity_level must be str"):
+            calculate_tdee_batch([1500], 1)
+
+    def test_activity_level_enum_is_accepted(self):
+        assert calculate_tdee_batch([1500], ActivityLevel.SEDENTARY).tdee.tolist() == [1800.0]
+
+    def test_per_row_codes_match_scalar(self):
+        """Test per-row ActivityLevel codes against calculate_tdee."""
+        bmrs = [1500.0, 1234.5, 2000.0, 1800.0, 2500.3]
+        codes = np.array([0, 1, 2, 3, 4], dtype=np.int8)
+        result = calculate_tdee_batch(bmrs, codes)
+        expected = [calculate_tdee(b, ActivityLevel(c)) for b, c in zip(bmrs, codes.tolist())]
+        assert result.tdee.tolist() == expected
+        assert not result.error_mask.any()
+
+    def test_invalid_per_row_codes_are_masked(self):
+        result = calculate_tdee_batch([1500, 1500, 1500], np.array([0, INVALID_ACTIVITY_LEVEL, 5]))
+        assert result.error_mask.tolist() == [False, True, True]
+        assert result.tdee[0] == 1800.0
+        assert np.isnan(result.tdee[1:]).all()
+
+    def test_code_shape_mismatch_raises(self):
+        with pytest.raises(ValueError, match="same shape"):
+            calculate_tdee_batch([1500, 1600], np.array([0]))
+
+
+class TestParseActivityLevels:
+    """Test bulk activity-level parsing."""
+
+    def test_parses_and_normalizes(self):
+        codes = parse_activity_levels(["sedentary", " Very_Active", "SEDENTARY", "couch_potato"])
+        assert codes.dtype == np.int8
+        assert codes.tolist() == [ActivityLevel.SEDENTARY, ActivityLevel.VERY_ACTIVE,
+                                  ActivityLevel.SEDENTARY, INVALID_ACTIVITY_LEVEL]
+
+    def test_empty_input(self):
+        assert parse_activity_levels([]).shape == (0,)
@@ -0,0 +1,96 @@
+"""Tests for the fused metabolic profile calculation.
+
+The fused entry points must return exactly what calling calculate_bmi,
+categorize_bmi, calculate_bmr and calculate_tdee one after another returns.
+"""
+
+import numpy as np
+import pytest
+from src.bmi.bmi_calculate import calculate_bmi
+from src.bmi.bmi_categorize import categorize_bmi
+from src.bmi.bmi_categorize_batch import bmi_category_labels
+from src.dcnc.calculate_bmr import calculate_bmr
+from src.dcnc.calculate_bmr_batch import Gender
+from src.dcnc.calculate_tdee import ACTIVITY_COEFFICIENTS, calculate_tdee
+from src.dcnc.metabolic_profile import (
+    calculate_metabolic_profile,
+    calculate_metabolic_profile_batch,
+)
+
+
+def _chained(gender, age, height_cm, weight_kg, activity_level):
+    bmi = calculate_bmi(height_cm / 100, weight_kg)
+    bmr = calculate_bmr(gender, age, height_cm, weight_kg)
+    return bmi, categorize_bmi(bmi), bmr, calculate_tdee(bmr, activity_level)
+
+
+class TestCalculateMetabolicProfile:
+    """Test the scalar fused entry point."""
+
+    @pytest.mark.parametrize("gender,age,height,weight", [
+        ("male", 30, 175, 70),
+        ("female", 25, 165, 60),
+        ("Female", 60, 158.5, 92.3),
+        ("male", 18, 190, 55),
+    ])
+    def test_matches_chained_calls(self, gender, age, height, weight):
+        """Test equality with the individual calculators for every level."""
+        profile = calculate_metabolic_profile(gender, age, height, weight)
+
+        assert set(profile.tdee) == set(ACTIVITY_COEFFICIENTS)
+        for level, tdee in profile.tdee.items():
+            assert (profile.bmi, profile.bmi_category, profile.bmr, tdee) == _chained(
+                gender, age, height, weight, level)
+
+    def test_single_activity_level(self):
+        """Test that only the requested (normalized) level is computed."""
+        profile = calculate_metabolic_profile("male", 30, 175, 70, " Very_Active ")
+        assert profile.tdee == {"very_active": calculate_tdee(1695.7, "very_active")}
+
+    def test_invalid_inputs_raise_scalar_errors(self):
+        """Test that validation errors match calculate_bmr's."""
+        with pytest.raises(ValueError, match="age must be between 1 and 120"):
+            calculate_metabolic_profile("male", 0, 175, 70)
+        with pytest.raises(TypeError, match="gender must be str"):
+            calculate_metabolic_profile(1, 30, 175, 70)
+        with pytest.raises(ValueError, match="activity_level must be one of"):
+            calculate_metabolic_profile("male", 30, 175, 70, "couch_potato")
+
+    def test_bmr_below_tdee_range_raises(self):
+        """Test that a BMR calculate_tdee would reject is rejected here too."""
+        with pytest.raises(ValueError, match="bmr must be between 500 and 5000"):
+            calculate_metabolic_profile("male", 1, 50, 10)
+
+
+class TestCalculateMetabolicProfileBatch:
+    """Test the batched fused entry point."""
+
+    def test_matches_chained_calls_on_random_cohort(self):
+        """Test row-by-row equality with the scalar calculators."""
+        rng = np.random.default_rng(11)
+        n = 2_000
+        codes = rng.integers(0, 2, n).astype(np.int8)
+        ages = rng.integers(18, 90, n)
+        heights = np.round(rng.uniform(140, 210, n), 1)
+        weights = np.round(rng.uniform(40, 160, n), 1)
+
+        batch = calculate_metabolic_profile_batch(codes, ages, heights, weights, "lightly_active")
+
+        assert not batch.error_mask.any()
+        categories = bmi_category_labels(batch.bmi_category).tolist()
+        names = {Gender.MALE: "male", Gender.FEMALE: "female"}
+        for i in range(n):
+            expected = _chained(names[codes[i]], int(ages[i]), float(heights[i]),
+                                float(weights[i]), "lightly_active")
+            actual = (batch.bmi[i], categories[i], batch.bmr[i], batch.tdee["lightly_active"][i])
+            assert actual == expected
+
+    def test_all_levels_by_default(self):
+        batch = calculate_metabolic_profile_batch([0], [30], [175], [70])
+        assert {level: values[0] for level, values in batch.tdee.items()} == \
+            calculate_metabolic_profile("male", 30, 175, 70).tdee
+
+    def test_invalid_rows_are_masked(self):
+        """Test out-of-range inputs and out-of-range BMR rows."""
+        batch = calculate_metabolic_profile_batch([0, 0, 5], [30, 1, 30], [175, 50, 175], [70, 10, 70])
+        assert batch.error_mask.tolist() == [False, True, True]
@@ -0,0 +1,110 @@
+"""Tests for the precomputed BMR/TDEE lookup table.
+
+A small grid keeps build time and disk usage low; the lookup logic is the
+same as for the default full-range grid.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+import pytest
+from src.dcnc.calculate_bmr import calculate_bmr
+from src.dcnc.calculate_bmr_batch import Gender
+from src.dcnc.calculate_tdee import ACTIVITY_COEFFICIENTS, calculate_tdee
+from src.dcnc.tdee_lookup_table import BMR_FILENAME, META_FILENAME, TDEELookupTable, main
+
+
+@pytest.fixture
+def table(tmp_path):
+    table = TDEELookupTable(str(tmp_path), age_range=(20, 24), height_range=(160, 165),
+                            weight_range=(60, 62))
+    yield table
+    table.close()
+
+
+class TestLookupValues:
+    """Test that lookups are identical to the formula path."""
+
+    def test_every_grid_point_matches_formula(self, table):
+        """Test exhaustive equality over the whole small grid."""
+        for gender in ("male", "female"):
+            for age in range(20, 25):
+                for height in range(160, 166):
+                    for step in range(600, 621):
+                        weight = step / 10
+                        bmr = calculate_bmr(gender, age, height, weight)
+                        assert table.bmr(gender, age, height, weight) == bmr
+                        for level in ACTIVITY_COEFFICIENTS:
+                            assert table.tdee(gender, age, height, weight, level) == \
+                                calculate_tdee(bmr, level)
+
+    def test_table_is_built_lazily(self, table):
+        """Test that the first query builds the table files."""
+        assert not table.is_built()
+        table.bmr("male", 22, 163, 61.5)
+        assert table.is_built()
+
+    def test_gender_codes_are_accepted(self, table):
+        assert table.bmr(Gender.FEMALE, 22, 163, 61.5) == calculate_bmr("female", 22, 163, 61.5)
+
+    @pytest.mark.parametrize("age,height,weight", [
+        (30, 163, 61.5),     # age off grid
+        (22, 163.5, 61.5),   # fractional height
+        (22, 163, 61.55),    # weight between 0.1 kg steps
+        (22, 170, 61.5),     # height off grid
+    ])
+    def test_off_grid_inputs_fall_back_to_formula(self, table, age, height, weight):
+        assert table.tdee("male", age, height, weight, "sedentary") == \
+            calculate_tdee(calculate_bmr("male", age, height, weight), "sedentary")
+
+    def test_invalid_inputs_raise_like_formula(self, table):
+        with pytest.raises(ValueError, match="gender must be 'male' or 'female'"):
+            table.bmr("other", 22, 163, 61.5)
+        with pytest.raises(ValueError, match="activity_level must be one of"):
+            table.tdee("male", 22, 163, 61.5, "couch_potato")
+
+
+class TestBuildAndVerify:
+    """Test the build/verify switch."""
+
+    def test_verify_built_table(self, table):
+        table.build()
+        assert table.verify()
+
+    def test_verify_detects_corruption(self, table):
+        table.build()
+        path = os.path.join(table.directory, BMR_FILENAME)
+        corrupt = np.memmap(path, dtype=np.int32, mode='r+')
+        corrupt[7] += 1
+        corrupt.flush()
+        del corrupt
+        assert not table.verify()
+
+    def test_concurrent_builds_do_not_share_temp_files(self, table):
+        """Test that parallel builders of one directory leave a complete table and no temp files."""
+        other = TDEELookupTable(table.directory, age_range=(20, 24), height_range=(160, 165),
+                                weight_range=(60, 62))
+        threads = [threading.Thread(target=t.build) for t in (table, other)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert table.verify()
+        assert not [name for name in os.listdir(table.directory) if name.endswith(".tmp")]
+        other.close()
+
+    def test_stale_metadata_is_not_built(self, table):
+        table.build()
+        meta_path = os.path.join(table.directory, META_FILENAME)
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        meta['activity_coefficients']['sedentary'] = 1.3
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        assert not table.is_built()
+        assert not table.verify()
+
+    def test_cli_verify_missing_table_fails(self, tmp_path):
+        assert main([str(tmp_path / "missing"), "--verify"]) == 1
@@ -0,0 +1,154 @@
+import threading
+
+import pytest
+
+from ai_wellness_advisor.src.bmi.bmi_categorize import BMI_CATEGORY_LABELS
+from ai_wellness_advisor.src.llm_integration.bmi_advice_cache import CATEGORY_REPRESENTATIVE_BMI, BMIAdviceCache
+from ai_wellness_advisor.src.llm_integration.deepseek_api_setup import SimpleBMIAdvice
+
+
+class FakeFetch:
+    """Stands in for get_simple_bmi_advice_from_deepseek; each call returns new advice."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, bmi_value, model_name):
+        self.calls.append((bmi_value, model_name))
+        if self.fail:
+            return {"error": True, "type": "network_error", "details": "offline"}
+        return SimpleBMIAdvice(advice=f"advice {len(self.calls)} for {bmi_value:.1f}")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fills_variants_then_serves_from_cache():
+    fetch = FakeFetch()
+    cache = BMIAdviceCache(fetch=fetch, variants=2)
+
+    first = [cache.get(22.04), cache.get(22.0)]
+    assert len(fetch.calls) == 2
+    assert {advice.advice for advice in first} == {"advice 1 for 22.0", "advice 2 for 22.0"}
+
+    for _ in range(20):
+        assert cache.get(21.96).advice in {"advice 1 for 22.0", "advice 2 for 22.0"}
+    assert len(fetch.calls) == 2
+    assert cache.stats() == {"hits": 20, "misses": 2, "keys": 1, "variants": 2}
+
+
+def test_rounded_bmi_keys_are_distinct():
+    fetch = FakeFetch()
+    cache = BMIAdviceCache(fetch=fetch, variants=1)
+    cache.get(22.0)
+    cache.get(22.1)
+    assert len(fetch.calls) == 2
+    assert len(cache) == 2
+
+
+def test_category_keys_share_advice_within_a_category():
+    fetch = FakeFetch()
+    cache = BMIAdviceCache(fetch=fetch, key_by="category", variants=1)
+    assert cache.key_for(20.0) == BMI_CATEGORY_LABELS[1]
+
+    advice = cache.get(19.0)
+    assert cache.get(23.9) == advice
+    assert cache.get(25.0) != advice
+    assert len(fetch.calls) == 2
+
+
+def test_category_advice_is_fetched_for_the_representative_bmi():
+    fetch = FakeFetch()
+    cache = BMIAdviceCache(fetch=fetch, key_by="category", variants=1)
+    cache.get(19.0)
+    cache.get(31.0)
+    assert [bmi for bmi, _ in fetch.calls] == [CATEGORY_REPRESENTATIVE_BMI[BMI_CATEGORY_LABELS[1]],
+                                               CATEGORY_REPRESENTATIVE_BMI[BMI_CATEGORY_LABELS[4]]]
+    for label, bmi in CATEGORY_REPRESENTATIVE_BMI.items():
+        assert cache.key_for(bmi) == label
+
+
+def test_callers_get_their_own_copy():
+    cache = BMIAdviceCache(fetch=FakeFetch(), variants=1)
+    first = cache.get(22.0)
+    first.advice = "changed by caller"
+    second = cache.get(22.0)
+    assert second.advice == "advice 1 for 22.0"
+    second.advice = "changed again"
+    assert cache.get(22.0).advice == "advice 1 for 22.0"
+
+
+def test_errors_are_returned_but_not_cached():
+    fetch = FakeFetch(fail=True)
+    cache = BMIAdviceCache(fetch=fetch, variants=1)
+    assert cache.get(30.0)["type"] == "network_error"
+    cache.get(30.0)
+    assert len(fetch.calls) == 2
+    assert len(cache) == 0
+
+
+def test_passes_model_name_to_fetch():
+    fetch = FakeFetch()
+    BMIAdviceCache(fetch=fetch, model_name="deepseek-reasoner").get(18.0)
+    assert fetch.calls == [(18.0, "deepseek-reasoner")]
+
+
+def test_stale_variants_are_refetched():
+    fetch, clock = FakeFetch(), FakeClock()
+    cache = BMIAdviceCache(fetch=fetch, variants=1, ttl=60, clock=clock)
+    cache.get(24.0)
+    clock.now = 30
+    cache.get(24.0)
+    assert len(fetch.calls) == 1
+
+    clock.now = 61
+    assert cache.get(24.0).advice == "advice 2 for 24.0"
+    assert len(fetch.calls) == 2
+
+
+def test_background_refresh_serves_stale_advice_while_refreshing():
+    started, release = threading.Event(), threading.Event()
+    fetch, clock = FakeFetch(), FakeClock()
+
+    def slow_fetch(bmi_value, model_name):
+        if fetch.calls:
+            started.set()
+            release.wait(5)
+        return fetch(bmi_value, model_name)
+
+    cache = BMIAdviceCache(fetch=slow_fetch, variants=1, ttl=60, background_refresh=True, clock=clock)
+    cache.get(27.0)
+    clock.now = 100
+    try:
+        assert cache.get(27.0).advice == "advice 1 for 27.0"
+        assert started.wait(5)
+        assert cache.get(27.0).advice == "advice 1 for 27.0"  # refresh still in flight
+        release.set()
+    finally:
+        release.set()
+        cache.close()
+
+    assert len(fetch.calls) == 2
+    assert cache.get(27.0).advice == "advice 2 for 27.0"
+
+
+def test_warm_precomputes_every_key():
+    fetch = FakeFetch()
+    cache = BMIAdviceCache(fetch=fetch, variants=2)
+    cache.warm([17.0, 22.0, 22.0])
+    assert len(fetch.calls) == 4
+    cache.get(17.0)
+    cache.get(22.0)
+    assert len(fetch.calls) == 4
+
+
+@pytest.mark.parametrize("kwargs", [{"key_by": "age"}, {"variants": 0}])
+def test_rejects_invalid_configuration(kwargs):
+    with pytest.raises(ValueError):
+        BMIAdviceCache(fetch=FakeFetch(), **kwargs)
@@ -0,0 +1,180 @@
+"""Tests for the streaming cohort scorer."""
+
+import csv
+
+import pytest
+from src.dcnc.calculate_tdee import ACTIVITY_COEFFICIENTS
+from src.dcnc.metabolic_profile import calculate_metabolic_profile
+from src.scoring.cohort_scorer import main, score_file
+
+ROWS = [
+    {"user_id": "u1", "gender": "male", "age": "30", "height_cm": "175", "weight_kg": "70",
+     "activity_level": "sedentary"},
+    {"user_id": "u2", "gender": "Female", "age": "45", "height_cm": "162.5", "weight_kg": "58.3",
+     "activity_level": "Very_Active"},
+    {"user_id": "u3", "gender": "other", "age": "30", "height_cm": "170", "weight_kg": "70",
+     "activity_level": "sedentary"},
+    {"user_id": "u4", "gender": "male", "age": "abc", "height_cm": "170", "weight_kg": "70",
+     "activity_level": "sedentary"},
+    {"user_id": "u5", "gender": "female", "age": "60", "height_cm": "158", "weight_kg": "92.3",
+     "activity_level": "extra_active"},
+    {"user_id": "u6", "gender": "male", "age": "30", "height_cm": "175", "weight_kg": "70",
+     "activity_level": "lazy"},
+]
+
+
+def _write_csv(path, rows, columns=None):
+    columns = columns or list(rows[0])
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4, 100])
+def test_scores_match_scalar_calculators(tmp_path, chunk_size):
+    """Test enriched output for every chunk size, including chunk boundaries."""
+    _write_csv(tmp_path / "in.csv", ROWS)
+
+    summary = score_file(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), chunk_size)
+
+    output = _read_csv(tmp_path / "out.csv")
+    assert [row["user_id"] for row in output] == ["u1", "u2", "u5"]
+    for row in output:
+        expected = calculate_metabolic_profile(row["gender"], int(row["age"]), float(row["height_cm"]),
+                                               float(row["weight_kg"]), row["activity_level"])
+        assert float(row["bmi"]) == expected.bmi
+        assert row["bmi_category"] == expected.bmi_category
+        assert float(row["bmr"]) == expected.bmr
+        assert [float(row["tdee"])] == list(expected.tdee.values())
+    assert (summary.rows_read, summary.rows_written, summary.rows_skipped) == (6, 3, 3)
+
+
+def test_skipped_rows_are_reported(tmp_path):
+    """Test the rejects file and the summary sample errors."""
+    _write_csv(tmp_path / "in.csv", ROWS)
+
+    summary = score_file(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), 2,
+                         rejects_path=str(tmp_path / "rejects.csv"))
+
+    rejects = _read_csv(tmp_path / "rejects.csv")
+    assert [(row["row"], row["user_id"]) for row in rejects] == [("3", "u3"), ("4", "u4"), ("6", "u6")]
+    assert rejects[0]["error"] == "gender must be 'male' or 'female', got 'other'"
+    assert rejects[1]["error"] == "age must be a number, got 'abc'"
+    assert rejects[2]["error"].startswith("activity_level must be one of")
+    assert len(summary.sample_errors) == 3
+
+
+def test_all_activity_levels_without_activity_column(tmp_path):
+    columns = ["user_id", "gender", "age", "height_cm", "weight_kg"]
+    _write_csv(tmp_path / "in.csv", ROWS[:1], columns)
+
+    score_file(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"))
+
+    (row,) = _read_csv(tmp_path / "out.csv")
+    expected = calculate_metabolic_profile("male", 30, 175, 70)
+    for level in ACTIVITY_COEFFICIENTS:
+        assert float(row[f"tdee_{level}"]) == expected.tdee[level]
+
+
+def test_activity_level_option_overrides_column(tmp_path):
+    _write_csv(tmp_path / "in.csv", ROWS[:1])
+
+    score_file(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), activity_level="very_active")
+
+    (row,) = _read_csv(tmp_path / "out.csv")
+    assert float(row["tdee"]) == calculate_metabolic_profile("male", 30, 175, 70, "very_active").tdee["very_active"]
+
+
+def test_missing_required_column_raises(tmp_path):
+    _write_csv(tmp_path / "in.csv", ROWS[:1], ["user_id", "gender", "age"])
+    with pytest.raises(ValueError, match="missing required columns"):
+        score_file(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"))
+
+
+def test_unsupported_extension_raises(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported file type"):
+        score_file(str(tmp_path / "in.json"), str(tmp_path / "out.csv"))
+
+
+def test_parquet_round_trip(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    pq.write_table(pa.table({
+        "gender": ["male", "female"], "age": [30, 45],
+        "height_cm": [175.0, 162.5], "weight_kg": [70.0, 58.3],
+    }), tmp_path / "in.parquet")
+
+    summary = score_file(str(tmp_path / "in.parquet"), str(tmp_path / "out.parquet"), 1)
+
+    table = pq.read_table(tmp_path / "out.parquet").to_pydict()
+    assert table["bmr"] == [calculate_metabolic_profile("male", 30, 175, 70).bmr,
+                            calculate_metabolic_profile("female", 45, 162.5, 58.3).bmr]
+    assert summary.rows_written == 2
+
+
+def test_parquet_schema_does_not_depend_on_first_chunk(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    pq.write_table(pa.table({
+        "note": [None, None, "kept"],
+        "gender": ["other", "male", "female"], "age": [30, 30, 45],
+        "height_cm": [170.0, 175.0, 162.5], "weight_kg": [70.0, 70.0, 58.3],
+    }), tmp_path / "in.parquet")
+
+    summary = score_file(str(tmp_path / "in.parquet"), str(tmp_path / "out.parquet"), 1)
+
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert summary.rows_skipped == 1
+    assert table.schema.field("note").type == pa.string()
+    assert table.schema.field("bmi_category").type == pa.string()
+    assert table.column("note").to_pylist() == [None, "kept"]
+
+
+def test_csv_input_passes_columns_through_as_strings_in_parquet(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    _write_csv(tmp_path / "in.csv", ROWS)
+
+    score_file(str(tmp_path / "in.csv"), str(tmp_path / "out.parquet"), 1)
+
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.schema.field("age").type == pa.string()
+    assert table.schema.field("tdee").type == pa.float64()
+    assert table.column("user_id").to_pylist() == ["u1", "u2", "u5"]
+
+
+def test_header_only_csv_writes_header(tmp_path):
+    _write_csv(tmp_path / "in.csv", [], columns=list(ROWS[0]))
+
+    summary = score_file(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"))
+
+    with open(tmp_path / "out.csv", newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [list(ROWS[0]) + ["bmi", "bmi_category", "bmr", "tdee"]]
+    assert summary.rows_read == 0
+
+
+def test_empty_parquet_writes_empty_file(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    pq.write_table(pa.table({
+        "gender": pa.array([], pa.string()), "age": pa.array([], pa.int64()),
+        "height_cm": pa.array([], pa.float64()), "weight_kg": pa.array([], pa.float64()),
+    }), tmp_path / "in.parquet")
+
+    score_file(str(tmp_path / "in.parquet"), str(tmp_path / "out.parquet"))
+
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.num_rows == 0
+    assert table.schema.names[-1] == f"tdee_{list(ACTIVITY_COEFFICIENTS)[-1]}"
+
+
+def test_main_prints_summary(tmp_path, capsys):
+    _write_csv(tmp_path / "in.csv", ROWS)
+    assert main([str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), "--chunk-size", "2"]) == 0
+    assert "rows skipped: 3" in capsys.readouterr().err
@@ -0,0 +1,127 @@
+"""Tests for shared-memory parallel scoring."""
+
+import numpy as np
+import pytest
+from src.scoring.cohort_scorer import ChunkArrays, score_arrays, score_file
+from src.scoring.parallel_scorer import ParallelScorer, csv_record_ranges
+
+
+def _random_arrays(n, with_activity):
+    rng = np.random.default_rng(5)
+    return ChunkArrays(
+        rng.integers(-1, 2, n).astype(np.int8),
+        rng.integers(0, 100, n).astype(np.float64),
+        np.round(rng.uniform(40, 220, n), 1),
+        np.round(rng.uniform(5, 170, n), 1),
+        rng.integers(-1, 5, n).astype(np.int8) if with_activity else None,
+    )
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    with ParallelScorer(workers=2, task_size=333) as scorer:
+        yield scorer
+
+
+@pytest.mark.parametrize("with_activity", [True, False])
+def test_results_match_in_process_scoring_in_order(scorer, with_activity):
+    """Test that sharded results equal score_arrays row for row."""
+    arrays = _random_arrays(5_000, with_activity)
+
+    expected, expected_mask = score_arrays(arrays)
+    results, error_mask = scorer.score(arrays)
+
+    assert results.keys() == expected.keys()
+    for name in expected:
+        np.testing.assert_array_equal(results[name], expected[name])
+    np.testing.assert_array_equal(error_mask, expected_mask)
+
+
+def test_empty_input(scorer):
+    results, error_mask = scorer.score(_random_arrays(0, True))
+    assert error_mask.shape == (0,)
+    assert results['bmr'].shape == (0,)
+
+
+def test_shared_memory_block_is_reused(scorer):
+    scorer.score(_random_arrays(2_000, True))
+    block = scorer._shm.name
+    scorer.score(_random_arrays(500, False))
+    assert scorer._shm.name == block
+
+
+def test_invalid_configuration_raises():
+    with pytest.raises(ValueError, match="workers must be positive"):
+        ParallelScorer(workers=0)
+    with pytest.raises(ValueError, match="task_size must be positive"):
+        ParallelScorer(workers=1, task_size=0)
+
+
+def test_score_file_with_workers_matches_serial(tmp_path):
+    rows = ["gender,age,height_cm,weight_kg,activity_level"]
+    rows += [f"{'male' if i % 3 else 'female'},{20 + i % 60},{150 + i % 50},{50 + i % 70}.5,sedentary"
+             for i in range(1_000)]
+    rows.append("other,30,170,70,sedentary")
+    (tmp_path / "in.csv").write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    serial = score_file(str(tmp_path / "in.csv"), str(tmp_path / "serial.csv"), chunk_size=400)
+    parallel = score_file(str(tmp_path / "in.csv"), str(tmp_path / "parallel.csv"), chunk_size=400,
+                          workers=2, task_size=150)
+
+    assert (tmp_path / "parallel.csv").read_text() == (tmp_path / "serial.csv").read_text()
+    assert parallel.rows_skipped == serial.rows_skipped == 1
+
+
+def test_csv_record_ranges_respect_quoted_newlines(tmp_path):
+    path = tmp_path / "in.csv"
+    path.write_bytes(b'note,gender\r\n"a\nb",male\r\n"c ""\n"" d",female\r\nplain,male\r\n')
+
+    ranges = list(csv_record_ranges(str(path), 1))
+
+    data = path.read_bytes()
+    assert [data[start:end] for start, end in ranges] == [
+        b'"a\nb",male\r\n', b'"c ""\n"" d",female\r\n', b'plain,male\r\n']
+
+
+def test_csv_record_ranges_of_header_only_file(tmp_path):
+    (tmp_path / "in.csv").write_text("gender,age,height_cm,weight_kg\n", encoding="utf-8")
+    assert list(csv_record_ranges(str(tmp_path / "in.csv"), 10)) == []
+
+
+def test_parallel_csv_with_quoted_fields_and_rejects_matches_serial(tmp_path):
+    rows = ['note,gender,age,height_cm,weight_kg']
+    rows += [f'"line {i}\nwith ""quotes""",{"male" if i % 2 else "female"},{20 + i % 50},{160 + i % 30},'
+             f'{55 + i % 40}' for i in range(300)]
+    rows.insert(50, 'bad,male,abc,170,70')
+    (tmp_path / "in.csv").write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    serial = score_file(str(tmp_path / "in.csv"), str(tmp_path / "serial.csv"),
+                        rejects_path=str(tmp_path / "serial_rejects.csv"))
+    parallel = score_file(str(tmp_path / "in.csv"), str(tmp_path / "parallel.csv"), chunk_size=37,
+                          rejects_path=str(tmp_path / "parallel_rejects.csv"), workers=2)
+
+    assert (tmp_path / "parallel.csv").read_text() == (tmp_path / "serial.csv").read_text()
+    assert (tmp_path / "parallel_rejects.csv").read_text() == (tmp_path / "serial_rejects.csv").read_text()
+    assert parallel.sample_errors == serial.sample_errors == ["row 50: age must be a number, got 'abc'"]
+    assert parallel.chunks > 1
+
+
+def test_parallel_parquet_matches_serial(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    n = 1_000
+    pq.write_table(pa.table({
+        "user_id": [f"u{i}" for i in range(n)],
+        "gender": ["other" if i % 7 == 0 else "male" for i in range(n)],
+        "age": [20 + i % 60 for i in range(n)],
+        "height_cm": [150.0 + i % 50 for i in range(n)],
+        "weight_kg": [50.5 + i % 70 for i in range(n)],
+    }), tmp_path / "in.parquet", row_group_size=128)
+
+    serial = score_file(str(tmp_path / "in.parquet"), str(tmp_path / "serial.parquet"))
+    parallel = score_file(str(tmp_path / "in.parquet"), str(tmp_path / "parallel.parquet"),
+                          workers=2, task_size=200)
+
+    assert pq.read_table(tmp_path / "parallel.parquet").equals(pq.read_table(tmp_path / "serial.parquet"))
+    assert parallel.rows_skipped == serial.rows_skipped
+    assert parallel.chunks == 4
@@ -7,12 +7,14 @@ import openai
 import httpx
 import logging
 import rich 
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, NamedTuple
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 load_dotenv()
 
 from utils_llm.llm_base_monitor import MonitorContextLLM
+from utils_llm.llm_base_cache import ResponseCache, lookup_response
+from utils_llm.llm_base_clients import get_pooled_client
 
 """
 | Task            | `temperature`  | `top_p`       | Comment                                                              |
@@ -102,41 +104,31 @@ def get_gpt_messages(system_prompt:str, user_prompt:str) -> list:
     return messages
 
 def get_azure_gpt_client() -> AzureOpenAI:
-    client = AzureOpenAI(api_key=os.getenv("OPENAI_API_KEY"),
-                         azure_endpoint=os.getenv("OPENAI_BASE_URL"),
-                         api_version=os.environ.get("AZURE_OPENAI_VERSION"))
-    return client
+    return get_pooled_client("azure", AzureOpenAI,
+                             api_key=os.getenv("OPENAI_API_KEY"),
+                             azure_endpoint=os.getenv("OPENAI_BASE_URL"),
+                             api_version=os.environ.get("AZURE_OPENAI_VERSION"))
 
 
 def get_dashscope_client() -> OpenAI:
-    from openai import OpenAI
-    client = OpenAI(
-        api_key=os.getenv("DASHSCOPE_API_KEY"),
-        base_url="https://dashscope.aliyuncs.com/compatible-mode/v1",
-    )
-    return client
+    return get_pooled_client("dashscope",
+                             api_key=os.getenv("DASHSCOPE_API_KEY"),
+                             base_url="https://dashscope.aliyuncs.com/compatible-mode/v1")
 
 def get_ark_client() -> OpenAI:
-    client = OpenAI(
-        api_key=os.environ.get("ARK_API_KEY"),
-        base_url="https://ark.cn-beijing.volces.com/api/v3",
-    )
-
-    return client
+    return get_pooled_client("ark",
+                             api_key=os.environ.get("ARK_API_KEY"),
+                             base_url="https://ark.cn-beijing.volces.com/api/v3")
 
 def get_deepseek_client() -> OpenAI:
-    client = OpenAI(
-        api_key=os.getenv("DEEPSEEK_API_KEY"),
-        base_url="https://api.deepseek.com/v1"
-    )
-    return client
+    return get_pooled_client("deepseek",
+                             api_key=os.getenv("DEEPSEEK_API_KEY"),
+                             base_url="https://api.deepseek.com/v1")
 
 def get_sf_client() -> OpenAI:
-    client = OpenAI(
-        api_key=os.getenv("SF_API_KEY"),
-        base_url="https://api.siliconflow.cn/v1"
-    )
-    return client
+    return get_pooled_client("siliconflow",
+                             api_key=os.getenv("SF_API_KEY"),
+                             base_url="https://api.siliconflow.cn/v1")
 
 def get_client_by_model(model:str) -> OpenAI:
     if model.startswith("gpt"):
@@ -192,6 +184,7 @@ def chat_gpt_json(
     top_p: float = 0.9,
     track_id: Optional[str] = None,
     client: Optional[OpenAI] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> dict:
     """
     使用GPT模型进行JSON格式的对话。
@@ -203,6 +196,7 @@ def chat_gpt_json(
         top_p: top-p采样参数
         track_id: 追踪ID
         client: OpenAI客户端实例，如果为None则使用默认Azure客户端
+        cache: 响应缓存，None 时使用 set_default_response_cache 设置的默认缓存（若有）
 
     Returns:
         dict: GPT响应的JSON内容
@@ -214,6 +208,11 @@ def chat_gpt_json(
     if not messages:
         raise ValueError("Messages cannot be empty")
 
+    response_format = {"type": "json_object"}
+    cache, cache_key, cached = lookup_response(cache, model, messages, temperature, top_p, response_format)
+    if cached is not None:
+        return cached
+
     client = client or get_client_by_model(model)
     
     try:
@@ -223,10 +222,12 @@ def chat_gpt_json(
                 messages=messages,
                 temperature=temperature,
                 top_p=top_p,
-                response_format={"type": "json_object"})
+                response_format=response_format)
             mc.response = response
             resp = jsons_load_repair(response.choices[0].message.content)
-            return resp
+        if cache is not None:
+            cache.put(cache_key, resp)
+        return resp
     except openai.BadRequestError as e:
         logging.exception(e)
         raise
@@ -243,11 +244,16 @@ def chat_gpt_plain(
     temperature: float = 0.1,
     top_p: float = 0.9,
     track_id: Optional[str] = None,
-    client: Optional[OpenAI] = None
+    client: Optional[OpenAI] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> str:
     if not messages:
         raise ValueError("Messages cannot be empty")
-        
+
+    cache, cache_key, cached = lookup_response(cache, model, messages, temperature, top_p)
+    if cached is not None:
+        return cached
+
     client = client or get_client_by_model(model)
     
     try:
@@ -258,11 +264,102 @@ def chat_gpt_plain(
                 temperature=temperature,
                 top_p=top_p)
             mc.response = response
-            return response.choices[0].message.content
+            content = response.choices[0].message.content
+        if cache is not None and content is not None:
+            cache.put(cache_key, content)
+        return content
     except openai.BadRequestError as e:
         logging.exception(e)
         raise
 
+class StreamDelta(NamedTuple):
+    """流式响应中的一段增量；reasoning_content 仅推理模型（如 DeepSeek-R1）会返回。"""
+    content: str
+    reasoning_content: str
+
+
+@retry(
+    stop=stop_after_attempt(DEFAULT_RETRY_NUM),
+    wait=wait_random_exponential_with_rate_limit(multiplier=1, min_seconds=4, max_seconds=60),
+    retry=retry_if_exception_type((httpx.RequestError, openai.RateLimitError)),
+    before_sleep=lambda retry_state: logging.info(f"Retrying after {retry_state.next_action.sleep} seconds...")
+)
+def _open_stream(client: OpenAI, **kwargs):
+    # 只重试建立流的请求；已经开始输出的流无法安全重放
+    return client.chat.completions.create(stream=True, **kwargs)
+
+
+def stream_chunk_delta(chunk, mc: MonitorContextLLM) -> Optional[StreamDelta]:
+    """从一个流式 chunk 中取出增量，并把 model / usage / finish_reason 记录到 mc。"""
+    if chunk.model:
+        mc.model_actual = chunk.model
+    if getattr(chunk, "usage", None):
+        mc.usage = chunk.usage
+    if not chunk.choices:
+        return None
+    choice0 = chunk.choices[0]
+    if choice0.finish_reason:
+        mc.finish_reason = choice0.finish_reason
+    content = choice0.delta.content or ""
+    reasoning_content = getattr(choice0.delta, "reasoning_content", None) or ""
+    if not content and not reasoning_content:
+        return None
+    mc.mark_token()
+    return StreamDelta(content, reasoning_content)
+
+
+def chat_gpt_stream(
+    messages: list,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    top_p: float = 0.9,
+    track_id: Optional[str] = None,
+    client: Optional[OpenAI] = None,
+    include_usage: bool = True,
+) -> Iterator[StreamDelta]:
+    """
+    chat_gpt_plain 的流式版本，逐段产出 StreamDelta。
+
+        for delta in chat_gpt_stream(messages, model="deepseek-reasoner"):
+            print(delta.reasoning_content or delta.content, end="", flush=True)
+
+    MonitorContextLLM 在流结束（或被提前关闭）时记录首 token 延迟和 token 间延迟。
+
+    Args:
+        messages: 对话消息列表
+        model: 模型名称
+        temperature: 温度参数
+        top_p: top-p采样参数
+        track_id: 追踪ID
+        client: OpenAI客户端实例，如果为None则按模型使用共享客户端
+        include_usage: 请求在最后一个 chunk 中返回 token 用量（stream_options），
+            不支持该参数的服务可设为 False
+
+    Returns:
+        Iterator[StreamDelta]: content / reasoning_content 增量
+    """
+    if not messages:
+        raise ValueError("Messages cannot be empty")
+
+    client = client or get_client_by_model(model)
+    kwargs = dict(model=model, messages=messages, temperature=temperature, top_p=top_p)
+    if include_usage:
+        kwargs["stream_options"] = {"include_usage": True}
+
+    with MonitorContextLLM(messages, model, track_id, 0) as mc:
+        mc.stream = True
+        stream = _open_stream(client, **kwargs)
+        try:
+            for chunk in stream:
+                delta = stream_chunk_delta(chunk, mc)
+                if delta is not None:
+                    yield delta
+        except GeneratorExit:
+            # 调用方提前停止迭代
+            mc.finish_reason = "cancelled"
+        finally:
+            stream.close()
+
 if __name__ == "__main__":
     messages = get_gpt_messages("", "hi, response in json")
     resp = chat_gpt_json(messages=messages, model="gpt-4o")
@@ -0,0 +1,287 @@
+from openai import AsyncAzureOpenAI
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+import asyncio
+import os
+import openai
+import httpx
+import logging
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence
+from tenacity import retry, stop_after_attempt, retry_if_exception_type
+
+load_dotenv()
+
+from utils_llm.llm_base import (DEFAULT_RETRY_NUM, StreamDelta, jsons_load_repair, stream_chunk_delta,
+                                wait_random_exponential_with_rate_limit)
+from utils_llm.llm_base_clients import get_client_registry, get_pooled_async_client
+from utils_llm.llm_base_monitor import MonitorContextLLM
+from utils_llm.llm_base_cache import ResponseCache, lookup_response
+
+"""
+chat_gpt_json / chat_gpt_plain 的异步版本，以及按 provider 限流的批量调用。
+
+    results = asyncio.run(achat_gpt_batch([
+        {"messages": get_gpt_messages(system, user), "model": "deepseek-chat", "track_id": uid}
+        for uid, user in prompts
+    ]))
+
+每个 provider 一个信号量，默认并发数见 DEFAULT_PROVIDER_CONCURRENCY，可用环境变量
+LLM_CONCURRENCY_<PROVIDER>（例如 LLM_CONCURRENCY_DEEPSEEK=32）或 concurrency 参数覆盖。
+"""
+
+# provider -> 默认最大并发请求数
+DEFAULT_PROVIDER_CONCURRENCY = {
+    "azure": 16,
+    "dashscope": 8,
+    "ark": 8,
+    "deepseek": 8,
+    "siliconflow": 8,
+}
+
+
+def provider_of_model(model: str) -> str:
+    """按模型名前缀返回 provider 名称（与 get_client_by_model 的分派规则一致）。"""
+    if model.startswith("gpt"):
+        return "azure"
+    elif model.startswith("qwen"):
+        return "dashscope"
+    elif model.startswith("ep-"):
+        return "ark"
+    elif model.startswith("deepseek"):
+        return "deepseek"
+    elif model.startswith("Pro/"):
+        return "siliconflow"
+    else:
+        raise ValueError(f"Unsupported model: {model}")
+
+
+def get_async_client_by_model(model: str) -> AsyncOpenAI:
+    """返回当前事件循环上该模型 provider 的共享 AsyncOpenAI 客户端。"""
+    provider = provider_of_model(model)
+    if provider == "azure":
+        return get_pooled_async_client(provider, AsyncAzureOpenAI,
+                                       api_key=os.getenv("OPENAI_API_KEY"),
+                                       azure_endpoint=os.getenv("OPENAI_BASE_URL"),
+                                       api_version=os.environ.get("AZURE_OPENAI_VERSION"))
+    elif provider == "dashscope":
+        return get_pooled_async_client(provider,
+                                       api_key=os.getenv("DASHSCOPE_API_KEY"),
+                                       base_url="https://dashscope.aliyuncs.com/compatible-mode/v1")
+    elif provider == "ark":
+        return get_pooled_async_client(provider,
+                                       api_key=os.environ.get("ARK_API_KEY"),
+                                       base_url="https://ark.cn-beijing.volces.com/api/v3")
+    elif provider == "deepseek":
+        return get_pooled_async_client(provider,
+                                       api_key=os.getenv("DEEPSEEK_API_KEY"),
+                                       base_url="https://api.deepseek.com/v1")
+    else:
+        return get_pooled_async_client(provider,
+                                       api_key=os.getenv("SF_API_KEY"),
+                                       base_url="https://api.siliconflow.cn/v1")
+
+
+@retry(
+    stop=stop_after_attempt(DEFAULT_RETRY_NUM),
+    wait=wait_random_exponential_with_rate_limit(multiplier=1, min_seconds=4, max_seconds=60),
+    retry=retry_if_exception_type((httpx.RequestError, ValueError, openai.RateLimitError)),
+    before_sleep=lambda retry_state: logging.info(f"Retrying after {retry_state.next_action.sleep} seconds...")
+)
+async def achat_gpt_json(
+    messages: List[Dict[str, str]],
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    top_p: float = 0.9,
+    track_id: Optional[str] = None,
+    client: Optional[AsyncOpenAI] = None,
+    cache: Optional[ResponseCache] = None,
+) -> dict:
+    """
+    chat_gpt_json 的异步版本，重试策略与监控记录相同。
+
+    Args:
+        messages: 对话消息列表
+        model: 模型名称
+        temperature: 温度参数
+        top_p: top-p采样参数
+        track_id: 追踪ID
+        client: AsyncOpenAI客户端实例，如果为None则按模型使用共享客户端
+        cache: 响应缓存，None 时使用 set_default_response_cache 设置的默认缓存（若有）
+
+    Returns:
+        dict: GPT响应的JSON内容
+    """
+    if not messages:
+        raise ValueError("Messages cannot be empty")
+
+    response_format = {"type": "json_object"}
+    cache, cache_key, cached = lookup_response(cache, model, messages, temperature, top_p, response_format)
+    if cached is not None:
+        return cached
+
+    client = client or get_async_client_by_model(model)
+
+    try:
+        with MonitorContextLLM(messages, model, track_id, 0) as mc:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                top_p=top_p,
+                response_format=response_format)
+            mc.response = response
+            resp = jsons_load_repair(response.choices[0].message.content)
+        if cache is not None:
+            cache.put(cache_key, resp)
+        return resp
+    except openai.BadRequestError as e:
+        logging.exception(e)
+        raise
+
+
+@retry(
+    stop=stop_after_attempt(DEFAULT_RETRY_NUM),
+    wait=wait_random_exponential_with_rate_limit(multiplier=1, min_seconds=4, max_seconds=60),
+    retry=retry_if_exception_type((httpx.RequestError, ValueError, openai.RateLimitError)),
+    before_sleep=lambda retry_state: logging.info(f"Retrying after {retry_state.next_action.sleep} seconds...")
+)
+async def achat_gpt_plain(
+    messages: list,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    top_p: float = 0.9,
+    track_id: Optional[str] = None,
+    client: Optional[AsyncOpenAI] = None,
+    cache: Optional[ResponseCache] = None,
+) -> str:
+    """chat_gpt_plain 的异步版本，重试策略与监控记录相同。"""
+    if not messages:
+        raise ValueError("Messages cannot be empty")
+
+    cache, cache_key, cached = lookup_response(cache, model, messages, temperature, top_p)
+    if cached is not None:
+        return cached
+
+    client = client or get_async_client_by_model(model)
+
+    try:
+        with MonitorContextLLM(messages, model, track_id, 0) as mc:
+            response = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                top_p=top_p)
+            mc.response = response
+            content = response.choices[0].message.content
+        if cache is not None and content is not None:
+            cache.put(cache_key, content)
+        return content
+    except openai.BadRequestError as e:
+        logging.exception(e)
+        raise
+
+
+@retry(
+    stop=stop_after_attempt(DEFAULT_RETRY_NUM),
+    wait=wait_random_exponential_with_rate_limit(multiplier=1, min_seconds=4, max_seconds=60),
+    retry=retry_if_exception_type((httpx.RequestError, openai.RateLimitError)),
+    before_sleep=lambda retry_state: logging.info(f"Retrying after {retry_state.next_action.sleep} seconds...")
+)
+async def _aopen_stream(client: AsyncOpenAI, **kwargs):
+    # 只重试建立流的请求；已经开始输出的流无法安全重放
+    return await client.chat.completions.create(stream=True, **kwargs)
+
+
+async def achat_gpt_stream(
+    messages: list,
+    model: str = "gpt-4o-mini",
+    temperature: float = 0.1,
+    top_p: float = 0.9,
+    track_id: Optional[str] = None,
+    client: Optional[AsyncOpenAI] = None,
+    include_usage: bool = True,
+) -> AsyncIterator[StreamDelta]:
+    """chat_gpt_stream 的异步版本：async for delta in achat_gpt_stream(...)。"""
+    if not messages:
+        raise ValueError("Messages cannot be empty")
+
+    client = client or get_async_client_by_model(model)
+    kwargs = dict(model=model, messages=messages, temperature=temperature, top_p=top_p)
+    if include_usage:
+        kwargs["stream_options"] = {"include_usage": True}
+
+    with MonitorContextLLM(messages, model, track_id, 0) as mc:
+        mc.stream = True
+        stream = await _aopen_stream(client, **kwargs)
+        try:
+            async for chunk in stream:
+                delta = stream_chunk_delta(chunk, mc)
+                if delta is not None:
+                    yield delta
+        except GeneratorExit:
+            # 调用方提前停止迭代
+            mc.finish_reason = "cancelled"
+        finally:
+            await stream.close()
+
+
+def _concurrency_limit(provider: str, concurrency: Optional[Mapping[str, int]]) -> int:
+    if concurrency and provider in concurrency:
+        return concurrency[provider]
+    env_value = os.getenv(f"LLM_CONCURRENCY_{provider.upper()}")
+    if env_value:
+        return int(env_value)
+    return DEFAULT_PROVIDER_CONCURRENCY.get(provider, 8)
+
+
+async def achat_gpt_batch(
+    requests: Sequence[Mapping[str, Any]],
+    json_mode: bool = True,
+    concurrency: Optional[Mapping[str, int]] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    并发执行一批请求，每个 provider 同时在途的请求数受信号量限制。
+
+    Args:
+        requests: 每项是传给 achat_gpt_json / achat_gpt_plain 的关键字参数
+            （至少包含 messages，model 缺省为 "gpt-4o-mini"）
+        json_mode: True 使用 achat_gpt_json，False 使用 achat_gpt_plain
+        concurrency: provider -> 最大并发数，覆盖环境变量和默认值
+        return_exceptions: True 时失败项以异常对象返回，否则第一个失败会抛出
+
+    Returns:
+        list: 与 requests 顺序一致的结果列表
+    """
+    call = achat_gpt_json if json_mode else achat_gpt_plain
+    semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def run_one(kwargs: Mapping[str, Any]) -> Any:
+        provider = provider_of_model(kwargs.get("model", "gpt-4o-mini"))
+        semaphore = semaphores.get(provider)
+        if semaphore is None:
+            semaphore = semaphores[provider] = asyncio.Semaphore(_concurrency_limit(provider, concurrency))
+        async with semaphore:
+            return await call(**kwargs)
+
+    return await asyncio.gather(*(run_one(kwargs) for kwargs in requests),
+                                return_exceptions=return_exceptions)
+
+
+def chat_gpt_batch(
+    requests: Sequence[Mapping[str, Any]],
+    json_mode: bool = True,
+    concurrency: Optional[Mapping[str, int]] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """achat_gpt_batch 的同步入口，供同步代码批量调用。
+
+    在新的事件循环中运行，结束前关闭该循环上创建的共享异步客户端（循环随后即被关闭）。
+    """
+    async def run() -> List[Any]:
+        try:
+            return await achat_gpt_batch(requests, json_mode, concurrency, return_exceptions)
+        finally:
+            await get_client_registry().aclose()
+
+    return asyncio.run(run())
@@ -0,0 +1,252 @@
+from dotenv import load_dotenv
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+load_dotenv()
+
+"""
+可选的 LLM 响应缓存（默认关闭）。
+
+低温度调用对同样的输入几乎总是给出同样的输出，缓存后可省去网络往返和 token 费用。
+缓存 key 是 (model, messages, temperature, top_p, response_format) 规范化 JSON 的 sha256。
+两级存储：
+| 层级   | 实现                    | 淘汰策略                               |
+|--------|-------------------------|----------------------------------------|
+| 内存   | OrderedDict LRU         | 超过 max_entries 淘汰最久未用；TTL 过期 |
+| 磁盘   | SQLite（可选，path 指定）| 超过 max_disk_entries 淘汰最久未用；TTL |
+
+磁盘层的行数在打开时统计一次，之后随插入、过期删除和淘汰增减，写入时不再执行
+COUNT(*) 全表扫描。多个进程共用同一文件时该计数只反映本实例看到的变化，
+max_disk_entries 因此是近似上限。
+
+启用方式：
+
+    set_default_response_cache(ResponseCache(path="logs/llm_cache.sqlite3", ttl=86400))
+
+之后 chat_gpt_json / chat_gpt_plain（及异步版本）中 temperature 不超过
+cache.max_temperature 的调用都会先查缓存；命中时直接返回，不经过 MonitorContextLLM，
+因此监控 CSV 只记录真实的 API 调用。也可以通过 cache 参数为单次调用指定缓存。
+"""
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_TEMPERATURE = 0.3
+
+
+def cache_key(model: str, messages: List[Dict[str, Any]], temperature: float, top_p: float,
+              response_format: Optional[Dict[str, Any]] = None) -> str:
+    """请求参数的规范化哈希（字典键排序、无多余空白），相同请求得到相同 key。"""
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "top_p": top_p,
+        "response_format": response_format,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """内存 LRU + 可选 SQLite 的两级响应缓存（线程安全）。
+
+    Args:
+        max_entries: 内存层最多保留的条目数
+        ttl: 条目有效秒数，None 表示不过期
+        path: SQLite 文件路径，None 表示只用内存
+        max_disk_entries: 磁盘层最多保留的条目数，None 表示不限
+        max_temperature: 只缓存 temperature 不超过该值的调用
+        clock: 时间来源（秒），用于 TTL 和磁盘层的最近使用时间
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: Optional[float] = None,
+                 path: Optional[str] = None, max_disk_entries: Optional[int] = None,
+                 max_temperature: float = DEFAULT_MAX_TEMPERATURE, clock: Callable[[], float] = time.time):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.max_temperature = max_temperature
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_rows = 0
+        if path is not None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+            self._disk_rows = self._disk_count()
+
+    def accepts(self, temperature: float) -> bool:
+        return temperature <= self.max_temperature
+
+    def get(self, key: str) -> Optional[Any]:
+        """返回缓存的响应（每次返回新的副本），未命中或已过期返回 None。"""
+        now = self.clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._expired(entry[0], now):
+                    del self._memory[key]
+                else:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(entry[1])
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value, created = row
+                    if self._expired(created, now):
+                        self._disk_rows -= self._db.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount
+                    else:
+                        self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                        self._remember(key, created, value)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return json.loads(value)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """保存一个 JSON 可序列化的响应（dict 或 str）。"""
+        now = self.clock()
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, now, data)
+            if self._db is not None:
+                inserted = self._db.execute(
+                    "INSERT OR IGNORE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, data, now, now)).rowcount
+                if inserted:
+                    self._disk_rows += 1
+                else:
+                    self._db.execute("UPDATE responses SET value = ?, created = ?, accessed = ? WHERE key = ?",
+                                     (data, now, now, key))
+                self._evict_disk(now)
+
+    def stats(self) -> Dict[str, Any]:
+        """命中/未命中计数及当前条目数。"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_count(),
+            }
+
+    def clear(self) -> None:
+        """清空两级缓存（计数器保留）。"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._disk_rows = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    # --- 内部方法（调用方需持有锁） ---
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key: str, created: float, data: str) -> None:
+        self._memory[key] = (created, data)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _evict_disk(self, now: float) -> None:
+        if self.ttl is not None:
+            self._disk_rows -= self._db.execute(
+                "DELETE FROM responses WHERE created < ?", (now - self.ttl,)).rowcount
+        if self.max_disk_entries is not None and self._disk_rows > self.max_disk_entries:
+            evicted = self._db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                (self._disk_rows - self.max_disk_entries,)).rowcount
+            self._disk_rows -= evicted
+            self.evictions += evicted
+
+    def _disk_count(self) -> int:
+        if self._db is None:
+            return 0
+        return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+_default_cache: Optional[ResponseCache] = None
+
+
+def set_default_response_cache(cache: Optional[ResponseCache]) -> None:
+    """设置进程级默认缓存；传入 None 关闭缓存。"""
+    global _default_cache
+    _default_cache = cache
+
+
+def get_default_response_cache() -> Optional[ResponseCache]:
+    return _default_cache
+
+
+def lookup_response(cache: Optional[ResponseCache], model: str, messages: List[Dict[str, Any]],
+                    temperature: float, top_p: float,
+                    response_format: Optional[Dict[str, Any]] = None) -> Tuple[Optional[ResponseCache], Optional[str], Optional[Any]]:
+    """chat_gpt_* 使用的查缓存步骤。
+
+    Args:
+        cache: 显式指定的缓存，None 时使用进程级默认缓存
+
+    Returns:
+        (cache, key, value): 不适用缓存时 cache 和 key 为 None；未命中时 value 为 None
+    """
+    cache = cache if cache is not None else _default_cache
+    if cache is None or not cache.accepts(temperature):
+        return None, None, None
+    key = cache_key(model, messages, temperature, top_p, response_format)
+    value = cache.get(key)
+    if value is not None:
+        logging.info(f"ResponseCache hit model:{model} key:{key[:12]}")
+    return cache, key, value
+
+
+__all__ = [
+    "DEFAULT_MAX_ENTRIES",
+    "DEFAULT_MAX_TEMPERATURE",
+    "ResponseCache",
+    "cache_key",
+    "get_default_response_cache",
+    "lookup_response",
+    "set_default_response_cache",
+]
@@ -0,0 +1,204 @@
+from dotenv import load_dotenv
+import asyncio
+import atexit
+import os
+import logging
+import threading
+import weakref
+from typing import Dict, Hashable, Optional, Tuple, Type
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+load_dotenv()
+
+"""
+进程级 LLM 客户端注册表。
+
+每次 new 一个 OpenAI 客户端都会新建 httpx 连接池，随后每个请求都要重新做
+TCP/TLS 握手。ClientRegistry 按 (客户端类型, provider, 配置) 缓存客户端，
+同一 provider 的调用共享一个长连接池；OpenAI/httpx 客户端本身是线程安全的，
+注册表只需保证同一个 key 只创建一次。
+
+AsyncOpenAI 客户端的连接绑定在创建它的事件循环上，因此异步客户端额外按
+当前运行的事件循环分组缓存；事件循环被回收后，其客户端也随之释放。短生命周期
+的事件循环（例如 asyncio.run）应在结束前 await registry.aclose() 关闭本循环的
+客户端，否则其连接只能等垃圾回收释放。
+
+连接池大小可通过环境变量配置：
+| 变量                                | 默认值 | 含义                   |
+|-------------------------------------|--------|------------------------|
+| LLM_HTTP_MAX_CONNECTIONS            | 100    | 每个客户端最大连接数    |
+| LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS  | 20     | 每个客户端最大空闲长连接 |
+| LLM_HTTP_KEEPALIVE_EXPIRY           | 30     | 空闲长连接保留秒数      |
+"""
+
+# 与 openai SDK 默认值一致：连接 5 秒，其余 600 秒
+DEFAULT_TIMEOUT = httpx.Timeout(timeout=600.0, connect=5.0)
+
+
+def default_limits() -> httpx.Limits:
+    """从环境变量读取连接池限制。"""
+    return httpx.Limits(
+        max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+
+
+class ClientRegistry:
+    """按 provider 和配置复用 OpenAI 客户端及其 httpx 连接池（线程安全）。
+
+    Args:
+        limits: httpx 连接池限制，默认读取环境变量（见模块说明）
+        timeout: 请求超时，默认与 openai SDK 相同
+    """
+
+    def __init__(self, limits: Optional[httpx.Limits] = None, timeout: Optional[httpx.Timeout] = None):
+        self.limits = limits or default_limits()
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self._clients: Dict[Tuple[Hashable, ...], OpenAI] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, client_cls: Type[OpenAI] = OpenAI, **client_kwargs) -> OpenAI:
+        """获取（必要时创建）某个 provider 的共享客户端。
+
+        Args:
+            provider: provider 名称，例如 "deepseek"
+            client_cls: OpenAI 或 AzureOpenAI
+            **client_kwargs: 传给客户端构造函数的参数（api_key、base_url 等），
+                参与缓存 key，因此更换 key 或地址会得到新的客户端
+
+        Returns:
+            OpenAI: 共享的客户端实例
+        """
+        key = (client_cls, provider) + tuple(sorted(client_kwargs.items()))
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    logging.info(f"ClientRegistry creating {client_cls.__name__} for provider:{provider}")
+                    http_client = httpx.Client(limits=self.limits, timeout=self.timeout)
+                    client = client_cls(http_client=http_client, **client_kwargs)
+                    self._clients[key] = client
+        return client
+
+    def get_async(self, provider: str, client_cls: Type[AsyncOpenAI] = AsyncOpenAI,
+                  **client_kwargs) -> AsyncOpenAI:
+        """获取当前事件循环上某个 provider 的共享异步客户端，必须在协程中调用。
+
+        Args:
+            provider: provider 名称，例如 "deepseek"
+            client_cls: AsyncOpenAI 或 AsyncAzureOpenAI
+            **client_kwargs: 同 get
+
+        Returns:
+            AsyncOpenAI: 当前事件循环共享的异步客户端实例
+        """
+        loop = asyncio.get_running_loop()
+        key = (client_cls, provider) + tuple(sorted(client_kwargs.items()))
+        clients = self._async_clients.get(loop)
+        client = clients.get(key) if clients is not None else None
+        if client is None:
+            with self._lock:
+                clients = self._async_clients.setdefault(loop, {})
+                client = clients.get(key)
+                if client is None:
+                    logging.info(f"ClientRegistry creating {client_cls.__name__} for provider:{provider}")
+                    http_client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+                    client = client_cls(http_client=http_client, **client_kwargs)
+                    clients[key] = client
+        return client
+
+    async def aclose(self) -> None:
+        """关闭并移除当前事件循环上的所有异步客户端，必须在协程中调用。"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.pop(loop, {})
+        await _aclose_clients(list(clients.values()))
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def close(self) -> None:
+        """关闭所有客户端的连接池并清空注册表。
+
+        异步客户端只能在其事件循环中关闭：循环正在运行时把关闭调度到该循环上，
+        循环空闲时在其上运行关闭，循环已关闭时只能丢弃引用。
+        """
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+            async_clients = [(loop, list(by_key.values())) for loop, by_key in self._async_clients.items()]
+            self._async_clients = weakref.WeakKeyDictionary()
+        for client in clients:
+            try:
+                client.close()
+            except Exception as ex:  # noqa
+                logging.exception(ex)
+        for loop, loop_clients in async_clients:
+            _close_on_loop(loop, loop_clients)
+
+
+async def _aclose_clients(clients) -> None:
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as ex:  # noqa
+            logging.exception(ex)
+
+
+def _close_on_loop(loop: asyncio.AbstractEventLoop, clients) -> None:
+    if loop.is_closed():
+        return
+    try:
+        if loop.is_running():
+            # 可能是其他线程上的循环，也可能是当前循环：只调度，不等待
+            asyncio.run_coroutine_threadsafe(_aclose_clients(clients), loop)
+        else:
+            loop.run_until_complete(_aclose_clients(clients))
+    except Exception as ex:  # noqa
+        logging.exception(ex)
+
+
+_registry = ClientRegistry()
+atexit.register(lambda: _registry.close())
+
+
+def get_client_registry() -> ClientRegistry:
+    return _registry
+
+
+def configure_client_registry(limits: Optional[httpx.Limits] = None,
+                              timeout: Optional[httpx.Timeout] = None) -> ClientRegistry:
+    """用新的连接池配置替换进程级注册表，之后的调用使用新的客户端。
+
+    旧注册表的客户端不会被关闭：其他线程可能仍在用它们发请求，它们在不再被
+    引用后由垃圾回收释放。建议只在启动时调用一次。
+    """
+    global _registry
+    _registry = ClientRegistry(limits, timeout)
+    return _registry
+
+
+def get_pooled_client(provider: str, client_cls: Type[OpenAI] = OpenAI, **client_kwargs) -> OpenAI:
+    """从进程级注册表获取共享客户端，参数同 ClientRegistry.get。"""
+    return _registry.get(provider, client_cls, **client_kwargs)
+
+
+def get_pooled_async_client(provider: str, client_cls: Type[AsyncOpenAI] = AsyncOpenAI,
+                            **client_kwargs) -> AsyncOpenAI:
+    """从进程级注册表获取当前事件循环的共享异步客户端，参数同 ClientRegistry.get_async。"""
+    return _registry.get_async(provider, client_cls, **client_kwargs)
+
+
+__all__ = [
+    "ClientRegistry",
+    "DEFAULT_TIMEOUT",
+    "configure_client_registry",
+    "default_limits",
+    "get_client_registry",
+    "get_pooled_async_client",
+    "get_pooled_client",
+]
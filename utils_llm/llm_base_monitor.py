@@ -12,7 +12,7 @@ class MonitorContextLLM:
     LEADING_PREFIX = "ctn"
 
     @classmethod
-    def _get_monitor_filename(cls, model:str) -> str:
+    def _get_monitor_filename(cls, model:str, stream:bool=False) -> str:
         dir_root = os.path.dirname(find_dotenv())
         dir_logs = os.path.join(dir_root, "logs")
         os.makedirs(dir_logs, exist_ok=True)
@@ -24,6 +24,9 @@ class MonitorContextLLM:
             fname = f"{cls.LEADING_PREFIX}_monitor_ark.csv"
         else:
             fname = f"{cls.LEADING_PREFIX}_monotor_ukn.csv"
+        if stream:
+            # 流式调用多了首 token / token 间延迟列，单独写文件以保持原 CSV 列不变
+            fname = fname.replace(".csv", "_stream.csv")
         filename = os.path.join(dir_logs, fname)
         return filename
 
@@ -37,6 +40,15 @@ class MonitorContextLLM:
         self.d1 = None
         self.response = None
 
+        # 流式调用：由调用方设置 stream=True，并在收到每个非空 delta 时调用 mark_token()
+        self.stream = False
+        self.t_first = None
+        self.t_last = None
+        self.token_gaps = []
+        self.finish_reason = None
+        self.model_actual = None
+        self.usage = None
+
     def __enter__(self):
         logging.info(f"MonitorContextLLM enter model:{self.model}")
         self.d0 = time.time()
@@ -49,7 +61,26 @@ class MonitorContextLLM:
         if exc_type is not None:
             logging.exception(self.track_id)
 
+    def mark_token(self):
+        """记录一个流式 delta 的到达时间（用于首 token 延迟和 token 间延迟）。"""
+        now = time.time()
+        if self.t_first is None:
+            self.t_first = now
+        else:
+            self.token_gaps.append(now - self.t_last)
+        self.t_last = now
+
+    @property
+    def ttft(self):
+        """首 token 延迟（秒），尚未收到 token 时为 None。"""
+        if self.t_first is None:
+            return None
+        return self.t_first - self.d0
+
     def _monitor_call(self, exc_type:Exception):
+        if self.stream:
+            self._monitor_stream_call(exc_type)
+            return
         try:
             filename = self._get_monitor_filename(self.model)
             
@@ -112,4 +143,49 @@ class MonitorContextLLM:
                     ])
 
         except Exception as ex:  # noqa
-            logging.exception(ex)
\ No newline at end of file
+            logging.exception(ex)
+
+    def _monitor_stream_call(self, exc_type:Exception):
+        try:
+            filename = self._get_monitor_filename(self.model, stream=True)
+            file_exists = os.path.exists(filename)
+            file_empty = file_exists and os.path.getsize(filename) == 0
+
+            sec_span = round(self.d1 - self.d0, 2)
+            ts0 = datetime.fromtimestamp(round(self.d0, 2)).strftime("%Y%m%d:%H:%M:%S")
+            ttft_ms = round(self.ttft * 1000.0, 1) if self.ttft is not None else 0.0
+            gaps = sorted(self.token_gaps)
+            if gaps:
+                itl_ms_mean = round(sum(gaps) / len(gaps) * 1000.0, 2)
+                itl_ms_p95 = round(gaps[min(len(gaps) - 1, int(len(gaps) * 0.95))] * 1000.0, 2)
+            else:
+                itl_ms_mean = itl_ms_p95 = 0.0
+            usage = self.usage
+            finish_reason = self.finish_reason if exc_type is None else str(exc_type)
+
+            with open(filename, 'a', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file, quoting=csv.QUOTE_NONNUMERIC)
+                if not file_exists or file_empty:
+                    writer.writerow(['timestamp', 'finish_reason', 'model_requested', 'model_actual',
+                                   'sec_span', 'ttft_ms', 'itl_ms_mean', 'itl_ms_p95', 'deltas',
+                                   'total_tokens', 'prompt_tokens', 'completion_tokens',
+                                   'track_id', 'attempt'])
+                writer.writerow([
+                    ts0,                                            # 字符串
+                    str(finish_reason),                             # 字符串
+                    self.model,                                     # 字符串
+                    self.model_actual or self.model,                # 字符串
+                    sec_span,                                       # 数值
+                    ttft_ms,                                        # 数值
+                    itl_ms_mean,                                    # 数值
+                    itl_ms_p95,                                     # 数值
+                    len(gaps) + (self.t_first is not None),         # 数值
+                    usage.total_tokens if usage else 0,             # 数值
+                    usage.prompt_tokens if usage else 0,            # 数值
+                    usage.completion_tokens if usage else 0,        # 数值
+                    str(self.track_id),                             # 字符串
+                    self.attempt                                    # 数值
+                ])
+
+        except Exception as ex:  # noqa
+            logging.exception(ex)
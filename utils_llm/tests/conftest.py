@@ -0,0 +1,10 @@
+import pytest
+
+from utils_llm import llm_base_monitor
+
+
+@pytest.fixture(autouse=True)
+def monitor_logs(tmp_path, monkeypatch):
+    """Makes MonitorContextLLM write its CSV files to tmp_path/logs instead of the repo's logs/ directory."""
+    monkeypatch.setattr(llm_base_monitor, "find_dotenv", lambda: str(tmp_path / ".env"))
+    return tmp_path / "logs"
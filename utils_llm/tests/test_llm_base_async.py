@@ -0,0 +1,123 @@
+"""Tests for the async chat helpers and the per-provider batch limiter (mocked clients, no network)."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils_llm import llm_base_async, llm_base_clients
+from utils_llm.llm_base_async import achat_gpt_batch, achat_gpt_json, achat_gpt_plain, chat_gpt_batch
+from utils_llm.llm_base_clients import ClientRegistry, get_pooled_async_client
+
+
+class Boom(Exception):
+    pass
+
+
+class FakeAsyncClient:
+    """Stands in for AsyncOpenAI: answers with the last user message and tracks concurrency per model."""
+
+    def __init__(self, delay=0.0, fail_on=None, **kwargs):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.calls = []
+        self.active = {}
+        self.max_active = {}
+        self.closed = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, model, messages, **kwargs):
+        self.calls.append({"model": model, "messages": messages, **kwargs})
+        self.active[model] = self.active.get(model, 0) + 1
+        self.max_active[model] = max(self.max_active.get(model, 0), self.active[model])
+        try:
+            text = messages[-1]["content"]
+            # Later requests finish first, so results only come back in order if gather keeps it.
+            await asyncio.sleep(self.delay / (1 + len(self.calls)))
+            if text == self.fail_on:
+                raise Boom(text)
+            content = json.dumps({"echo": text}) if kwargs.get("response_format") else text.upper()
+            return SimpleNamespace(
+                model=model,
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+                usage=SimpleNamespace(total_tokens=3, prompt_tokens=2, completion_tokens=1),
+            )
+        finally:
+            self.active[model] -= 1
+
+    async def close(self):
+        self.closed = True
+
+
+def _messages(text):
+    return [{"role": "user", "content": text}]
+
+
+def test_achat_gpt_json_parses_the_response():
+    client = FakeAsyncClient()
+    result = asyncio.run(achat_gpt_json(_messages("hi"), model="deepseek-chat", temperature=0.5, client=client))
+    assert result == {"echo": "hi"}
+    assert client.calls == [{"model": "deepseek-chat", "messages": _messages("hi"), "temperature": 0.5,
+                             "top_p": 0.9, "response_format": {"type": "json_object"}}]
+
+
+def test_achat_gpt_plain_returns_the_text():
+    client = FakeAsyncClient()
+    assert asyncio.run(achat_gpt_plain(_messages("hi"), model="qwen-plus", client=client)) == "HI"
+    assert "response_format" not in client.calls[0]
+
+
+@pytest.mark.parametrize("json_mode", [True, False])
+def test_batch_keeps_input_order(json_mode):
+    client = FakeAsyncClient(delay=0.05)
+    requests = [{"messages": _messages(f"m{i}"), "model": "deepseek-chat", "client": client} for i in range(12)]
+    results = asyncio.run(achat_gpt_batch(requests, json_mode=json_mode))
+    expected = [{"echo": f"m{i}"} if json_mode else f"M{i}" for i in range(12)]
+    assert results == expected
+
+
+def test_batch_caps_concurrency_per_provider():
+    client = FakeAsyncClient(delay=0.05)
+    requests = [{"messages": _messages(f"d{i}"), "model": "deepseek-chat", "client": client} for i in range(10)]
+    requests += [{"messages": _messages(f"q{i}"), "model": "qwen-plus", "client": client} for i in range(10)]
+    asyncio.run(achat_gpt_batch(requests, concurrency={"deepseek": 3, "dashscope": 2}))
+    assert client.max_active == {"deepseek-chat": 3, "qwen-plus": 2}
+    assert len(client.calls) == 20
+
+
+def test_batch_concurrency_from_environment(monkeypatch):
+    monkeypatch.setenv("LLM_CONCURRENCY_DEEPSEEK", "4")
+    client = FakeAsyncClient(delay=0.05)
+    requests = [{"messages": _messages(f"d{i}"), "model": "deepseek-chat", "client": client} for i in range(10)]
+    asyncio.run(achat_gpt_batch(requests))
+    assert client.max_active == {"deepseek-chat": 4}
+
+
+def test_batch_return_exceptions():
+    client = FakeAsyncClient(fail_on="m1")
+    requests = [{"messages": _messages(f"m{i}"), "model": "deepseek-chat", "client": client} for i in range(3)]
+    results = asyncio.run(achat_gpt_batch(requests, json_mode=False, return_exceptions=True))
+    assert results[0] == "M0" and results[2] == "M2"
+    assert isinstance(results[1], Boom)
+    with pytest.raises(Boom):
+        asyncio.run(achat_gpt_batch(requests, json_mode=False))
+
+
+def test_sync_batch_closes_the_pooled_clients_of_its_loop(monkeypatch):
+    registry = ClientRegistry()
+    monkeypatch.setattr(llm_base_clients, "_registry", registry)
+    created = []
+
+    def pooled_fake_client(model):
+        client = get_pooled_async_client("deepseek", FakeAsyncClient, api_key="k1")
+        if client not in created:
+            created.append(client)
+        return client
+
+    monkeypatch.setattr(llm_base_async, "get_async_client_by_model", pooled_fake_client)
+    results = chat_gpt_batch([{"messages": _messages(f"m{i}"), "model": "deepseek-chat"} for i in range(3)],
+                             json_mode=False)
+    assert results == ["M0", "M1", "M2"]
+    assert len(created) == 1 and created[0].closed
+    assert len(registry._async_clients) == 0
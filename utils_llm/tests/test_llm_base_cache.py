@@ -0,0 +1,197 @@
+"""Tests for the two-tier LLM response cache."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils_llm import llm_base
+from utils_llm.llm_base_cache import ResponseCache, cache_key
+from utils_llm.llm_base_monitor import MonitorContextLLM
+
+MESSAGES = [{"role": "system", "content": "be brief"}, {"role": "user", "content": "hi"}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeClient:
+    """Stands in for OpenAI: counts create() calls and answers with a JSON object."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({"n": self.calls})),
+                                     finish_reason="stop")],
+            usage=SimpleNamespace(total_tokens=3, prompt_tokens=2, completion_tokens=1),
+        )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_cache_key_ignores_dict_order():
+    reordered = [{"content": "be brief", "role": "system"}, {"content": "hi", "role": "user"}]
+    assert cache_key("m", MESSAGES, 0.1, 0.9) == cache_key("m", reordered, 0.1, 0.9)
+    assert cache_key("m", MESSAGES, 0.1, 0.9, {"type": "json_object"}) == \
+        cache_key("m", reordered, 0.1, 0.9, {"type": "json_object"})
+
+
+@pytest.mark.parametrize("changed", [
+    {"model": "other"},
+    {"messages": MESSAGES[1:]},
+    {"temperature": 0.2},
+    {"top_p": 1.0},
+    {"response_format": {"type": "json_object"}},
+])
+def test_cache_key_covers_every_parameter(changed):
+    base = {"model": "m", "messages": MESSAGES, "temperature": 0.1, "top_p": 0.9, "response_format": None}
+    assert cache_key(**{**base, **changed}) != cache_key(**base)
+
+
+def test_memory_tier_is_lru(clock):
+    cache = ResponseCache(max_entries=2, clock=clock)
+    cache.put("a", {"v": 1})
+    cache.put("b", "text")
+    assert cache.get("a") == {"v": 1}  # a is now the most recently used
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1} and cache.get("c") == {"v": 3}
+    assert cache.stats()["evictions"] == 1 and len(cache) == 2
+
+
+def test_get_returns_a_fresh_copy(clock):
+    cache = ResponseCache(clock=clock)
+    cache.put("a", {"v": [1]})
+    cache.get("a")["v"].append(2)
+    assert cache.get("a") == {"v": [1]}
+
+
+def test_memory_ttl(clock):
+    cache = ResponseCache(ttl=10, clock=clock)
+    cache.put("a", "text")
+    clock.now += 10
+    assert cache.get("a") == "text"
+    clock.now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_disk_tier_survives_a_new_instance_and_counts_disk_hits(tmp_path, clock):
+    path = str(tmp_path / "cache" / "llm.sqlite3")
+    first = ResponseCache(path=path, clock=clock)
+    first.put("a", {"v": 1})
+    first.close()
+
+    second = ResponseCache(path=path, clock=clock)
+    assert second.get("a") == {"v": 1}  # from SQLite, then promoted to memory
+    assert second.get("a") == {"v": 1}
+    assert second.get("missing") is None
+    stats = second.stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"], stats["hit_rate"]) == (2, 1, 1, 0.6667)
+    assert (stats["memory_entries"], stats["disk_entries"]) == (1, 1)
+    second.close()
+
+
+def test_disk_ttl(tmp_path, clock):
+    path = str(tmp_path / "llm.sqlite3")
+    writer = ResponseCache(path=path, ttl=10, clock=clock)
+    writer.put("a", "text")
+    writer.close()
+
+    clock.now += 11
+    reader = ResponseCache(path=path, ttl=10, clock=clock)
+    assert reader.get("a") is None
+    assert reader.stats()["disk_entries"] == 0
+    reader.close()
+
+
+def test_max_disk_entries_evicts_the_oldest(tmp_path, clock):
+    path = str(tmp_path / "llm.sqlite3")
+    cache = ResponseCache(path=path, max_disk_entries=2, clock=clock)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+        clock.now += 1
+    stats = cache.stats()
+    assert (stats["disk_entries"], stats["memory_entries"], stats["evictions"]) == (2, 3, 1)
+    cache.close()
+
+    reader = ResponseCache(path=path, clock=clock)
+    assert [reader.get(key) for key in ("a", "b", "c")] == [None, "b", "c"]
+    reader.close()
+
+
+def test_max_disk_entries_counts_replaced_and_expired_rows(tmp_path, clock):
+    path = str(tmp_path / "llm.sqlite3")
+    cache = ResponseCache(path=path, ttl=10, max_disk_entries=2, clock=clock)
+    cache.put("a", "a")
+    cache.put("b", "b")
+    cache.put("a", "a2")  # replaces a row, does not add one
+    clock.now += 11
+    cache.put("c", "c")  # a and b expire
+    cache.put("d", "d")
+    assert cache.evictions == 0
+    cache.put("e", "e")
+    assert cache.evictions == 1
+    assert cache.stats()["disk_entries"] == 2
+    cache.close()
+
+
+def test_max_disk_entries_keeps_recently_read_entries(tmp_path, clock):
+    path = str(tmp_path / "llm.sqlite3")
+    cache = ResponseCache(max_entries=1, path=path, max_disk_entries=2, clock=clock)
+    cache.put("a", "a")
+    clock.now += 1
+    cache.put("b", "b")
+    clock.now += 1
+    assert cache.get("a") == "a"
+    clock.now += 1
+    cache.put("c", "c")
+    cache.close()
+
+    reader = ResponseCache(path=path, clock=clock)
+    assert reader.get("b") is None
+    assert reader.get("a") == "a" and reader.get("c") == "c"
+    reader.close()
+
+
+def test_chat_gpt_json_cache_hit_skips_client_and_monitor(monkeypatch):
+    entered = []
+
+    class CountingMonitor(MonitorContextLLM):
+        def __enter__(self):
+            entered.append(self.model)
+            return super().__enter__()
+
+    monkeypatch.setattr(llm_base, "MonitorContextLLM", CountingMonitor)
+    client, cache = FakeClient(), ResponseCache()
+
+    first = llm_base.chat_gpt_json(MESSAGES, model="deepseek-chat", client=client, cache=cache)
+    second = llm_base.chat_gpt_json(MESSAGES, model="deepseek-chat", client=client, cache=cache)
+    assert first == second == {"n": 1}
+    assert client.calls == 1 and entered == ["deepseek-chat"]
+    assert cache.stats()["hits"] == 1
+
+    # A plain-text call with the same messages has a different key (no response_format).
+    assert llm_base.chat_gpt_plain(MESSAGES, model="deepseek-chat", client=client, cache=cache) == '{"n": 2}'
+    assert client.calls == 2
+
+
+def test_chat_gpt_json_skips_the_cache_above_max_temperature(monkeypatch):
+    client, cache = FakeClient(), ResponseCache(max_temperature=0.3)
+    for _ in range(2):
+        llm_base.chat_gpt_json(MESSAGES, model="deepseek-chat", temperature=0.7, client=client, cache=cache)
+    assert client.calls == 2
+    assert cache.stats()["misses"] == 0 and len(cache) == 0
@@ -0,0 +1,133 @@
+"""Tests for the process-wide LLM client registry."""
+
+import asyncio
+import threading
+
+import pytest
+from openai import AsyncOpenAI, OpenAI
+
+from utils_llm import llm_base_clients
+from utils_llm.llm_base_clients import ClientRegistry, configure_client_registry, get_pooled_client
+
+
+class CountingOpenAI(OpenAI):
+    created = 0
+
+    def __init__(self, **kwargs):
+        type(self).created += 1
+        super().__init__(**kwargs)
+
+
+@pytest.fixture
+def registry():
+    registry = ClientRegistry()
+    yield registry
+    registry.close()
+
+
+def test_same_provider_and_config_share_a_client(registry):
+    first = registry.get("deepseek", api_key="k1", base_url="https://a.example/v1")
+    assert registry.get("deepseek", base_url="https://a.example/v1", api_key="k1") is first
+    assert len(registry) == 1
+
+
+@pytest.mark.parametrize("changed", [{"api_key": "k2"}, {"base_url": "https://b.example/v1"}])
+def test_changed_key_or_base_url_gets_a_new_client(registry, changed):
+    config = {"api_key": "k1", "base_url": "https://a.example/v1"}
+    first = registry.get("deepseek", **config)
+    second = registry.get("deepseek", **{**config, **changed})
+    assert second is not first
+    assert registry.get("deepseek", **{**config, **changed}) is second
+    assert len(registry) == 2
+
+
+def test_concurrent_get_creates_one_client(registry):
+    CountingOpenAI.created = 0
+    barrier = threading.Barrier(16)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(registry.get("deepseek", CountingOpenAI, api_key="k1", base_url="https://a.example/v1"))
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert CountingOpenAI.created == 1
+    assert len(results) == 16 and all(client is results[0] for client in results)
+
+
+def test_async_clients_are_per_event_loop(registry):
+    async def get():
+        return registry.get_async("deepseek", api_key="k1", base_url="https://a.example/v1")
+
+    async def get_twice():
+        return await get(), await get()
+
+    first, again = asyncio.run(get_twice())
+    assert first is again
+    assert asyncio.run(get()) is not first
+
+
+def test_aclose_closes_the_current_loops_clients(registry):
+    async def run():
+        client = registry.get_async("deepseek", api_key="k1", base_url="https://a.example/v1")
+        await registry.aclose()
+        return client, registry.get_async("deepseek", api_key="k1", base_url="https://a.example/v1")
+
+    closed, fresh = asyncio.run(run())
+    assert closed.is_closed()
+    assert fresh is not closed
+
+
+def test_close_closes_sync_and_async_clients(registry):
+    loop = asyncio.new_event_loop()
+    try:
+        async def get_async():
+            return registry.get_async("deepseek", AsyncOpenAI, api_key="k1", base_url="https://a.example/v1")
+
+        async_client = loop.run_until_complete(get_async())
+        sync_client = registry.get("deepseek", api_key="k1", base_url="https://a.example/v1")
+        registry.close()
+        assert sync_client.is_closed()
+        assert async_client.is_closed()
+        assert len(registry) == 0
+    finally:
+        loop.close()
+
+
+def test_close_schedules_aclose_on_a_running_loop(registry):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        async def get_async():
+            return registry.get_async("deepseek", api_key="k1", base_url="https://a.example/v1")
+
+        client = asyncio.run_coroutine_threadsafe(get_async(), loop).result(5)
+        registry.close()
+
+        async def wait_closed():
+            while not client.is_closed():
+                await asyncio.sleep(0.01)
+
+        asyncio.run_coroutine_threadsafe(wait_closed(), loop).result(5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def test_configure_swaps_without_closing_clients_in_use(monkeypatch):
+    monkeypatch.setattr(llm_base_clients, "_registry", ClientRegistry())
+    in_use = get_pooled_client("deepseek", api_key="k1", base_url="https://a.example/v1")
+    new_registry = configure_client_registry()
+    try:
+        assert not in_use.is_closed()
+        assert get_pooled_client("deepseek", api_key="k1", base_url="https://a.example/v1") is not in_use
+        assert llm_base_clients.get_client_registry() is new_registry
+    finally:
+        in_use.close()
+        new_registry.close()
@@ -0,0 +1,195 @@
+"""Tests for the streaming chat generators and their latency monitoring (fake streams, no network)."""
+
+import asyncio
+import csv
+from types import SimpleNamespace
+
+import pytest
+
+from utils_llm import llm_base_monitor
+from utils_llm.llm_base import StreamDelta, chat_gpt_stream
+from utils_llm.llm_base_async import achat_gpt_stream
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+STREAM_COLUMNS = ["timestamp", "finish_reason", "model_requested", "model_actual", "sec_span", "ttft_ms",
+                  "itl_ms_mean", "itl_ms_p95", "deltas", "total_tokens", "prompt_tokens", "completion_tokens",
+                  "track_id", "attempt"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _chunk(content=None, reasoning_content=None, finish_reason=None, usage=None, choices=True):
+    delta = SimpleNamespace(content=content, reasoning_content=reasoning_content)
+    return SimpleNamespace(
+        model="gpt-4o-mini-2024-07-18",
+        usage=usage,
+        choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)] if choices else [],
+    )
+
+
+# (arrival time, chunk): a role-only chunk, one reasoning delta, two content deltas,
+# the finish chunk and the trailing usage chunk requested with include_usage.
+TIMELINE = [
+    (100.5, _chunk(content="")),
+    (100.8, _chunk(reasoning_content="think")),
+    (101.0, _chunk(content="Hel")),
+    (101.3, _chunk(content="lo")),
+    (101.3, _chunk(finish_reason="stop")),
+    (101.4, _chunk(usage=SimpleNamespace(total_tokens=12, prompt_tokens=5, completion_tokens=7), choices=False)),
+]
+
+
+class FakeStream:
+    def __init__(self, clock):
+        self.clock = clock
+        self.sent = 0
+        self.closed = False
+
+    def _next(self):
+        arrival, chunk = TIMELINE[self.sent]
+        self.clock.now = arrival
+        self.sent += 1
+        return chunk
+
+    def __iter__(self):
+        while self.sent < len(TIMELINE):
+            yield self._next()
+
+    def close(self):
+        self.closed = True
+
+
+class FakeAsyncStream(FakeStream):
+    async def __aiter__(self):
+        while self.sent < len(TIMELINE):
+            await asyncio.sleep(0)
+            yield self._next()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self, stream):
+        self.stream = stream
+        self.kwargs = None
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.kwargs = kwargs
+        return self.stream
+
+
+class FakeAsyncClient(FakeClient):
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._acreate))
+
+    async def _acreate(self, **kwargs):
+        return self._create(**kwargs)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_base_monitor, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+def _stream_rows(monitor_logs):
+    with open(monitor_logs / "ctn_monitor_gpt_stream.csv", newline="", encoding="utf-8") as file:
+        reader = csv.DictReader(file)
+        assert reader.fieldnames == STREAM_COLUMNS
+        return list(reader)
+
+
+EXPECTED_DELTAS = [StreamDelta("", "think"), StreamDelta("Hel", ""), StreamDelta("lo", "")]
+
+
+def test_stream_yields_deltas_in_order_and_logs_latency(clock, monitor_logs):
+    stream = FakeStream(clock)
+    client = FakeClient(stream)
+    deltas = list(chat_gpt_stream(MESSAGES, model="gpt-4o-mini", track_id="t1", client=client))
+
+    assert deltas == EXPECTED_DELTAS
+    assert client.kwargs["stream"] is True
+    assert client.kwargs["stream_options"] == {"include_usage": True}
+    assert stream.closed
+    assert not (monitor_logs / "ctn_monitor_gpt.csv").exists()  # Non-stream CSV columns stay untouched
+
+    [row] = _stream_rows(monitor_logs)
+    assert row["finish_reason"] == "stop"
+    assert (row["model_requested"], row["model_actual"]) == ("gpt-4o-mini", "gpt-4o-mini-2024-07-18")
+    assert float(row["sec_span"]) == 1.4
+    assert float(row["ttft_ms"]) == 800.0                      # first (reasoning) delta at +0.8 s
+    assert float(row["itl_ms_mean"]) == 250.0                  # gaps of 0.2 s and 0.3 s
+    assert float(row["itl_ms_p95"]) == 300.0
+    assert float(row["deltas"]) == 3
+    assert [float(row[name]) for name in ("total_tokens", "prompt_tokens", "completion_tokens")] == [12, 5, 7]
+    assert row["track_id"] == "t1"
+
+
+def test_mark_token_tracks_ttft_and_gaps(clock):
+    mc = llm_base_monitor.MonitorContextLLM(MESSAGES, "gpt-4o-mini", None, 0)
+    mc.__enter__()
+    assert mc.ttft is None
+    for now in (100.25, 100.5, 101.0):
+        clock.now = now
+        mc.mark_token()
+    assert mc.ttft == 0.25
+    assert mc.token_gaps == [0.25, 0.5]
+
+
+def test_without_usage_option(clock):
+    client = FakeClient(FakeStream(clock))
+    list(chat_gpt_stream(MESSAGES, model="gpt-4o-mini", client=client, include_usage=False))
+    assert "stream_options" not in client.kwargs
+
+
+def test_consumer_breaking_early_cancels_and_closes_the_stream(clock, monitor_logs):
+    stream = FakeStream(clock)
+    deltas = chat_gpt_stream(MESSAGES, model="gpt-4o-mini", client=FakeClient(stream))
+    for delta in deltas:
+        assert delta == EXPECTED_DELTAS[0]
+        break
+    deltas.close()
+
+    assert stream.closed
+    assert stream.sent == 2
+    [row] = _stream_rows(monitor_logs)
+    assert row["finish_reason"] == "cancelled"
+    assert float(row["deltas"]) == 1 and float(row["itl_ms_mean"]) == 0.0
+
+
+def test_async_stream(clock, monitor_logs):
+    stream = FakeAsyncStream(clock)
+
+    async def consume():
+        deltas = achat_gpt_stream(MESSAGES, model="gpt-4o-mini", client=FakeAsyncClient(stream))
+        return [delta async for delta in deltas]
+
+    assert asyncio.run(consume()) == EXPECTED_DELTAS
+    assert stream.closed
+    [row] = _stream_rows(monitor_logs)
+    assert row["finish_reason"] == "stop" and float(row["ttft_ms"]) == 800.0
+
+
+def test_async_stream_cancelled_by_aclose(clock, monitor_logs):
+    stream = FakeAsyncStream(clock)
+
+    async def consume_one():
+        deltas = achat_gpt_stream(MESSAGES, model="gpt-4o-mini", client=FakeAsyncClient(stream))
+        first = await deltas.__anext__()
+        await deltas.aclose()
+        return first
+
+    assert asyncio.run(consume_one()) == EXPECTED_DELTAS[0]
+    assert stream.closed
+    [row] = _stream_rows(monitor_logs)
+    assert row["finish_reason"] == "cancelled"